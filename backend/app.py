@@ -1,11 +1,51 @@
-from fastapi import FastAPI
+import time
+IMPORT_START = time.perf_counter()
+
+from contextlib import asynccontextmanager
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import traceback
+from typing import List
+import numpy as np
+from fastapi import FastAPI, File, HTTPException, Query, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-import torch
-from transformers import AutoModelForSequenceClassification, AutoTokenizer
-import torch.nn.functional as F
+from batching import MicroBatcher
+from eccn_index import EccnIndex
+from engines import load_engine, load_operating_point, softmax
+from manifest import open_manifest, read_chunk
+from metrics import BATCH_SIZE_BUCKETS, Registry, RequestMetricsMiddleware
+from padding import LENGTH_BUCKETS, bucket_batches, encode, pad_batch
+from prediction_cache import PredictionCache
+from prefilter import CascadeStats, LexicalPrefilter
+from semantic import EmbeddingIndex
+from similar import SOURCES, SimilarCaseIndex, document_text
+from startup import Startup
+
+# 서버 시작 단계: import 후 바로 /health 응답, 모델 로드와 워밍업은 추론 스레드에서 백그라운드로 진행
+startup = Startup(started=IMPORT_START)
+startup.record("import app modules", time.perf_counter() - IMPORT_START)
+
+@asynccontextmanager
+async def lifespan(app):
+    await batcher.start()
+    # 로드가 끝나면 /ready 가 200 (serve.py worker 는 fork 전에 로드가 끝나 있어 워밍업만 실행)
+    app.state.loading = asyncio.ensure_future(batcher.call(startup.run, load, warm_up))
+    flushing = asyncio.ensure_future(flush_metrics()) if metrics.directory else None
+    checking = asyncio.ensure_future(check_model_files())
+    yield
+    checking.cancel()
+    if flushing is not None:
+        flushing.cancel()
+        metrics.write_snapshot()
+    await batcher.stop()
+    prediction_cache.close()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # CORS 설정 (프론트엔드에서 접근 가능하도록)
 app.add_middleware(
@@ -16,85 +56,531 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 모델 로드 (서버 시작 시 한 번만)
-print("Loading KoBERT model...")
-model_path = "../models/kobert-strategic-final"
-model = AutoModelForSequenceClassification.from_pretrained(model_path)
-tokenizer = AutoTokenizer.from_pretrained(model_path)
-model.eval()
-print("Model loaded successfully!")
+# 설정 (환경 변수)
+# ECHELPER_ENGINE: torch (기본) 또는 onnxruntime (convert_to_onnx_v2.py 로 변환한 model.onnx)
+engine_name = os.environ.get("ECHELPER_ENGINE", "torch")
+model_path = os.environ.get("ECHELPER_MODEL_PATH", "../models/kobert-strategic-final")
+onnx_path = os.environ.get("ECHELPER_ONNX_PATH", "../frontend/public/models/kobert-onnx/model.onnx")
+# 판정 임계값 / temperature (scripts/sweep_threshold.py 로 생성, 재학습 없이 교체 가능)
+operating_point_path = os.environ.get("ECHELPER_OPERATING_POINT", os.path.join(model_path, "operating_point.json"))
+# 2단계 cascade: 문자 n-gram 로지스틱 회귀(scripts/train_prefilter.py)가 확신하는 요청은 바로 응답, 나머지만 KoBERT
+# ECHELPER_CASCADE=0 이면 비활성, 모델 파일이 없어도 비활성
+# 임베딩 인덱스가 있으면 비활성: semanticNeighbors 는 KoBERT forward pass 의 임베딩으로만 찾을 수 있음
+prefilter_dir = os.environ.get("ECHELPER_PREFILTER_PATH", "../models/prefilter")
+# ECCN 후보 검색 / 유사 사례 검색 데이터
+data_dir = os.environ.get("ECHELPER_DATA_DIR", "../frontend/public/data")
+ECCN_TOP_K = int(os.environ.get("ECHELPER_ECCN_TOP_K", "5"))
+# 임베딩 기반 유사 사례 검색 (build_embeddings.py 로 생성, 파일이 없으면 비활성)
+embeddings_dir = os.environ.get("ECHELPER_EMBEDDINGS_DIR", "../models/embeddings")
+SEMANTIC_TOP_K = int(os.environ.get("ECHELPER_SEMANTIC_TOP_K", "5"))
+# 워밍업: 길이 구간 x 배치 크기마다 더미 배치 (ECHELPER_WARMUP=0 이면 생략)
+WARMUP = os.environ.get("ECHELPER_WARMUP", "1") != "0"
+WARMUP_BATCH_SIZES = [int(n) for n in os.environ.get("ECHELPER_WARMUP_BATCH_SIZES", "1,8").split(",")]
+
+# load() 에서 채움
+engine = None
+tokenizer = None
+operating_point = None
+prefilter = None
+eccn_index = None
+similar_indexes = {}
+semantic_indexes = {}
+model_fingerprint = None
+cascade_stats = CascadeStats()
+
+# 데이터 버전: convert_excel_to_json.py 가 만든 delta 중 어디까지 반영했는지
+def read_data_version():
+    state_path = os.path.join(data_dir, ".convert_state.json")
+    if not os.path.exists(state_path):
+        return 0
+    with open(state_path, encoding='utf-8') as f:
+        return json.load(f).get("version", 0)
+
+data_version = read_data_version()
+
+# 예측 결과 캐시: 같은 품목 설명은 모델을 다시 돌리지 않음 (ECHELPER_CACHE_SIZE=0 이면 메모리 캐시 비활성)
+# ECHELPER_CACHE_DB 를 지정하면 SQLite 파일에도 저장해서 worker 프로세스 / 재시작 사이에 공유
+prediction_cache = PredictionCache(
+    max_entries=int(os.environ.get("ECHELPER_CACHE_SIZE", "10000")),
+    ttl_seconds=float(os.environ.get("ECHELPER_CACHE_TTL", "3600")),
+    db_path=os.environ.get("ECHELPER_CACHE_DB") or None,
+)
+
+# 모델 파일 변경 확인 (폴더를 다시 읽으므로 요청 경로가 아니라 백그라운드에서 주기적으로)
+async def check_model_files():
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(prediction_cache.check_interval)
+        await loop.run_in_executor(None, prediction_cache.check_model)
+
+# Prometheus 메트릭 (/metrics)
+# serve.py 로 여러 worker 를 띄우면 ECHELPER_METRICS_DIR 에 worker 별 값을 저장하고 /metrics 에서 합친다
+metrics = Registry(os.environ.get("ECHELPER_METRICS_DIR") or None)
+METRICS_FLUSH_SECONDS = float(os.environ.get("ECHELPER_METRICS_FLUSH_SECONDS", "5"))
+request_count = metrics.counter("echelper_requests_total", "HTTP requests by endpoint and outcome", ("endpoint", "outcome"))
+request_seconds = metrics.histogram("echelper_request_duration_seconds", "HTTP request duration", ("endpoint",))
+prediction_count = metrics.counter("echelper_predictions_total", "Predicted texts by answering stage (cache, prefilter, kobert, error)", ("stage", "model_version"))
+stage_seconds = metrics.histogram("echelper_stage_duration_seconds", "Per-batch time in tokenize / inference / postprocess / prefilter", ("stage", "model_version"))
+batch_size_histogram = metrics.histogram("echelper_batch_size", "Texts per inference batch", buckets=BATCH_SIZE_BUCKETS)
+queue_wait_seconds = metrics.histogram("echelper_queue_wait_seconds", "Time a /predict request waited in the micro-batch queue")
+# echelper_batch_size 는 /predict/batch chunk 를 포함한 모든 추론 배치, 이것은 /predict 큐에서 묶인 배치만
+queue_batch_size = metrics.histogram("echelper_queue_batch_size", "Requests per micro-batch formed from the /predict queue", buckets=BATCH_SIZE_BUCKETS)
+model_info = metrics.gauge("echelper_model_info", "Loaded model", ("model_version", "engine", "threshold"))
+
+async def flush_metrics():
+    while True:
+        await asyncio.sleep(METRICS_FLUSH_SECONDS)
+        metrics.write_snapshot()
+
+def observe_batch(size, waits):
+    queue_batch_size.observe(size)
+    for wait in waits:
+        queue_wait_seconds.observe(wait)
+
+# 모델 / 인덱스 로드 (한 번만, serve.py 는 fork 전에 마스터에서 직접 호출)
+def load():
+    global engine, tokenizer, operating_point, prefilter, eccn_index, model_fingerprint
+    if engine is not None:
+        return
+
+    with startup.stage("import transformers"):
+        from transformers import AutoTokenizer
+
+    print(f"Loading KoBERT model ({engine_name})...")
+    with startup.stage("load engine"):
+        loaded = load_engine(engine_name, model_path, onnx_path)
+    with startup.stage("load tokenizer"):
+        tokenizer = AutoTokenizer.from_pretrained(loaded.tokenizer_path)
+
+    operating_point = load_operating_point(operating_point_path)
+    print(f"Operating point: threshold={operating_point['threshold']:.4f}, temperature={operating_point['temperature']:.3f}")
+
+    with startup.stage("load prefilter"):
+        prefilter = LexicalPrefilter.load(prefilter_dir) if os.environ.get("ECHELPER_CASCADE", "1") != "0" else None
+    if prefilter is not None:
+        print(f"Cascade enabled: prefilter exits at p <= {prefilter.low:.4f} / p >= {prefilter.high:.4f}")
+
+    # ECCN 후보 검색 인덱스 (통제 목록 + 수출 이력에서 ECCN 별 분류)
+    with startup.stage("build ECCN index"):
+        eccn_index = EccnIndex.from_files(
+            os.path.join(data_dir, "control_list.json"),
+            os.path.join(data_dir, "export_history.json"),
+        )
+    print(f"ECCN index built ({len(eccn_index.entries)} entries)")
+
+    # 유사 사례 검색 인덱스 (frontend/src/utils/tfidf.ts 와 같은 점수)
+    with startup.stage("build similar-case indexes"):
+        for source, (filename, fields) in SOURCES.items():
+            similar_indexes[source] = SimilarCaseIndex.from_file(os.path.join(data_dir, filename), fields)
+
+    # /predict 의 forward pass 에서 나온 임베딩을 그대로 질의로 사용한다
+    with startup.stage("load semantic indexes"):
+        for source, index in similar_indexes.items():
+            semantic_index = EmbeddingIndex.load(embeddings_dir, source, index.documents)
+            if semantic_index is not None:
+                semantic_indexes[source] = semantic_index
+    print(f"Semantic indexes: {', '.join(semantic_indexes) or 'none'}")
+    if prefilter is not None and semantic_indexes:
+        print("Cascade disabled: semantic neighbours need the KoBERT forward pass")
+
+    model_fingerprint = prediction_cache.watch(
+        model_path, onnx_path if loaded.name == "onnxruntime" else None, operating_point_path, prefilter_dir,
+        interval=float(os.environ.get("ECHELPER_CACHE_CHECK_SECONDS", "30")),
+    )
+    # 마지막에 설정: engine 이 None 이 아니면 로드 완료
+    engine = loaded
+    update_cache_version()
+    model_info.set(1, model_version=model_fingerprint, engine=engine.name, threshold=operating_point['threshold'])
+    print("Model loaded successfully!")
+
+# 길이 구간 x 배치 크기마다 더미 배치로 forward: 첫 실제 요청이 메모리 할당 / 커널 준비 비용을 치르지 않도록
+def warm_up():
+    if not WARMUP:
+        return
+    with startup.stage("warm-up"):
+        encode(tokenizer, ["워밍업"])
+        if prefilter is not None:
+            prefilter.predict(["워밍업"])
+        for length in LENGTH_BUCKETS:
+            sequence = [tokenizer.cls_token_id] + [tokenizer.unk_token_id] * (length - 2) + [tokenizer.sep_token_id]
+            for batch_size in WARMUP_BATCH_SIZES:
+                engine.forward(**pad_batch([sequence] * batch_size, tokenizer.pad_token_id))
+
+def require_ready():
+    if not startup.ready:
+        raise HTTPException(status_code=503, detail=f"모델을 준비하는 중입니다 ({startup.state})")
+
+def update_cache_version():
+    # 결과에 영향을 주는 것: 모델 파일, 엔진, 임계값, cascade 사용 여부, 검색 데이터 버전, 후보 개수
+    prediction_cache.set_version(
+        model_fingerprint, engine.name, operating_point, prefilter is not None,
+        data_version, sorted(semantic_indexes), ECCN_TOP_K, SEMANTIC_TOP_K,
+    )
+
+# serve.py 가 fork 한 worker 프로세스마다 호출: 추론 스레드 수 지정, fork 로 공유할 수 없는 자원(스레드 풀, SQLite 연결)을 다시 만든다
+def init_worker(threads):
+    engine.init_worker(threads)
+    prediction_cache.reopen()
 
 # 요청 데이터 구조
 class PredictRequest(BaseModel):
     text: str
 
+class BatchPredictRequest(BaseModel):
+    texts: List[str]
+
+# 예측 결과 생성 (확률 -> 응답 형식)
+def build_result(text, prob_non_strategic, prob_strategic, neighbors=None, stage="kobert", is_strategic=None):
+    if is_strategic is None:
+        is_strategic = prob_strategic >= operating_point['threshold']
+    confidence = prob_strategic if is_strategic else prob_non_strategic
+
+    # 통제 목록에서 가장 유사한 ECCN 후보
+    candidates = eccn_index.search(text, k=ECCN_TOP_K)
+    eccn = candidates[0]['eccn'] if is_strategic and candidates else 'N/A'
+    class_type = eccn_index.class_for(eccn) if eccn != 'N/A' else 'N/A'
+
+    analyzer = "KoBERT 분석" if stage == "kobert" else "사전 분류(문자 n-gram)"
+    explanation = (
+        f"{analyzer} 결과, 전략물자로 분류될 가능성이 {confidence*100:.1f}%입니다."
+        if is_strategic
+        else f"{analyzer} 결과, 일반 상업용 품목으로 판단됩니다. (신뢰도: {confidence*100:.1f}%)"
+    )
+
+    return {
+        "isStrategic": is_strategic,
+        "confidence": confidence * 100,
+        "eccn": eccn,
+        "classType": class_type,
+        "eccnCandidates": candidates,
+        "semanticNeighbors": neighbors or {},
+        "explanation": explanation,
+        "stage": stage
+    }
+
+def build_error(e):
+    return {
+        "isStrategic": False,
+        "confidence": 0,
+        "eccn": "Error",
+        "classType": "Error",
+        "eccnCandidates": [],
+        "semanticNeighbors": {},
+        "explanation": f"예측 중 오류 발생: {str(e)}",
+        "stage": "error"
+    }
+
+def cascade_enabled():
+    # 인덱스 갱신으로 임베딩 인덱스가 없어질 수 있으므로 매번 확인
+    return prefilter is not None and not semantic_indexes
+
+# 배치 예측: cascade 1단계에서 답하지 못한 텍스트만 KoBERT 로
+def predict_batch(texts):
+    cascade_stats.add_requests(len(texts))
+    batch_size_histogram.observe(len(texts))
+    results = [None] * len(texts)
+    remaining = list(range(len(texts)))
+
+    if cascade_enabled():
+        start = time.perf_counter()
+        remaining = []
+        for i, (text, prob) in enumerate(zip(texts, prefilter.predict(texts).tolist())):
+            decision = prefilter.decide(prob)
+            if decision is None:
+                remaining.append(i)
+            else:
+                results[i] = build_result(text, 1 - prob, prob, stage="prefilter", is_strategic=decision == 1)
+        elapsed = time.perf_counter() - start
+        cascade_stats.record("prefilter", len(texts), len(texts) - len(remaining), elapsed)
+        stage_seconds.observe(elapsed, stage="prefilter", model_version=model_fingerprint)
+        prediction_count.inc(len(texts) - len(remaining), stage="prefilter", model_version=model_fingerprint)
+
+    if remaining:
+        start = time.perf_counter()
+        for i, result in zip(remaining, predict_kobert([texts[i] for i in remaining])):
+            results[i] = result
+        cascade_stats.record("kobert", len(remaining), len(remaining), time.perf_counter() - start)
+        prediction_count.inc(len(remaining), stage="kobert", model_version=model_fingerprint)
+
+    return results
+
+# KoBERT 배치 예측 (여러 텍스트를 한 번의 forward pass로 처리)
+def predict_kobert(texts):
+    # 토크나이징 (패딩 없이) 후 길이 구간별로 묶어서 구간 내 최대 길이까지만 패딩
+    start = time.perf_counter()
+    sequences = encode(tokenizer, texts, max_length=128)
+    tokenized = time.perf_counter()
+    inference = 0.0
+    probs = [None] * len(texts)
+    neighbors = [{} for _ in texts]
+
+    # 예측
+    for indices, model_inputs in bucket_batches(sequences, tokenizer.pad_token_id):
+        # logits: [batch_size, num_classes], embeddings: [batch_size, hidden] (같은 forward pass)
+        forward_start = time.perf_counter()
+        logits, embeddings = engine.forward(**model_inputs)
+        inference += time.perf_counter() - forward_start
+
+        # Softmax로 확률 계산
+        for i, p in zip(indices, softmax(logits, operating_point['temperature']).tolist()):
+            probs[i] = p
+
+        # 임베딩 최근접 문서
+        if embeddings is not None:
+            for source, semantic_index in semantic_indexes.items():
+                for i, hits in zip(indices, semantic_index.search(embeddings, SEMANTIC_TOP_K)):
+                    neighbors[i][source] = [
+                        {
+                            "itemId": doc_id,
+                            "similarity": score,
+                            "title": semantic_index.documents[doc_id].get('title'),
+                            "eccn": semantic_index.documents[doc_id].get('eccn'),
+                        }
+                        for doc_id, score in hits
+                    ]
+
+    results = [build_result(text, p[0], p[1], n) for text, p, n in zip(texts, probs, neighbors)]
+
+    # 후처리: softmax, 임베딩 최근접 검색, ECCN 후보 검색 / 응답 생성
+    stage_seconds.observe(tokenized - start, stage="tokenize", model_version=model_fingerprint)
+    stage_seconds.observe(inference, stage="inference", model_version=model_fingerprint)
+    stage_seconds.observe(time.perf_counter() - tokenized - inference, stage="postprocess", model_version=model_fingerprint)
+    return results
+
+# 동시 요청을 모아서 배치 추론 (ECHELPER_MAX_BATCH_SIZE, ECHELPER_MAX_WAIT_MS 로 조정)
+batcher = MicroBatcher(
+    predict_batch,
+    max_batch_size=int(os.environ.get("ECHELPER_MAX_BATCH_SIZE", "32")),
+    max_wait_ms=float(os.environ.get("ECHELPER_MAX_WAIT_MS", "5")),
+    on_batch=observe_batch,
+)
+
 # 예측 엔드포인트
 @app.post("/predict")
-def predict(request: PredictRequest):
+async def predict(request: PredictRequest):
+    require_ready()
+    cached = await prediction_cache.get(request.text)
+    if cached is not None:
+        prediction_count.inc(stage="cache", model_version=model_fingerprint)
+        return from_cache(cached)
     try:
-        # 토크나이징
-        inputs = tokenizer(
-            request.text,
-            return_tensors="pt",
-            max_length=128,
-            padding="max_length",
-            truncation=True
-        )
+        result = await batcher.submit(request.text)
+    except Exception as e:
+        # 응답 형식은 그대로, 상태 코드로 실패를 알림 (메트릭의 outcome="error")
+        traceback.print_exc()
+        prediction_count.inc(stage="error", model_version=model_fingerprint)
+        return JSONResponse(build_error(e), status_code=500)
+    prediction_cache.put(request.text, result)
+    return result
 
-        # 예측
-        with torch.no_grad():
-            # Only use input_ids and attention_mask
-            model_inputs = {
-                'input_ids': inputs['input_ids'],
-                'attention_mask': inputs['attention_mask']
-            }
-
-            outputs = model(**model_inputs)
-            logits = outputs.logits  # Shape: [batch_size, num_classes]
-
-            # Softmax로 확률 계산
-            probs = F.softmax(logits, dim=1)[0]  # Get first (and only) batch item
-            prob_non_strategic = probs[0].item()
-            prob_strategic = probs[1].item()
-
-        # 결과 반환
-        is_strategic = prob_strategic > 0.5
-        confidence = prob_strategic if is_strategic else prob_non_strategic
-
-        # 임시 ECCN/Class (실제로는 더 정교한 로직 필요)
-        eccn_options = ['0A001', '0E001', '1C234', '2B231']
-        class_options = ['E1', 'E2', 'E3', 'A', 'B']
-
-        import random
-        eccn = random.choice(eccn_options) if is_strategic else 'N/A'
-        class_type = random.choice(class_options) if is_strategic else 'N/A'
-
-        explanation = (
-            f"KoBERT 분석 결과, 전략물자로 분류될 가능성이 {confidence*100:.1f}%입니다."
-            if is_strategic
-            else f"KoBERT 분석 결과, 일반 상업용 품목으로 판단됩니다. (신뢰도: {confidence*100:.1f}%)"
-        )
+# 캐시에서 꺼낸 결과는 stage 를 "cache" 로 (메트릭의 stage="cache" 와 같게, 저장된 결과는 그대로 둠)
+def from_cache(result):
+    return {**result, "stage": "cache"}
 
-        return {
-            "isStrategic": is_strategic,
-            "confidence": confidence * 100,
-            "eccn": eccn,
-            "classType": class_type,
-            "explanation": explanation
-        }
+# 대량 예측: chunk 단위로 추론하고 결과를 한 줄씩(NDJSON) 바로 전송
+BATCH_CHUNK_SIZE = int(os.environ.get("ECHELPER_BATCH_CHUNK_SIZE", "64"))
 
-    except Exception as e:
-        return {
-            "isStrategic": False,
-            "confidence": 0,
-            "eccn": "Error",
-            "classType": "Error",
-            "explanation": f"예측 중 오류 발생: {str(e)}"
-        }
+async def stream_predictions(texts):
+    loop = asyncio.get_running_loop()
+    texts = iter(texts)
+    row = 0
+
+    while True:
+        # 파일 읽기(XLSX 파싱 등)도 이벤트 루프를 막지 않도록 스레드에서 수행
+        chunk, error = await loop.run_in_executor(None, read_chunk, texts, BATCH_CHUNK_SIZE)
+        if not chunk:
+            if error is not None:
+                yield read_error_line(row, error)
+            break
+
+        # 캐시에 없는 텍스트만 추론
+        results = [from_cache(result) if result is not None else None for result in await prediction_cache.get_many(chunk)]
+        missing = [i for i, result in enumerate(results) if result is None]
+        prediction_count.inc(len(chunk) - len(missing), stage="cache", model_version=model_fingerprint)
+        if missing:
+            try:
+                computed = await batcher.run([chunk[i] for i in missing])
+                prediction_cache.put_many([chunk[i] for i in missing], computed)
+                for i, result in zip(missing, computed):
+                    results[i] = result
+            except Exception as e:
+                traceback.print_exc()
+                prediction_count.inc(len(missing), stage="error", model_version=model_fingerprint)
+                for i in missing:
+                    results[i] = build_error(e)
+
+        lines = []
+        for text, result in zip(chunk, results):
+            lines.append(json.dumps({"row": row, "text": text, **result}, ensure_ascii=False))
+            row += 1
+        yield "\n".join(lines) + "\n"
+        if error is not None:
+            yield read_error_line(row, error)
+            break
+
+def read_error_line(row, error):
+    # 파일 중간의 잘못된 행: 이미 보낸 결과는 그대로 두고, 마지막 줄로 읽기를 멈춘 위치와 이유를 알림
+    traceback.print_exception(type(error), error, error.__traceback__)
+    return json.dumps({"row": row, "error": f"입력 파일을 읽는 중 오류 발생: {error}"}, ensure_ascii=False) + "\n"
 
+@app.post("/predict/batch")
+async def predict_batch_texts(request: BatchPredictRequest):
+    require_ready()
+    return StreamingResponse(stream_predictions(request.texts), media_type="application/x-ndjson")
+
+# CSV/XLSX 업로드 (학습 데이터와 같은 data_total 컬럼 사용)
+# 업로드는 요청 처리가 끝나면 닫힐 수 있으므로 (FastAPI 버전에 따라 응답 스트리밍 전에) 응답이 소유하는 임시 파일로 복사
+@app.post("/predict/batch/file")
+async def predict_batch_file(file: UploadFile = File(...)):
+    require_ready()
+    loop = asyncio.get_running_loop()
+    copy = tempfile.TemporaryFile()
+    try:
+        # 복사와 헤더 검사(XLSX 압축 해제 포함)는 이벤트 루프를 막지 않도록 스레드에서
+        await loop.run_in_executor(None, shutil.copyfileobj, file.file, copy)
+        copy.seek(0)
+        texts = await loop.run_in_executor(None, open_manifest, copy, file.filename)
+    except ValueError as e:
+        copy.close()
+        raise HTTPException(status_code=400, detail=str(e))
+    except BaseException:
+        copy.close()
+        raise
+    return StreamingResponse(stream_manifest(copy, texts), media_type="application/x-ndjson")
+
+async def stream_manifest(copy, texts):
+    try:
+        async for lines in stream_predictions(texts):
+            yield lines
+    finally:
+        copy.close()
+
+# 유사 사례 검색: source=history (수출 이력) 또는 control (통제 목록)
+@app.get("/similar")
+def similar(q: str, k: int = Query(5, ge=1, le=100), source: str = "history"):
+    require_ready()
+    if source not in similar_indexes:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 source: {source} (가능한 값: {', '.join(similar_indexes)})")
+    index = similar_indexes[source]
+    return [
+        {**index.documents[i], "itemId": i, "similarity": score, "rank": rank}
+        for rank, (i, score) in enumerate(index.search(q, k), start=1)
+    ]
+
+# 인덱스 갱신: 아직 반영하지 않은 delta(data/deltas/<version>.json)를 순서대로 적용
+def embed_texts(texts):
+    embeddings = None
+    sequences = encode(tokenizer, texts, max_length=128)
+    for indices, model_inputs in bucket_batches(sequences, tokenizer.pad_token_id):
+        _, batch = engine.forward(**model_inputs)
+        if batch is None:
+            return None
+        if embeddings is None:
+            embeddings = np.zeros((len(texts), batch.shape[1]), dtype=np.float32)
+        embeddings[indices] = batch
+    return embeddings
+
+def apply_delta(delta):
+    # 추론 스레드에서 실행 (predict_batch 와 동시에 인덱스를 바꾸지 않음)
+    global eccn_index
+    files = delta["files"]
+
+    for source, (filename, fields) in SOURCES.items():
+        if filename not in files:
+            continue
+        change = files[filename]
+        index = similar_indexes[source].updated(change["changed"], change["count"])
+        similar_indexes[source] = index
+
+        if source in semantic_indexes:
+            changed_ids = [i for i, _ in change["changed"]]
+            embeddings = embed_texts([document_text(record, fields) for _, record in change["changed"]]) if changed_ids else None
+            if changed_ids and embeddings is None:
+                # 현재 엔진이 임베딩을 만들 수 없으면 오래된 결과를 주지 않도록 비활성
+                del semantic_indexes[source]
+            else:
+                semantic_indexes[source] = semantic_indexes[source].updated(index.documents, changed_ids, embeddings)
+
+    control = files.get(SOURCES["control"][0])
+    eccn_index = eccn_index.updated(
+        changed=control["changed"] if control else None,
+        count=control["count"] if control else None,
+        history=similar_indexes["history"].documents if SOURCES["history"][0] in files else None,
+    )
+
+refresh_lock = asyncio.Lock()
+
+@app.post("/indexes/refresh")
+async def refresh_indexes():
+    require_ready()
+    async with refresh_lock:
+        return await apply_pending_deltas()
+
+async def apply_pending_deltas():
+    global data_version
+    delta_dir = os.path.join(data_dir, "deltas")
+    pending = sorted(
+        name for name in (os.listdir(delta_dir) if os.path.isdir(delta_dir) else [])
+        if name.endswith(".json") and int(name[:-5]) > data_version
+    )
+
+    applied = []
+    for name in pending:
+        with open(os.path.join(delta_dir, name), encoding='utf-8') as f:
+            delta = json.load(f)
+        if delta["version"] != data_version + 1:
+            raise HTTPException(status_code=409, detail=f"delta {data_version + 1} 이 없습니다. 서버를 재시작해 전체 인덱스를 다시 만드세요.")
+        await batcher.call(apply_delta, delta)
+        data_version = delta["version"]
+        update_cache_version()
+        applied.append({"version": delta["version"], "files": {k: len(v["changed"]) for k, v in delta["files"].items()}})
+
+    return {"version": data_version, "applied": applied}
+
+# cascade 단계별 응답 비율 / 요청당 평균 지연시간
+@app.get("/stats/cascade")
+def cascade_statistics():
+    return {
+        "enabled": cascade_enabled(),
+        "thresholds": {"low": prefilter.low, "high": prefilter.high} if prefilter is not None else None,
+        **cascade_stats.stats(),
+    }
+
+# 예측 캐시 적중률 / 크기 / 삭제 수
+@app.get("/stats/cache")
+def cache_statistics():
+    return prediction_cache.stats()
+
+# Prometheus 텍스트 형식 메트릭 (serve.py worker 들의 값을 합쳐서)
+@app.get("/metrics")
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# 배치 스케줄러 통계 (큐 길이, 배치 크기 분포, 대기 시간)
+@app.get("/stats/batching")
+def batching_stats():
+    return batcher.stats()
+
+# liveness: 프로세스가 살아 있으면 바로 응답 (모델 로드 실패 시에만 500)
 @app.get("/health")
 def health():
-    return {"status": "ok", "model": "kobert-strategic-final"}
+    body = {
+        "status": "error" if startup.failed else "ok",
+        "state": startup.state,
+        "model": "kobert-strategic-final",
+        "engine": engine.name if engine is not None else None,
+        "operatingPoint": operating_point,
+        "dataVersion": data_version,
+    }
+    return JSONResponse(body, status_code=500 if startup.failed else 200)
+
+# readiness: 모델 로드 + 워밍업이 끝나면 200, 그 전에는 503 (단계별 시작 소요 시간 포함)
+@app.get("/ready")
+def ready():
+    return JSONResponse(startup.status(), status_code=200 if startup.ready else 503)
+
+# endpoint 별 요청 수 / 처리 시간 (정의된 경로만 라벨로 사용)
+app.add_middleware(RequestMetricsMiddleware, requests=request_count, seconds=request_seconds, paths=[route.path for route in app.routes])
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,116 @@
+import asyncio
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+# 동시에 들어온 /predict 요청을 모아서 한 번의 배치 추론으로 처리하는 스케줄러
+# - max_batch_size 개가 모이거나 max_wait_ms 가 지나면 즉시 실행
+# - 모델 추론은 전용 스레드 1개에서만 실행 (이벤트 루프 블로킹 방지, 모델 동시 접근 방지)
+class MicroBatcher:
+    def __init__(self, infer_fn, max_batch_size=32, max_wait_ms=5.0, on_batch=None):
+        self.infer_fn = infer_fn  # list[str] -> list[결과]
+        self.on_batch = on_batch  # (배치 크기, 요청별 대기 시간 목록) -> None, 메트릭 수집용
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue = None
+        self._worker = None
+        self._executor = None
+
+        # 튜닝용 통계
+        self.total_requests = 0
+        self.total_batches = 0
+        self.batch_size_counts = Counter()
+        self.total_queue_wait = 0.0
+        self.max_queue_depth = 0
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def submit(self, text):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future, time.perf_counter()))
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return await future
+
+    async def run(self, texts):
+        # 이미 묶여 있는 입력(/predict/batch)은 큐를 거치지 않고 같은 추론 스레드에서 실행
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.infer_fn, texts)
+
+    async def call(self, fn, *args):
+        # 모델을 쓰는 다른 작업(인덱스 갱신 등)도 추론 스레드에서 순서대로 실행
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def _collect(self):
+        # 첫 요청이 올 때까지 대기한 뒤, 마감 시간까지 나머지를 모은다
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = await self._collect()
+            started = time.perf_counter()
+            texts = [text for text, _, _ in batch]
+
+            self.total_requests += len(batch)
+            self.total_batches += 1
+            self.batch_size_counts[len(batch)] += 1
+            waits = [started - enqueued for _, _, enqueued in batch]
+            self.total_queue_wait += sum(waits)
+            if self.on_batch is not None:
+                self.on_batch(len(batch), waits)
+
+            try:
+                results = await loop.run_in_executor(self._executor, self.infer_fn, texts)
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self):
+        return {
+            "maxBatchSize": self.max_batch_size,
+            "maxWaitMs": self.max_wait * 1000,
+            "queueDepth": self._queue.qsize() if self._queue is not None else 0,
+            "maxQueueDepth": self.max_queue_depth,
+            "totalRequests": self.total_requests,
+            "totalBatches": self.total_batches,
+            "avgBatchSize": self.total_requests / self.total_batches if self.total_batches else 0,
+            "avgQueueWaitMs": self.total_queue_wait / self.total_requests * 1000 if self.total_requests else 0,
+            "batchSizeHistogram": {str(size): count for size, count in sorted(self.batch_size_counts.items())},
+        }
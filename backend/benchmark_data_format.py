@@ -0,0 +1,85 @@
+import argparse
+import gzip
+import json
+import os
+import statistics
+import time
+import tracemalloc
+
+from datafiles import columns_path, decode_columns
+
+# 데이터 파일 형식별 크기 / 로드 시간 / 최대 메모리 비교 (백엔드 기준)
+#   json    : 기존 <name>.json (들여쓰기된 레코드 JSON)
+#   columns : <name>.columns.json.gz (사전 인코딩된 컬럼 형식, gzip)
+# 브라우저 쪽 측정은 frontend/scripts/benchmark-data.mjs
+#
+# 사용법: python benchmark_data_format.py --repeat 20 --output data_format_bench.json
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--data-dir", default=os.environ.get("ECHELPER_DATA_DIR", "../frontend/public/data"))
+parser.add_argument("--files", nargs="+", default=["export_history", "control_list", "location", "participants"])
+parser.add_argument("--repeat", type=int, default=20)
+parser.add_argument("--output", default=None)
+args = parser.parse_args()
+
+
+def load_json(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_columns(path):
+    with gzip.open(columns_path(path), 'rt', encoding='utf-8') as f:
+        return decode_columns(json.load(f))
+
+
+def measure(load, path):
+    times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        load(path)
+        times.append((time.perf_counter() - start) * 1000)
+
+    # 메모리는 따로 측정 (tracemalloc 은 실행 속도를 떨어뜨림)
+    tracemalloc.start()
+    records = load(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return records, {"median_ms": statistics.median(times), "peak_mb": peak / 2 ** 20}
+
+
+print("=" * 60)
+print("Data Format Benchmark")
+print("=" * 60)
+
+results = {}
+for name in args.files:
+    path = os.path.join(args.data_dir, f"{name}.json")
+    if not os.path.exists(columns_path(path)):
+        print(f"   {name}: {os.path.basename(columns_path(path))} 없음 (convert_excel_to_json.py 실행 필요)")
+        continue
+
+    with open(path, 'rb') as f:
+        raw = f.read()
+    expected, json_stats = measure(load_json, path)
+    decoded, columns_stats = measure(load_columns, path)
+    results[name] = {
+        "records": len(expected),
+        "identical": decoded == expected,
+        "json": {"bytes": len(raw), "gzip_bytes": len(gzip.compress(raw)), **json_stats},
+        "columns": {"bytes": os.path.getsize(columns_path(path)), **columns_stats},
+    }
+
+print(f"\n{'file':<16}{'format':<10}{'size(KB)':>10}{'load(ms)':>10}{'peak(MB)':>10}")
+print("-" * 56)
+for name, r in results.items():
+    for fmt in ("json", "columns"):
+        stats = r[fmt]
+        print(f"{name:<16}{fmt:<10}{stats['bytes'] / 1024:>10.1f}{stats['median_ms']:>10.2f}{stats['peak_mb']:>10.2f}")
+    print(f"{'':<16}(gzip 전송 시 json {r['json']['gzip_bytes'] / 1024:.1f}KB, 복원 결과 동일: {r['identical']})")
+
+if args.output:
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\nSaved to: {args.output}")
+print("=" * 60)
@@ -0,0 +1,164 @@
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+from transformers import AutoTokenizer
+
+from engines import load_engine
+from padding import pad_batch
+
+# 추론 엔진 micro-benchmark (HTTP 없이 engine.forward 만 측정, 서버의 /predict 와 같은 호출)
+# 엔진 x 스레드 수 x 시퀀스 길이 x 배치 크기 조합마다 지연시간(중앙값, p90)과 처리량을 표로 저장한다.
+#   torch       : ECHELPER_MODEL_PATH 의 PyTorch 모델
+#   onnxruntime : convert_to_onnx_v2.py 로 변환한 model.onnx (양자화 모델도 --onnx-path 로 지정 가능)
+# 스레드 수는 serve.py worker 와 같은 방법(engine.init_worker)으로 지정한다.
+#
+# 사용법:
+#   python benchmark_engines.py --output engines.csv          # engines.csv + engines.json
+#   python benchmark_engines.py --compare engines_prev.json --tolerance 0.1 --fail-on-regression
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--engines", default="torch,onnxruntime")
+parser.add_argument("--model-path", default=os.environ.get("ECHELPER_MODEL_PATH", "../models/kobert-strategic-final"))
+parser.add_argument("--onnx-path", default=os.environ.get("ECHELPER_ONNX_PATH", "../frontend/public/models/kobert-onnx/model.onnx"))
+parser.add_argument("--batch-sizes", default="1,8,32,128")
+parser.add_argument("--seq-lengths", default="16,32,64,128")
+parser.add_argument("--threads", default=None, help="쉼표로 구분 (기본: 1,<사용 가능한 코어 수>)")
+parser.add_argument("--repeat", type=int, default=10)
+parser.add_argument("--warmup", type=int, default=2)
+parser.add_argument("--max-seconds", type=float, default=10.0, help="조합마다 측정에 쓰는 최대 시간 (repeat 보다 먼저 끝날 수 있음)")
+parser.add_argument("--seed", type=int, default=42)
+parser.add_argument("--output", default=None, help="CSV 경로 (같은 이름의 .json 에 환경 정보와 함께 저장)")
+parser.add_argument("--compare", default=None, help="이전 .json 결과와 비교")
+parser.add_argument("--tolerance", type=float, default=0.1, help="중앙값 지연시간이 이 비율 이상 늘면 회귀로 표시")
+parser.add_argument("--fail-on-regression", action="store_true")
+args = parser.parse_args()
+
+
+def parse_ints(value):
+    return [int(n) for n in value.split(",")]
+
+
+def cpu_count():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+batch_sizes = parse_ints(args.batch_sizes)
+seq_lengths = parse_ints(args.seq_lengths)
+thread_counts = parse_ints(args.threads) if args.threads else sorted({1, cpu_count()})
+
+print("=" * 60)
+print("Inference Engine Benchmark")
+print("=" * 60)
+print(f"batch sizes {batch_sizes}, sequence lengths {seq_lengths}, threads {thread_counts}")
+
+rng = random.Random(args.seed)
+rows = []
+
+for engine_name in args.engines.split(","):
+    engine = load_engine(engine_name, args.model_path, args.onnx_path)
+    tokenizer = AutoTokenizer.from_pretrained(engine.tokenizer_path)
+
+    # [CLS] ... [SEP] 형태의 임의 토큰 시퀀스 (조합마다 같은 입력)
+    special_ids = set(tokenizer.all_special_ids)
+    vocab_ids = [i for i in range(tokenizer.vocab_size) if i not in special_ids]
+    inputs = {
+        (seq_length, batch_size): pad_batch([
+            [tokenizer.cls_token_id] + rng.choices(vocab_ids, k=seq_length - 2) + [tokenizer.sep_token_id]
+            for _ in range(batch_size)
+        ], tokenizer.pad_token_id)
+        for seq_length in seq_lengths
+        for batch_size in batch_sizes
+    }
+
+    for threads in thread_counts:
+        engine.init_worker(threads)
+        print(f"\n{engine.name}, {threads} thread(s)")
+        print(f"{'seq':>5} {'batch':>6} {'median ms':>10} {'p90 ms':>9} {'ms/sample':>10} {'samples/s':>10}")
+
+        for seq_length in seq_lengths:
+            for batch_size in batch_sizes:
+                model_inputs = inputs[(seq_length, batch_size)]
+                for _ in range(args.warmup):
+                    engine.forward(**model_inputs)
+
+                timings = []
+                deadline = time.perf_counter() + args.max_seconds
+                while len(timings) < args.repeat and (not timings or time.perf_counter() < deadline):
+                    start = time.perf_counter()
+                    engine.forward(**model_inputs)
+                    timings.append(time.perf_counter() - start)
+
+                median = float(np.median(timings))
+                row = {
+                    "engine": engine.name,
+                    "threads": threads,
+                    "seqLength": seq_length,
+                    "batchSize": batch_size,
+                    "runs": len(timings),
+                    "medianMs": median * 1000,
+                    "p90Ms": float(np.percentile(timings, 90)) * 1000,
+                    "msPerSample": median * 1000 / batch_size,
+                    "samplesPerSec": batch_size / median,
+                }
+                rows.append(row)
+                print(f"{seq_length:>5} {batch_size:>6} {row['medianMs']:>10.2f} {row['p90Ms']:>9.2f} "
+                      f"{row['msPerSample']:>10.3f} {row['samplesPerSec']:>10.1f}")
+    del engine
+
+regressions = []
+if args.compare:
+    with open(args.compare, encoding='utf-8') as f:
+        previous = {(r["engine"], r["threads"], r["seqLength"], r["batchSize"]): r for r in json.load(f)["results"]}
+    print(f"\nCompared with {args.compare} (regression: median latency +{args.tolerance:.0%} or more):")
+    for row in rows:
+        old = previous.get((row["engine"], row["threads"], row["seqLength"], row["batchSize"]))
+        if old is None:
+            continue
+        row["previousMedianMs"] = old["medianMs"]
+        row["change"] = row["medianMs"] / old["medianMs"] - 1
+        if row["change"] >= args.tolerance:
+            regressions.append(row)
+            print(f"   ❌ {row['engine']} threads={row['threads']} seq={row['seqLength']} batch={row['batchSize']}: "
+                  f"{old['medianMs']:.2f} -> {row['medianMs']:.2f} ms ({row['change']:+.1%})")
+    if not regressions:
+        print("   ✅ No regressions")
+
+if args.output:
+    with open(args.output, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()), extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+    json_path = os.path.splitext(args.output)[0] + ".json"
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            "machine": {"processor": platform.processor() or platform.machine(), "cpus": cpu_count(), "python": platform.python_version()},
+            "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+            "results": rows,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\nResults saved to: {args.output}, {json_path}")
+
+print("\n" + "=" * 60)
+
+if regressions and args.fail_on_regression:
+    sys.exit(1)
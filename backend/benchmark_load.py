@@ -0,0 +1,310 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+
+from manifest import open_manifest
+
+# 예측 API 부하 테스트: 로컬 서버에 요청을 보내 지연시간 분포(p50/p95/p99)와 처리량을 측정
+#   closed loop : --concurrency 개의 가상 사용자가 응답을 받자마자 다음 요청 (기본)
+#   open loop   : --rate 로 지정한 평균 도착률(초당 요청, Poisson)로 응답과 무관하게 요청
+#                 지연시간은 예정된 도착 시각부터 계산 (서버가 밀리면 대기 시간도 포함)
+# 요청 텍스트는 학습 데이터(data_total 컬럼)에서 뽑아 실제 품목 설명 길이 분포를 따른다.
+# 외부 패키지 없이 asyncio 로 HTTP/1.1 keep-alive 연결을 직접 사용하므로 로컬 서버만 있으면 실행 가능.
+#
+# 사용법:
+#   python benchmark_load.py --scenarios predict,batch,similar --concurrency 16 --duration 30 --output load.json
+#   python benchmark_load.py --scenarios predict --rate 50 --duration 60 --output load.json --compare load_prev.json
+# 예측 캐시가 결과를 왜곡하지 않도록 서버는 ECHELPER_CACHE_SIZE=0 으로 띄우는 것을 권장
+
+SCENARIOS = ("predict", "batch", "similar")
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--url", default="http://127.0.0.1:8000")
+parser.add_argument("--scenarios", default="predict", help=f"쉼표로 구분 ({', '.join(SCENARIOS)})")
+parser.add_argument("--data", default="../data/labelled_data_aug_for_learning.xlsx", help="data_total 컬럼이 있는 XLSX/CSV")
+parser.add_argument("--samples", type=int, default=5000, help="데이터에서 뽑을 텍스트 수")
+parser.add_argument("--concurrency", type=int, default=8, help="closed loop 동시 사용자 수")
+parser.add_argument("--rate", type=float, default=None, help="open loop 평균 도착률 (요청/초)")
+parser.add_argument("--max-connections", type=int, default=256, help="open loop 최대 동시 연결 수")
+parser.add_argument("--duration", type=float, default=30.0, help="시나리오별 측정 시간 (초)")
+parser.add_argument("--warmup", type=float, default=5.0, help="측정 전 워밍업 시간 (초)")
+parser.add_argument("--batch-size", type=int, default=32, help="batch 시나리오의 요청당 텍스트 수")
+parser.add_argument("--timeout", type=float, default=60.0)
+parser.add_argument("--seed", type=int, default=42)
+parser.add_argument("--output", default=None)
+parser.add_argument("--compare", default=None, help="이전 --output 결과와 비교")
+args = parser.parse_args()
+
+target = urlsplit(args.url)
+HOST, PORT = target.hostname, target.port or 80
+
+
+class Connection:
+    # HTTP/1.1 keep-alive 연결 하나 (Content-Length / chunked 응답 지원)
+    def __init__(self):
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, body=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(HOST, PORT)
+        try:
+            return await asyncio.wait_for(self._request(method, path, body), args.timeout)
+        except BaseException:
+            self.close()
+            raise
+
+    async def _request(self, method, path, body):
+        head = f"{method} {path} HTTP/1.1\r\nHost: {HOST}:{PORT}\r\n"
+        if body is not None:
+            head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        self.writer.write(head.encode('ascii') + b"\r\n" + (body or b""))
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding") == "chunked":
+            parts = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                parts.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            payload = b"".join(parts)
+        else:
+            payload = await self.reader.readexactly(int(headers.get("content-length", 0)))
+
+        if headers.get("connection") == "close":
+            self.close()
+        return status, payload
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+def load_texts():
+    # 데이터 전체에서 균등하게 --samples 개 (reservoir sampling, 파일 전체를 메모리에 올리지 않음)
+    rng = random.Random(args.seed)
+    sample = []
+    with open(args.data, 'rb') as f:
+        for i, text in enumerate(t for t in open_manifest(f, args.data) if t.strip()):
+            if len(sample) < args.samples:
+                sample.append(text)
+            else:
+                j = rng.randint(0, i)
+                if j < args.samples:
+                    sample[j] = text
+    if not sample:
+        raise SystemExit(f"{args.data} 에 data_total 텍스트가 없습니다.")
+    return sample
+
+
+def make_request(scenario, rng, texts):
+    # (method, path, body, 요청에 담긴 텍스트 수)
+    if scenario == "predict":
+        return "POST", "/predict", json.dumps({"text": rng.choice(texts)}, ensure_ascii=False).encode('utf-8'), 1
+    if scenario == "batch":
+        batch = rng.sample(texts, min(args.batch_size, len(texts)))
+        return "POST", "/predict/batch", json.dumps({"texts": batch}, ensure_ascii=False).encode('utf-8'), len(batch)
+    return "GET", "/similar?" + urlencode({"q": rng.choice(texts), "k": 5}), None, 1
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = []
+        self.texts = 0
+        self.errors = {}
+        self.recording = False
+
+    def record(self, latency, count, error=None):
+        if not self.recording:
+            return
+        if error is None:
+            self.latencies.append(latency)
+            self.texts += count
+        else:
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+
+async def send(connection, scenario, rng, texts, recorder, scheduled=None):
+    method, path, body, count = make_request(scenario, rng, texts)
+    start = time.perf_counter() if scheduled is None else scheduled
+    try:
+        status, _ = await connection.request(method, path, body)
+        recorder.record(time.perf_counter() - start, count, None if status < 400 else f"HTTP {status}")
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, IndexError) as e:
+        recorder.record(time.perf_counter() - start, count, type(e).__name__)
+
+
+async def closed_loop(scenario, texts, recorder, deadline):
+    async def user(index):
+        rng = random.Random(args.seed + index)
+        connection = Connection()
+        while time.perf_counter() < deadline:
+            await send(connection, scenario, rng, texts, recorder)
+        connection.close()
+
+    await asyncio.gather(*(user(i) for i in range(args.concurrency)))
+
+
+async def open_loop(scenario, texts, recorder, deadline):
+    rng = random.Random(args.seed)
+    idle = [Connection() for _ in range(args.max_connections)]
+    available = asyncio.Semaphore(args.max_connections)
+    tasks = []
+
+    async def arrival(scheduled):
+        async with available:
+            connection = idle.pop()
+            try:
+                await send(connection, scenario, rng, texts, recorder, scheduled)
+            finally:
+                idle.append(connection)
+
+    next_arrival = time.perf_counter()
+    while next_arrival < deadline:
+        delay = next_arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(arrival(next_arrival)))
+        next_arrival += rng.expovariate(args.rate)
+    await asyncio.gather(*tasks)
+    for connection in idle:
+        connection.close()
+
+
+async def run_scenario(scenario, texts):
+    recorder = Recorder()
+    loop_fn = open_loop if args.rate else closed_loop
+    started = time.perf_counter()
+    warmup_end = started + args.warmup
+    deadline = warmup_end + args.duration
+
+    async def start_recording():
+        await asyncio.sleep(args.warmup)
+        recorder.recording = True
+
+    await asyncio.gather(loop_fn(scenario, texts, recorder, deadline), start_recording())
+    elapsed = time.perf_counter() - warmup_end
+
+    latencies = np.array(recorder.latencies) * 1000
+    percentile = lambda q: float(np.percentile(latencies, q)) if len(latencies) else None
+    return {
+        "scenario": scenario,
+        "mode": "open" if args.rate else "closed",
+        "offeredRate": args.rate,
+        "concurrency": None if args.rate else args.concurrency,
+        "requests": int(len(latencies)),
+        "errors": recorder.errors,
+        "requestsPerSecond": len(latencies) / elapsed,
+        "textsPerSecond": recorder.texts / elapsed,
+        "latencyMs": {
+            "mean": float(latencies.mean()) if len(latencies) else None,
+            "p50": percentile(50),
+            "p95": percentile(95),
+            "p99": percentile(99),
+            "max": float(latencies.max()) if len(latencies) else None,
+        },
+    }
+
+
+async def server_info():
+    try:
+        status, payload = await Connection().request("GET", "/health")
+        return json.loads(payload) if status == 200 else None
+    except (OSError, ValueError):
+        return None
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def change(new, old):
+    if new is None or not old:
+        return "      -"
+    return f"{(new - old) / old * 100:+6.1f}%"
+
+
+async def main():
+    scenarios = [s.strip() for s in args.scenarios.split(",")]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"알 수 없는 시나리오: {', '.join(unknown)} (가능한 값: {', '.join(SCENARIOS)})")
+
+    print("=" * 60)
+    print("Load Benchmark")
+    print("=" * 60)
+
+    texts = load_texts()
+    lengths = np.array([len(t) for t in texts])
+    print(f"\nTexts: {len(texts)} from {args.data} (length p50 {np.percentile(lengths, 50):.0f}, p95 {np.percentile(lengths, 95):.0f} chars)")
+
+    info = await server_info()
+    if info is None:
+        raise SystemExit(f"{args.url}/health 에 연결할 수 없습니다. 서버를 먼저 실행하세요.")
+    print(f"Server: engine={info.get('engine')}, state={info.get('state', 'ready')}")
+    mode = f"open loop, {args.rate} req/s" if args.rate else f"closed loop, concurrency {args.concurrency}"
+
+    results = []
+    for scenario in scenarios:
+        print(f"\n{scenario} ({mode}, {args.warmup:.0f}s warm-up + {args.duration:.0f}s)...")
+        result = await run_scenario(scenario, texts)
+        results.append(result)
+        latency = result["latencyMs"]
+        print(f"   {result['requests']} requests, {result['requestsPerSecond']:.1f} req/s, {result['textsPerSecond']:.1f} texts/s, "
+              f"errors {sum(result['errors'].values())}")
+        if result["requests"]:
+            print(f"   latency ms: p50 {latency['p50']:.1f}  p95 {latency['p95']:.1f}  p99 {latency['p99']:.1f}  max {latency['max']:.1f}")
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        "server": info,
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "texts": {"count": len(texts), "lengthP50": float(np.percentile(lengths, 50)), "lengthP95": float(np.percentile(lengths, 95))},
+        "results": results,
+    }
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            previous = {r["scenario"]: r for r in json.load(f)["results"]}
+        print(f"\nCompared with {args.compare}:")
+        print(f"   {'scenario':<10} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+        for result in results:
+            old = previous.get(result["scenario"])
+            if old is None:
+                continue
+            print(f"   {result['scenario']:<10} {change(result['requestsPerSecond'], old['requestsPerSecond']):>8} "
+                  + " ".join(f"{change(result['latencyMs'][q], old['latencyMs'][q]):>8}" for q in ("p50", "p95", "p99")))
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nSaved to: {args.output}")
+
+
+asyncio.run(main())
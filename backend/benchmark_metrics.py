@@ -0,0 +1,102 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from metrics import BATCH_SIZE_BUCKETS, Registry, RequestMetricsMiddleware
+
+# 메트릭 수집 비용 확인: /predict 요청 1건이 거치는 메트릭 갱신과 같은 호출을 반복해서
+# 요청당 추가 지연시간이 예산(--budget-us) 안인지 검사한다 (넘으면 종료 코드 1).
+#   instrumentation : 대기 시간 / 큐 배치 크기 / 배치 크기 / 단계별 시간 3개 / 예측 수
+#   middleware      : 빈 ASGI 앱을 RequestMetricsMiddleware (요청 수 / 처리 시간) 로 감쌌을 때와 아닐 때의 차이
+#   render          : /metrics 응답 생성 시간 (요청 경로가 아니라 수집 주기마다 1번)
+# 모델이 필요 없으므로 어디서든 실행 가능
+#
+# 사용법: python benchmark_metrics.py [--iterations 200000] [--budget-us 20] [--output metrics_bench.json]
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--iterations", type=int, default=200000)
+parser.add_argument("--budget-us", type=float, default=20.0, help="요청당 허용하는 메트릭 수집 비용 (마이크로초)")
+parser.add_argument("--output", default=None)
+args = parser.parse_args()
+
+metrics = Registry()
+request_count = metrics.counter("echelper_requests_total", "", ("endpoint", "outcome"))
+request_seconds = metrics.histogram("echelper_request_duration_seconds", "", ("endpoint",))
+prediction_count = metrics.counter("echelper_predictions_total", "", ("stage", "model_version"))
+stage_seconds = metrics.histogram("echelper_stage_duration_seconds", "", ("stage", "model_version"))
+batch_size_histogram = metrics.histogram("echelper_batch_size", "", buckets=BATCH_SIZE_BUCKETS)
+queue_wait_seconds = metrics.histogram("echelper_queue_wait_seconds", "")
+queue_batch_size = metrics.histogram("echelper_queue_batch_size", "", buckets=BATCH_SIZE_BUCKETS)
+VERSION = "0123456789abcdef"
+
+
+def instrumentation():
+    # 배치 단위 기록은 배치 크기 1 (요청 1건당 비용이 가장 큰 경우)
+    queue_wait_seconds.observe(0.002)
+    queue_batch_size.observe(1)
+    batch_size_histogram.observe(1)
+    stage_seconds.observe(0.001, stage="tokenize", model_version=VERSION)
+    stage_seconds.observe(0.02, stage="inference", model_version=VERSION)
+    stage_seconds.observe(0.003, stage="postprocess", model_version=VERSION)
+    prediction_count.inc(stage="kobert", model_version=VERSION)
+
+
+async def empty_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def noop_send(message):
+    pass
+
+
+async def drive(app, iterations):
+    scope = {"type": "http", "path": "/predict"}
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await app(scope, None, noop_send)
+    return time.perf_counter() - start
+
+
+print("=" * 60)
+print("Metrics Overhead Benchmark")
+print("=" * 60)
+
+start = time.perf_counter()
+for _ in range(args.iterations):
+    instrumentation()
+instrumentation_us = (time.perf_counter() - start) / args.iterations * 1e6
+
+wrapped = RequestMetricsMiddleware(empty_app, request_count, request_seconds, ["/predict"])
+baseline = asyncio.run(drive(empty_app, args.iterations))
+with_middleware = asyncio.run(drive(wrapped, args.iterations))
+middleware_us = (with_middleware - baseline) / args.iterations * 1e6
+
+start = time.perf_counter()
+rendered = metrics.render()
+render_ms = (time.perf_counter() - start) * 1000
+
+total_us = instrumentation_us + max(middleware_us, 0)
+print(f"   instrumentation per request: {instrumentation_us:.2f} us")
+print(f"   middleware per request:      {middleware_us:.2f} us")
+print(f"   /metrics render:             {render_ms:.2f} ms ({len(rendered.splitlines())} lines)")
+print(f"   total per request:           {total_us:.2f} us (budget {args.budget_us:.1f} us)")
+
+if args.output:
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            "iterations": args.iterations,
+            "instrumentationUs": instrumentation_us,
+            "middlewareUs": middleware_us,
+            "renderMs": render_ms,
+            "totalUs": total_us,
+            "budgetUs": args.budget_us,
+        }, f, indent=2)
+    print(f"Saved to: {args.output}")
+
+if total_us > args.budget_us:
+    print("❌ Metrics overhead exceeds budget")
+    sys.exit(1)
+print("✅ Within budget")
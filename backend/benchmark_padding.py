@@ -0,0 +1,105 @@
+import argparse
+import json
+import os
+import random
+import time
+
+from transformers import AutoTokenizer
+
+from engines import load_engine
+from padding import LENGTH_BUCKETS, bucket_batches, pad_batch
+
+# 패딩 방식별 추론 지연시간/처리량 비교
+#   max_length : 기존 방식 (모든 입력을 128 토큰으로 패딩)
+#   longest    : 배치 내 최대 길이까지만 패딩
+#   bucketed   : 길이 구간별로 묶은 뒤 구간 내 최대 길이까지만 패딩 (현재 /predict)
+#
+# 사용법: python benchmark_padding.py --batch-size 32 --output padding_bench.json
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--model-path", default=os.environ.get("ECHELPER_MODEL_PATH", "../models/kobert-strategic-final"))
+parser.add_argument("--engine", default=os.environ.get("ECHELPER_ENGINE", "torch"))
+parser.add_argument("--onnx-path", default=os.environ.get("ECHELPER_ONNX_PATH", "../frontend/public/models/kobert-onnx/model.onnx"))
+parser.add_argument("--batch-size", type=int, default=32)
+parser.add_argument("--repeat", type=int, default=10)
+parser.add_argument("--max-length", type=int, default=128)
+parser.add_argument("--output", default=None)
+args = parser.parse_args()
+
+print("=" * 60)
+print("Padding Strategy Benchmark")
+print("=" * 60)
+
+engine = load_engine(args.engine, args.model_path, args.onnx_path)
+tokenizer = AutoTokenizer.from_pretrained(engine.tokenizer_path)
+
+special_ids = set(tokenizer.all_special_ids)
+vocab_ids = [i for i in range(tokenizer.vocab_size) if i not in special_ids]
+random.seed(42)
+
+
+def make_sequence(length):
+    # [CLS] ... [SEP] 형태의 임의 토큰 시퀀스
+    body = random.choices(vocab_ids, k=max(length - 2, 0))
+    return [tokenizer.cls_token_id] + body + [tokenizer.sep_token_id]
+
+
+def run_max_length(sequences):
+    padded = [seq + [tokenizer.pad_token_id] * (args.max_length - len(seq)) for seq in sequences]
+    inputs = pad_batch(padded, tokenizer.pad_token_id)
+    inputs['attention_mask'] = (inputs['input_ids'] != tokenizer.pad_token_id).astype('int64')
+    engine.logits(**inputs)
+
+
+def run_longest(sequences):
+    engine.logits(**pad_batch(sequences, tokenizer.pad_token_id))
+
+
+def run_bucketed(sequences):
+    for _, inputs in bucket_batches(sequences, tokenizer.pad_token_id):
+        engine.logits(**inputs)
+
+
+strategies = {
+    "max_length": run_max_length,
+    "longest": run_longest,
+    "bucketed": run_bucketed,
+}
+
+# 고정 길이 + 실제 트래픽과 비슷한 혼합 길이 (대부분 짧고 일부만 긴 입력)
+workloads = {f"len={n}": [make_sequence(n) for _ in range(args.batch_size)] for n in (8, 16, 32, 64, 128)}
+workloads["mixed"] = [
+    make_sequence(random.choice([8, 10, 12, 15, 20, 30, 60, 128]))
+    for _ in range(args.batch_size)
+]
+
+results = []
+print(f"\nengine={engine.name}, batch_size={args.batch_size}, repeat={args.repeat}, buckets={LENGTH_BUCKETS}\n")
+print(f"{'workload':<10} {'strategy':<12} {'latency(ms)':>12} {'items/s':>10}")
+print("-" * 48)
+
+for name, sequences in workloads.items():
+    for strategy, fn in strategies.items():
+        fn(sequences)  # warm-up
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            fn(sequences)
+        elapsed = (time.perf_counter() - start) / args.repeat
+
+        row = {
+            "workload": name,
+            "engine": engine.name,
+            "strategy": strategy,
+            "batchSize": args.batch_size,
+            "latencyMs": elapsed * 1000,
+            "itemsPerSec": args.batch_size / elapsed,
+        }
+        results.append(row)
+        print(f"{name:<10} {strategy:<12} {row['latencyMs']:12.2f} {row['itemsPerSec']:10.1f}")
+
+if args.output:
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\nResults saved to: {args.output}")
+
+print("\n" + "=" * 60)
@@ -0,0 +1,164 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# worker 수에 따른 메모리 / 처리량 비교 (serve.py)
+# worker 수마다 서버를 띄우고 /predict 에 동시 요청을 보내 requests/sec 와 지연시간을 재고,
+# 프로세스별 RSS 와 PSS (공유 페이지를 나눠서 계산한 실제 점유량, /proc/<pid>/smaps_rollup) 를 기록한다.
+# 예측 캐시는 끄고 실행한다 (같은 문장을 반복해서 보내므로).
+#
+# 사용법: python benchmark_workers.py --workers 1,2,4 --concurrency 16 --output workers_bench.json
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--workers", default="1,2,4")
+parser.add_argument("--threads-per-worker", type=int, default=None)
+parser.add_argument("--concurrency", type=int, default=16)
+parser.add_argument("--duration", type=float, default=20.0, help="worker 수마다 부하를 주는 시간 (초)")
+parser.add_argument("--port", type=int, default=8100)
+parser.add_argument("--startup-timeout", type=float, default=300.0)
+parser.add_argument("--output", default=None)
+args = parser.parse_args()
+
+TEXTS = [
+    "레이저 거리측정기",
+    "원자로 냉각재 펌프용 기계적 밀봉장치",
+    "일반 사무용 볼펜",
+    "5축 CNC 공작기계 (위치 정확도 6 마이크로미터)",
+    "스테인리스 강관 외경 50mm",
+    "적외선 열화상 카메라 모듈 640x512",
+]
+
+url = f"http://127.0.0.1:{args.port}"
+
+
+def memory(pid):
+    # kB 단위 -> MB
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup", encoding='utf-8') as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:", "Private_Clean:", "Private_Dirty:"):
+                values[parts[0][:-1]] = int(parts[1]) / 1024
+    return {"rssMb": values["Rss"], "pssMb": values["Pss"], "privateMb": values["Private_Clean"] + values["Private_Dirty"]}
+
+
+def children(pid):
+    with open(f"/proc/{pid}/task/{pid}/children", encoding='utf-8') as f:
+        return [int(p) for p in f.read().split()]
+
+
+def post(text):
+    request = urllib.request.Request(
+        f"{url}/predict",
+        data=json.dumps({"text": text}).encode('utf-8'),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=60) as response:
+        return json.load(response)
+
+
+def wait_ready(process, workers):
+    deadline = time.perf_counter() + args.startup_timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode}")
+        try:
+            urllib.request.urlopen(f"{url}/ready", timeout=1).read()
+            if len(children(process.pid)) >= workers:
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError("server did not become ready")
+
+
+def client(deadline, offset):
+    latencies, errors = [], 0
+    i = offset
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            result = post(TEXTS[i % len(TEXTS)])
+            if result.get("stage") == "error":
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+        except OSError:
+            errors += 1
+        i += 1
+    return latencies, errors
+
+
+def run(workers):
+    command = [sys.executable, "serve.py", "--workers", str(workers), "--port", str(args.port), "--log-level", "warning"]
+    if args.threads_per_worker:
+        command += ["--threads-per-worker", str(args.threads_per_worker)]
+    env = {**os.environ, "ECHELPER_CACHE_SIZE": "0", "ECHELPER_CACHE_DB": ""}
+
+    start = time.perf_counter()
+    process = subprocess.Popen(command, env=env)
+    try:
+        wait_ready(process, workers)
+        startup = time.perf_counter() - start
+
+        # 워밍업 (worker 마다 첫 요청)
+        for i in range(workers * 2):
+            post(TEXTS[i % len(TEXTS)])
+
+        deadline = time.perf_counter() + args.duration
+        with ThreadPoolExecutor(args.concurrency) as pool:
+            results = list(pool.map(lambda c: client(deadline, c), range(args.concurrency)))
+        latencies = np.array([l for ls, _ in results for l in ls]) * 1000
+        errors = sum(e for _, e in results)
+
+        master = memory(process.pid)
+        worker_memory = [memory(pid) for pid in children(process.pid)]
+    finally:
+        process.terminate()
+        process.wait(timeout=60)
+
+    return {
+        "workers": workers,
+        "startupSeconds": startup,
+        "requests": int(len(latencies)),
+        "errors": errors,
+        "requestsPerSecond": len(latencies) / args.duration,
+        "latencyMs": {
+            "p50": float(np.percentile(latencies, 50)) if len(latencies) else None,
+            "p95": float(np.percentile(latencies, 95)) if len(latencies) else None,
+        },
+        "memory": {
+            "master": master,
+            "workers": worker_memory,
+            "totalPssMb": master["pssMb"] + sum(m["pssMb"] for m in worker_memory),
+        },
+    }
+
+
+print("=" * 60)
+print("Multi-worker Benchmark")
+print("=" * 60)
+
+rows = []
+for workers in [int(n) for n in args.workers.split(",")]:
+    print(f"\n{workers} worker(s)...")
+    rows.append(run(workers))
+
+print(f"\n{'workers':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'RSS/worker MB':>14} {'PSS/worker MB':>14} {'total PSS MB':>13}")
+for row in rows:
+    worker_memory = row["memory"]["workers"]
+    print(f"{row['workers']:>7} {row['requestsPerSecond']:>8.1f} {row['latencyMs']['p50'] or 0:>8.1f} {row['latencyMs']['p95'] or 0:>8.1f} "
+          f"{np.mean([m['rssMb'] for m in worker_memory]):>14.0f} {np.mean([m['pssMb'] for m in worker_memory]):>14.0f} "
+          f"{row['memory']['totalPssMb']:>13.0f}")
+
+if args.output:
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({"concurrency": args.concurrency, "duration": args.duration, "results": rows}, f, indent=2)
+    print(f"\nSaved to: {args.output}")
@@ -0,0 +1,68 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+from numpy.lib.format import open_memmap
+from transformers import AutoTokenizer
+
+from datafiles import load_records
+from engines import load_engine
+from padding import bucket_batches, encode
+from similar import SOURCES, document_text
+
+# 수출 이력 / 통제 목록 문서 임베딩 생성 (서버의 /predict 와 같은 엔진, 같은 forward pass)
+# 결과: <output-dir>/<source>.f16.npy (float16, [문서 수, hidden size]) + <source>.json
+# 사용법: python build_embeddings.py [--engine onnxruntime]
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--model-path", default=os.environ.get("ECHELPER_MODEL_PATH", "../models/kobert-strategic-final"))
+parser.add_argument("--engine", default=os.environ.get("ECHELPER_ENGINE", "torch"))
+parser.add_argument("--onnx-path", default=os.environ.get("ECHELPER_ONNX_PATH", "../frontend/public/models/kobert-onnx/model.onnx"))
+parser.add_argument("--data-dir", default=os.environ.get("ECHELPER_DATA_DIR", "../frontend/public/data"))
+parser.add_argument("--output-dir", default=os.environ.get("ECHELPER_EMBEDDINGS_DIR", "../models/embeddings"))
+parser.add_argument("--batch-size", type=int, default=64)
+args = parser.parse_args()
+
+print("=" * 60)
+print("Building document embeddings")
+print("=" * 60)
+
+engine = load_engine(args.engine, args.model_path, args.onnx_path)
+tokenizer = AutoTokenizer.from_pretrained(engine.tokenizer_path)
+os.makedirs(args.output_dir, exist_ok=True)
+
+for source, (filename, fields) in SOURCES.items():
+    documents = load_records(os.path.join(args.data_dir, filename))
+    texts = [document_text(doc, fields) for doc in documents]
+
+    start = time.perf_counter()
+    vectors = None
+    for offset in range(0, len(texts), args.batch_size):
+        chunk = texts[offset:offset + args.batch_size]
+        for indices, model_inputs in bucket_batches(encode(tokenizer, chunk), tokenizer.pad_token_id):
+            _, embeddings = engine.forward(**model_inputs)
+            if embeddings is None:
+                raise SystemExit(f"{engine.name} 엔진의 모델이 hidden state 를 출력하지 않습니다. convert_to_onnx_v2.py 로 다시 변환하세요.")
+            if vectors is None:
+                vectors = open_memmap(
+                    os.path.join(args.output_dir, f"{source}.f16.npy"),
+                    mode='w+', dtype=np.float16, shape=(len(texts), embeddings.shape[1])
+                )
+            vectors[[offset + i for i in indices]] = embeddings.astype(np.float16)
+        print(f"   {source}: {min(offset + args.batch_size, len(texts))}/{len(texts)}")
+
+    vectors.flush()
+    with open(os.path.join(args.output_dir, f"{source}.json"), 'w', encoding='utf-8') as f:
+        json.dump({
+            "source": filename,
+            "count": len(texts),
+            "dim": int(vectors.shape[1]),
+            "engine": engine.name,
+            "model": engine.model_path,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"   {source}: {len(texts)} documents in {time.perf_counter() - start:.1f}s")
+
+print(f"\nEmbeddings saved to: {args.output_dir}")
+print("=" * 60)
@@ -0,0 +1,32 @@
+import gzip
+import json
+import os
+
+
+# frontend/public/data 의 데이터 파일 읽기
+# convert_excel_to_json.py 가 <name>.json 과 함께 쓰는 <name>.columns.json.gz (사전 인코딩된 컬럼 형식) 가 있으면 그쪽을 읽는다.
+# 들여쓰기된 레코드 JSON 보다 작고, 같은 국가/분류/ECCN 문자열을 한 번만 파싱하므로 로드가 빠르다.
+
+
+def columns_path(path):
+    root, _ = os.path.splitext(path)
+    return f"{root}.columns.json.gz"
+
+
+def decode_columns(payload):
+    columns = [
+        [column["dict"][code] for code in column["codes"]] if isinstance(column, dict) else column
+        for column in payload["columns"]
+    ]
+    fields = payload["fields"]
+    return [dict(zip(fields, row)) for row in zip(*columns)] if fields else [{} for _ in range(payload["count"])]
+
+
+def load_records(path):
+    # 컬럼 파일이 레코드 JSON 보다 오래됐으면 (JSON 을 직접 고친 경우) 레코드 JSON 을 읽는다
+    compact = columns_path(path)
+    if os.path.exists(compact) and (not os.path.exists(path) or os.path.getmtime(compact) >= os.path.getmtime(path)):
+        with gzip.open(compact, 'rt', encoding='utf-8') as f:
+            return decode_columns(json.load(f))
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,140 @@
+import math
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from datafiles import load_records
+
+
+# 통제 목록(control_list.json) ECCN 후보 검색
+# 서버 시작 시 각 항목의 설명/키워드를 문자 n-gram TF-IDF 벡터로 만들고 역색인(n-gram -> 항목, 가중치)으로 저장한다.
+# 질의는 질의 텍스트에 등장하는 n-gram 의 posting 만 더해서 코사인 유사도를 구하므로 통제 목록 전체를 다시 훑지 않는다.
+# 한국어 품목명은 띄어쓰기/조사가 제각각이라 단어 대신 문자 n-gram 을 사용한다.
+TEXT_FIELDS = ('eccnDescription1', 'keywordKor', 'keywordEng', 'title', 'description')
+NGRAM_RANGE = (2, 3)
+
+
+def char_ngrams(text, ngram_range=NGRAM_RANGE):
+    text = ' '.join(str(text).lower().split())
+    grams = []
+    for n in range(ngram_range[0], ngram_range[1] + 1):
+        grams.extend(text[i:i + n] for i in range(len(text) - n + 1))
+    return grams
+
+
+class TfidfIndex:
+    def __init__(self, documents, ngram_range=NGRAM_RANGE):
+        self.ngram_range = ngram_range
+        self.counts = [Counter(char_ngrams(doc, ngram_range)) for doc in documents]
+        self._build()
+
+    def _build(self):
+        self.size = len(self.counts)
+        df = Counter(term for c in self.counts for term in c)
+        self.idf = {term: math.log((1 + self.size) / (1 + n)) + 1 for term, n in df.items()}
+
+        postings = defaultdict(lambda: ([], []))
+        for doc_id, c in enumerate(self.counts):
+            weights = {term: (1 + math.log(tf)) * self.idf[term] for term, tf in c.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for term, w in weights.items():
+                ids, values = postings[term]
+                ids.append(doc_id)
+                values.append(w / norm)
+
+        self.postings = {
+            term: (np.array(ids, dtype=np.int32), np.array(values, dtype=np.float32))
+            for term, (ids, values) in postings.items()
+        }
+
+    def updated(self, changed, count):
+        # 바뀐 문서만 n-gram 을 다시 세고, IDF 가 바뀌므로 역색인은 저장된 빈도로 다시 만든다
+        index = TfidfIndex.__new__(TfidfIndex)
+        index.ngram_range = self.ngram_range
+        index.counts = (self.counts + [Counter()] * count)[:count]
+        for i, text in changed:
+            index.counts[i] = Counter(char_ngrams(text, self.ngram_range))
+        index._build()
+        return index
+
+    def scores(self, text):
+        # 질의 벡터와 모든 문서의 코사인 유사도 (공유 n-gram 이 없는 문서는 0)
+        scores = np.zeros(self.size, dtype=np.float32)
+        c = Counter(g for g in char_ngrams(text, self.ngram_range) if g in self.postings)
+        if not c:
+            return scores
+
+        weights = {term: (1 + math.log(tf)) * self.idf[term] for term, tf in c.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        for term, w in weights.items():
+            ids, values = self.postings[term]
+            scores[ids] += values * (w / norm)
+        return scores
+
+    def top_k(self, text, k=5):
+        scores = self.scores(text)
+        k = min(k, self.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(int(i), float(scores[i])) for i in top if scores[i] > 0]
+
+
+def entry_text(entry):
+    return ' '.join(str(entry[field]) for field in TEXT_FIELDS if entry.get(field))
+
+
+class EccnIndex:
+    def __init__(self, entries, class_lookup=None, index=None):
+        self.entries = entries
+        self.class_lookup = class_lookup or {}
+        self.index = index or TfidfIndex([entry_text(entry) for entry in entries])
+
+    @classmethod
+    def from_files(cls, control_list_path, export_history_path=None):
+        entries = load_records(control_list_path)
+        class_lookup = load_class_lookup(export_history_path) if export_history_path else None
+        return cls(entries, class_lookup)
+
+    def updated(self, changed=None, count=None, history=None):
+        # changed/count: control_list.json delta, history: 갱신된 수출 이력 전체 (분류 재계산)
+        entries, index = self.entries, self.index
+        if changed is not None:
+            entries = (self.entries + [{}] * count)[:count]
+            for i, record in changed:
+                entries[i] = record
+            index = self.index.updated([(i, entry_text(record)) for i, record in changed], count)
+        class_lookup = build_class_lookup(history) if history is not None else self.class_lookup
+        return EccnIndex(entries, class_lookup, index)
+
+    def search(self, text, k=5):
+        return [
+            {
+                "eccn": self.entries[i]['eccn'],
+                "score": score,
+                "title": self.entries[i].get('title'),
+                "keyword": self.entries[i].get('keywordKor'),
+            }
+            for i, score in self.index.top_k(text, k)
+        ]
+
+    def class_for(self, eccn):
+        # 수출 이력에서 같은 ECCN (없으면 상위 ECCN) 에 가장 많이 쓰인 분류
+        while eccn:
+            if eccn in self.class_lookup:
+                return self.class_lookup[eccn]
+            eccn = eccn.rpartition('.')[0]
+        return 'N/A'
+
+
+def load_class_lookup(export_history_path):
+    return build_class_lookup(load_records(export_history_path))
+
+
+def build_class_lookup(history):
+    classes = defaultdict(Counter)
+    for case in history:
+        if case.get('eccn') and case.get('class'):
+            for eccn in str(case['eccn']).replace(';', ',').split(','):
+                if eccn.strip():
+                    classes[eccn.strip()][case['class']] += 1
+    return {eccn: c.most_common(1)[0][0] for eccn, c in classes.items()}
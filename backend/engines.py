@@ -0,0 +1,126 @@
+import json
+import os
+
+import numpy as np
+
+
+# 추론 엔진: 패딩된 input_ids / attention_mask (int64 numpy 배열) -> logits (numpy 배열)
+# 엔진과 상관없이 같은 응답 형식을 만들 수 있도록 logits만 반환한다.
+# forward() 는 같은 forward pass 에서 문장 임베딩(마지막 hidden state 평균, L2 정규화)도 함께 반환한다.
+
+
+def mean_pool(hidden, attention_mask):
+    mask = attention_mask[:, :, None].astype(np.float32)
+    pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1.0)
+    return pooled / np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+
+
+class TorchEngine:
+    name = "torch"
+
+    def __init__(self, model_path):
+        import torch
+        from transformers import AutoModelForSequenceClassification
+
+        self.torch = torch
+        self.model_path = model_path
+        self.tokenizer_path = model_path
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_path)
+        self.model.eval()
+
+    def init_worker(self, threads):
+        # serve.py 가 fork 한 worker 에서 호출: 가중치 텐서는 fork 전 메모리를 그대로 공유 (copy-on-write)
+        self.torch.set_num_threads(threads)
+
+    def logits(self, input_ids, attention_mask):
+        with self.torch.no_grad():
+            outputs = self.model(
+                input_ids=self.torch.from_numpy(input_ids),
+                attention_mask=self.torch.from_numpy(attention_mask)
+            )
+        return outputs.logits.numpy()
+
+    def forward(self, input_ids, attention_mask):
+        with self.torch.no_grad():
+            outputs = self.model(
+                input_ids=self.torch.from_numpy(input_ids),
+                attention_mask=self.torch.from_numpy(attention_mask),
+                output_hidden_states=True
+            )
+        return outputs.logits.numpy(), mean_pool(outputs.hidden_states[-1].numpy(), attention_mask)
+
+
+class OnnxEngine:
+    name = "onnxruntime"
+
+    def __init__(self, onnx_path):
+        self.model_path = onnx_path
+        # convert_to_onnx_v2.py 는 토크나이저를 model.onnx 와 같은 폴더에 저장한다
+        self.tokenizer_path = os.path.dirname(onnx_path)
+        self.session = self._create_session()
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        # 이전 버전 convert_to_onnx_v2.py 로 변환한 모델에는 last_hidden_state 출력이 없다
+        self.has_hidden_state = 'last_hidden_state' in [o.name for o in self.session.get_outputs()]
+
+    def _create_session(self, threads=None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        return ort.InferenceSession(self.model_path, options, providers=["CPUExecutionProvider"])
+
+    def init_worker(self, threads):
+        # onnxruntime 세션의 스레드 풀은 fork 후 child 에 없으므로 세션을 새로 만든다 (가중치도 worker 마다 따로 올라감)
+        # fork 전 세션은 해제하지 않고 둔다: 소멸자가 child 에 없는 스레드를 기다릴 수 있음
+        self._parent_session = self.session
+        self.session = self._create_session(threads)
+
+    def _feeds(self, input_ids, attention_mask):
+        feeds = {'input_ids': input_ids, 'attention_mask': attention_mask}
+        if 'token_type_ids' in self.input_names:
+            feeds['token_type_ids'] = np.zeros_like(input_ids)
+        return {name: feeds[name] for name in self.input_names}
+
+    def logits(self, input_ids, attention_mask):
+        return self.session.run(['logits'], self._feeds(input_ids, attention_mask))[0]
+
+    def forward(self, input_ids, attention_mask):
+        if not self.has_hidden_state:
+            return self.logits(input_ids, attention_mask), None
+        logits, hidden = self.session.run(['logits', 'last_hidden_state'], self._feeds(input_ids, attention_mask))
+        return logits, mean_pool(hidden, attention_mask)
+
+
+ENGINES = {
+    TorchEngine.name: lambda model_path, onnx_path: TorchEngine(model_path),
+    OnnxEngine.name: lambda model_path, onnx_path: OnnxEngine(onnx_path),
+}
+
+
+def load_engine(name, model_path, onnx_path):
+    if name not in ENGINES:
+        raise ValueError(f"알 수 없는 추론 엔진: {name} (가능한 값: {', '.join(ENGINES)})")
+    return ENGINES[name](model_path, onnx_path)
+
+
+def softmax(logits, temperature=1.0):
+    scaled = logits / temperature
+    shifted = scaled - scaled.max(axis=1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+# 판정 기준: scripts/sweep_threshold.py 가 모델 폴더에 저장한 operating_point.json
+# 파일이 없으면 기존 기준 (threshold 0.5, temperature 1.0) 을 사용한다.
+DEFAULT_OPERATING_POINT = {"threshold": 0.5, "temperature": 1.0}
+
+
+def load_operating_point(path):
+    if not os.path.exists(path):
+        return dict(DEFAULT_OPERATING_POINT)
+    with open(path, encoding='utf-8') as f:
+        saved = json.load(f)
+    return {key: float(saved.get(key, default)) for key, default in DEFAULT_OPERATING_POINT.items()}
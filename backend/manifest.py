@@ -0,0 +1,71 @@
+import os
+from itertools import islice
+
+
+# 업로드된 선적 목록(CSV/XLSX)에서 data_total 컬럼을 한 줄씩 읽는다
+# 파일 전체를 메모리에 올리지 않도록 CSV는 chunk 단위, XLSX는 read-only 모드로 순회
+TEXT_COLUMN = 'data_total'
+
+
+def open_manifest(file, filename, chunk_size=1000):
+    ext = os.path.splitext(filename or '')[1].lower()
+    if ext == '.csv':
+        return _iter_csv(file, chunk_size)
+    if ext in ('.xlsx', '.xlsm'):
+        return _iter_xlsx(file)
+    raise ValueError(f"지원하지 않는 파일 형식입니다: {filename} (CSV/XLSX만 가능)")
+
+
+def _iter_csv(file, chunk_size):
+    # pandas / openpyxl 은 업로드가 있을 때만 import (서버 시작 시간 단축)
+    import pandas as pd
+
+    # 헤더 검증은 reader 생성 시점에 수행됨 (컬럼이 없으면 ValueError)
+    reader = pd.read_csv(
+        file,
+        usecols=[TEXT_COLUMN],
+        dtype=str,
+        chunksize=chunk_size,
+        encoding='utf-8-sig'
+    )
+
+    def rows():
+        for chunk in reader:
+            yield from chunk[TEXT_COLUMN].fillna('').astype(str)
+
+    return rows()
+
+
+def _iter_xlsx(file):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    sheet = workbook.worksheets[0]
+    rows = sheet.iter_rows(values_only=True)
+
+    header = [str(c).strip() if c is not None else '' for c in next(rows, ())]
+    if TEXT_COLUMN not in header:
+        workbook.close()
+        raise ValueError(f"'{TEXT_COLUMN}' 컬럼을 찾을 수 없습니다.")
+    col = header.index(TEXT_COLUMN)
+
+    def values():
+        try:
+            for row in rows:
+                value = row[col] if col < len(row) else None
+                yield '' if value is None else str(value)
+        finally:
+            workbook.close()
+
+    return values()
+
+
+def read_chunk(iterator, size):
+    # 최대 size 개를 읽어 (읽은 값 목록, 도중에 난 예외 또는 None) 반환: 잘못된 행 앞까지 읽은 값은 버리지 않는다
+    chunk = []
+    try:
+        for value in islice(iterator, size):
+            chunk.append(value)
+    except Exception as e:
+        return chunk, e
+    return chunk, None
@@ -0,0 +1,43 @@
+import numpy as np
+
+
+# 길이 구간 (토큰 수). 같은 구간의 입력끼리만 묶어서 가장 긴 입력 길이까지만 패딩한다.
+# 대부분의 품목명은 15 토큰 이하라서 max_length(128) 고정 패딩은 연산 대부분이 PAD 토큰에 쓰인다.
+LENGTH_BUCKETS = (16, 32, 64, 128)
+
+
+def encode(tokenizer, texts, max_length=128):
+    # 패딩 없이 토큰 ID만 생성
+    encoded = tokenizer(
+        texts,
+        max_length=max_length,
+        truncation=True,
+        return_attention_mask=False,
+        return_token_type_ids=False
+    )
+    return encoded['input_ids']
+
+
+def pad_batch(sequences, pad_token_id):
+    # 배치 내 가장 긴 시퀀스 길이로 패딩
+    max_len = max(len(seq) for seq in sequences)
+    input_ids = np.full((len(sequences), max_len), pad_token_id, dtype=np.int64)
+    attention_mask = np.zeros((len(sequences), max_len), dtype=np.int64)
+
+    for row, seq in enumerate(sequences):
+        input_ids[row, :len(seq)] = seq
+        attention_mask[row, :len(seq)] = 1
+
+    return {'input_ids': input_ids, 'attention_mask': attention_mask}
+
+
+def bucket_batches(sequences, pad_token_id, buckets=LENGTH_BUCKETS):
+    # (원래 인덱스 목록, 모델 입력) 을 구간별로 생성
+    groups = {}
+    for i, seq in enumerate(sequences):
+        bound = next((b for b in buckets if len(seq) <= b), None)
+        groups.setdefault(bound, []).append(i)
+
+    for bound in sorted(groups, key=lambda b: float('inf') if b is None else b):
+        indices = groups[bound]
+        yield indices, pad_batch([sequences[i] for i in indices], pad_token_id)
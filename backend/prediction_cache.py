@@ -0,0 +1,300 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+# 예측 결과 캐시
+# 키: 정규화한 입력 텍스트 + 버전 (모델 파일 지문, 판정 임계값/temperature, 데이터 버전 등)
+# 모델 폴더의 파일이 바뀌면 지문이 달라지므로 예전 결과는 다시 쓰이지 않는다.
+# 서버 실행 중에 모델 폴더가 바뀌면 (재학습/교체) 메모리에 올라간 모델은 이미 옛것이므로 캐시를 비우고 재시작 전까지 끈다.
+#   1단계: 프로세스 내 LRU (최대 개수 + TTL)
+#   2단계 (선택): SQLite 파일, 여러 worker 프로세스와 재시작 사이에 공유
+#                 조회/저장은 전용 스레드 1개에서 실행 (이벤트 루프와 추론 스레드를 막지 않음),
+#                 저장은 모아 두었다가 한 트랜잭션으로 기록 (write-behind)
+
+
+def normalize_text(text):
+    # 유니코드 정규화 (NFC) + 앞뒤/연속 공백 정리: 같은 품목 설명을 같은 키로
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def directory_fingerprint(*paths):
+    # 파일 목록과 (크기, 수정 시각) 의 해시: 내용을 읽지 않아도 교체/재학습을 감지
+    h = hashlib.sha256()
+    for path in paths:
+        if not path or not os.path.exists(path):
+            continue
+        files = [path] if os.path.isfile(path) else sorted(
+            os.path.join(root, name) for root, _, names in os.walk(path) for name in names
+        )
+        for file in files:
+            stat = os.stat(file)
+            h.update(f"{file}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+class SqliteTier:
+    def __init__(self, path, max_entries=1000000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        self._conn.execute("CREATE TABLE IF NOT EXISTS predictions (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS predictions_expires ON predictions (expires)")
+        self._conn.commit()
+        self._puts = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+        # WAL: 여러 worker 프로세스가 동시에 읽고 쓰기
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def reopen(self):
+        # SQLite 연결은 fork 후 공유하면 안 됨: worker 마다 새 연결 (상속받은 연결은 닫지 않고 버림)
+        self._inherited = self._conn
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+
+    def get_many(self, keys, now):
+        # key -> 결과 (없거나 만료된 key 는 빠짐), SQLite 변수 개수 제한 때문에 500개씩 조회
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                part = keys[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM predictions WHERE key IN ({','.join('?' * len(part))}) AND expires > ?",
+                    (*part, now),
+                ).fetchall()
+                found.update((key, json.loads(value)) for key, value in rows)
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, rows):
+        # rows: (key, 결과, 만료 시각) 목록을 한 트랜잭션으로 저장
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO predictions (key, value, expires) VALUES (?, ?, ?)",
+                [(key, json.dumps(value, ensure_ascii=False), expires) for key, value, expires in rows],
+            )
+            self._conn.commit()
+            before = self._puts
+            self._puts += len(rows)
+            if self._puts // 1000 != before // 1000:
+                self._prune()
+
+    def _prune(self):
+        # 만료된 항목, 그리고 최대 개수를 넘으면 만료가 가장 빠른 항목부터 삭제
+        deleted = self._conn.execute("DELETE FROM predictions WHERE expires <= ?", (time.time(),)).rowcount
+        excess = self._conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0] - self.max_entries
+        if excess > 0:
+            deleted += self._conn.execute(
+                "DELETE FROM predictions WHERE key IN (SELECT key FROM predictions ORDER BY expires LIMIT ?)", (excess,)
+            ).rowcount
+        self._conn.commit()
+        self.evictions += deleted
+
+    def size(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "size": self.size(),
+            "maxEntries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": self.hits / lookups if lookups else 0,
+            "evictions": self.evictions,
+        }
+
+
+class PredictionCache:
+    def __init__(self, max_entries=10000, ttl_seconds=3600, db_path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.version = ''
+        self._entries = OrderedDict()  # key -> (만료 시각, 결과)
+        self._lock = threading.Lock()
+        self.disk = SqliteTier(db_path) if db_path else None
+        self._start_disk_thread()
+        self.stale = False
+        self._watched = ()
+        self._fingerprint = None
+        self.check_interval = 30
+
+        # hits / misses: 두 단계를 합친 결과 (메모리나 SQLite 중 한 곳에서 찾으면 적중)
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.memory_misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _start_disk_thread(self):
+        # SQLite 전용 스레드 (추론 스레드와 별개) 와 아직 기록하지 않은 저장 목록
+        self._disk_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prediction-cache") if self.disk is not None else None
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._flush_scheduled = False
+
+    def reopen(self):
+        # fork 후 worker 마다 SQLite 연결과 전용 스레드를 새로 만듦
+        if self.disk is not None:
+            self.disk.reopen()
+            self._start_disk_thread()
+
+    def close(self):
+        # 남은 저장 목록을 기록하고 전용 스레드 종료
+        if self._disk_executor is not None:
+            self._disk_executor.shutdown(wait=True)
+
+    @property
+    def enabled(self):
+        return (self.max_entries > 0 or self.disk is not None) and not self.stale
+
+    def watch(self, *paths, interval=30):
+        # 로드한 모델 파일의 지문 (버전 키에도 포함), check_model 은 interval 초마다 백그라운드에서 호출
+        self._watched = paths
+        self.check_interval = interval
+        self._fingerprint = directory_fingerprint(*paths)
+        return self._fingerprint
+
+    def check_model(self):
+        # 파일 목록을 다시 읽으므로 이벤트 루프 밖 (스레드) 에서 호출
+        if not self._watched or self.stale:
+            return
+        if directory_fingerprint(*self._watched) != self._fingerprint:
+            print("⚠️ Model files changed: prediction cache disabled until restart")
+            self.stale = True
+            with self._lock:
+                self._entries.clear()
+
+    def set_version(self, *parts):
+        # 버전이 바뀌면 (데이터 갱신 등) 메모리 캐시는 비운다 (SQLite 는 키가 달라져 자연히 무시됨)
+        version = hashlib.sha256(json.dumps(parts, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()[:16]
+        if version != self.version:
+            with self._lock:
+                self._entries.clear()
+            self.version = version
+
+    def key(self, text):
+        return hashlib.sha256(f"{self.version}\0{normalize_text(text)}".encode('utf-8')).hexdigest()
+
+    async def get_many(self, texts):
+        # 메모리는 바로 확인하고, 메모리에 없는 것만 SQLite 전용 스레드에서 한 번에 조회
+        if not self.enabled:
+            return [None] * len(texts)
+        now = time.time()
+        keys = [self.key(text) for text in texts]
+        results = [self._lookup(key, now) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing and self.disk is not None:
+            loop = asyncio.get_running_loop()
+            found = await loop.run_in_executor(self._disk_executor, self.disk.get_many, [keys[i] for i in missing], now)
+            for i in missing:
+                result = found.get(keys[i])
+                if result is not None:
+                    self._remember(keys[i], result, now + self.ttl)
+                    results[i] = result
+        misses = results.count(None)
+        self.hits += len(results) - misses
+        self.misses += misses
+        return results
+
+    async def get(self, text):
+        return (await self.get_many([text]))[0]
+
+    def put_many(self, texts, results):
+        # 메모리에는 바로 저장, SQLite 는 저장 목록에 추가만 하고 전용 스레드가 모아서 기록 (기다리지 않음)
+        if not self.enabled:
+            return
+        expires = time.time() + self.ttl
+        rows = []
+        for text, result in zip(texts, results):
+            key = self.key(text)
+            self._remember(key, result, expires)
+            rows.append((key, result, expires))
+        if self.disk is None:
+            return
+        with self._pending_lock:
+            self._pending.extend(rows)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        self._disk_executor.submit(self._flush)
+
+    def put(self, text, result):
+        self.put_many([text], [result])
+
+    def _flush(self):
+        # 기록을 기다리는 동안 쌓인 저장 목록을 한 트랜잭션으로
+        with self._pending_lock:
+            rows, self._pending = self._pending, []
+            self._flush_scheduled = False
+        try:
+            self.disk.put_many(rows)
+        except sqlite3.Error as e:
+            print(f"⚠️ Prediction cache write failed: {e}")
+
+    def _lookup(self, key, now):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.expirations += 1
+            self.memory_misses += 1
+        return None
+
+    def _remember(self, key, result, expires):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (expires, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        # 최상위 hits / misses / hitRate 는 전체, memory / disk 는 단계별 (메모리에서 못 찾고 SQLite 에서 찾으면 memory 실패 + disk 적중)
+        lookups = self.hits + self.misses
+        memory_lookups = self.memory_hits + self.memory_misses
+        return {
+            "enabled": self.enabled,
+            "stale": self.stale,
+            "version": self.version,
+            "modelFingerprint": self._fingerprint,
+            "ttlSeconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": self.hits / lookups if lookups else 0,
+            "memory": {
+                "size": len(self._entries),
+                "maxEntries": self.max_entries,
+                "hits": self.memory_hits,
+                "misses": self.memory_misses,
+                "hitRate": self.memory_hits / memory_lookups if memory_lookups else 0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            },
+            "disk": self.disk.stats() if self.disk is not None else None,
+        }
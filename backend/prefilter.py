@@ -0,0 +1,119 @@
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+
+import numpy as np
+
+
+# 2단계 cascade 의 1단계: 문자 n-gram TF-IDF + 로지스틱 회귀 (scripts/train_prefilter.py 로 학습)
+# 확신이 높은 요청은 여기서 바로 답하고, 애매한 요청만 KoBERT 로 넘긴다.
+# 학습 스크립트가 sklearn TfidfVectorizer(analyzer='char_wb') 의 어휘/IDF 와 회귀 계수를 배열로 저장하므로
+# 서버는 sklearn 없이 같은 n-gram 분석과 점수 계산만 한다.
+
+WHITE_SPACES = re.compile(r"\s\s+")
+
+
+def char_wb_ngrams(text, ngram_range):
+    # sklearn 의 char_wb 분석기와 같음: 단어마다 앞뒤에 공백을 붙여 단어 안에서만 n-gram 생성
+    text = WHITE_SPACES.sub(" ", text.lower())
+    min_n, max_n = ngram_range
+    grams = []
+    for word in text.split():
+        word = f" {word} "
+        for n in range(min_n, max_n + 1):
+            offset = 0
+            grams.append(word[offset:offset + n])
+            while offset + n < len(word):
+                offset += 1
+                grams.append(word[offset:offset + n])
+            if offset == 0:
+                # 단어가 n 보다 짧으면 한 번만
+                break
+    return grams
+
+
+class LexicalPrefilter:
+    def __init__(self, terms, idf, coef, intercept, config):
+        self.vocab = {term: i for i, term in enumerate(terms)}
+        self.idf = idf
+        self.coef = coef
+        self.intercept = intercept
+        self.ngram_range = tuple(config["ngramRange"])
+        self.sublinear_tf = config["sublinearTf"]
+        # p(전략물자) <= low 이면 비전략물자, >= high 이면 전략물자로 바로 응답
+        self.low = config["thresholds"]["low"]
+        self.high = config["thresholds"]["high"]
+        self.config = config
+
+    @classmethod
+    def load(cls, model_dir):
+        weights_path = os.path.join(model_dir, "prefilter.npz")
+        if not os.path.exists(weights_path):
+            return None
+        with open(os.path.join(model_dir, "prefilter.json"), encoding='utf-8') as f:
+            config = json.load(f)
+        weights = np.load(weights_path)
+        return cls(weights["terms"].tolist(), weights["idf"], weights["coef"], float(weights["intercept"]), config)
+
+    def predict(self, texts):
+        # 문서마다 TF-IDF (l2 정규화) 와 계수의 내적 -> sigmoid
+        probs = np.empty(len(texts))
+        for row, text in enumerate(texts):
+            counts = Counter(g for g in char_wb_ngrams(text, self.ngram_range) if g in self.vocab)
+            if not counts:
+                probs[row] = 1 / (1 + math.exp(-self.intercept))
+                continue
+            cols = np.fromiter((self.vocab[g] for g in counts), dtype=np.int64, count=len(counts))
+            tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+            if self.sublinear_tf:
+                tf = 1 + np.log(tf)
+            weights = tf * self.idf[cols]
+            score = weights @ self.coef[cols] / np.linalg.norm(weights) + self.intercept
+            probs[row] = 1 / (1 + math.exp(-score))
+        return probs
+
+    def decide(self, prob):
+        # 0: 비전략물자, 1: 전략물자, None: KoBERT 로 넘김
+        if prob <= self.low:
+            return 0
+        if prob >= self.high:
+            return 1
+        return None
+
+
+class CascadeStats:
+    # 단계별 응답 수와 요청당 평균 소요 시간 (배치 처리 시간을 그 단계를 거친 요청 수로 나눔)
+    def __init__(self, stages=("prefilter", "kobert")):
+        self._lock = threading.Lock()
+        self.total = 0
+        self.answered = {stage: 0 for stage in stages}
+        self.processed = {stage: 0 for stage in stages}
+        self.seconds = {stage: 0.0 for stage in stages}
+
+    def record(self, stage, processed, answered, seconds):
+        with self._lock:
+            self.processed[stage] += processed
+            self.answered[stage] += answered
+            self.seconds[stage] += seconds
+
+    def add_requests(self, count):
+        with self._lock:
+            self.total += count
+
+    def stats(self):
+        with self._lock:
+            return {
+                "totalRequests": self.total,
+                "stages": {
+                    stage: {
+                        "processed": self.processed[stage],
+                        "answered": self.answered[stage],
+                        "hitRate": self.answered[stage] / self.total if self.total else 0,
+                        "avgLatencyMs": self.seconds[stage] / self.processed[stage] * 1000 if self.processed[stage] else 0,
+                    }
+                    for stage in self.answered
+                },
+            }
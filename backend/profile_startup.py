@@ -0,0 +1,65 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+# 서버 시작 시간 분석: 새 프로세스에서 app import -> 모델/인덱스 로드 -> 워밍업을 실행하고
+#   1) python -X importtime 결과에서 누적 import 시간이 큰 최상위 모듈
+#   2) app 이 기록한 단계별 소요 시간 (startup.stages, /ready 응답과 같은 값)
+# 을 출력한다.
+#
+# 사용법: python profile_startup.py [--top 15] [--output startup_profile.json]
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--top", type=int, default=15)
+parser.add_argument("--output", default=None)
+args = parser.parse_args()
+
+CODE = "import json, app; app.startup.run(app.load, app.warm_up); print('STAGES ' + json.dumps(app.startup.status()))"
+
+# -X importtime 출력: "import time: self [us] | cumulative | imported package" (들여쓰기가 import 깊이)
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+print("=" * 60)
+print("Startup Profile")
+print("=" * 60)
+
+start = time.perf_counter()
+process = subprocess.run(
+    [sys.executable, "-X", "importtime", "-c", CODE],
+    cwd=os.path.dirname(os.path.abspath(__file__)),
+    capture_output=True,
+    text=True,
+)
+wall = time.perf_counter() - start
+if process.returncode != 0:
+    print(process.stdout)
+    print(process.stderr[-4000:])
+    sys.exit(process.returncode)
+
+imports = []
+for line in process.stderr.splitlines():
+    match = IMPORT_LINE.match(line)
+    # 최상위 import (들여쓰기 1칸) 만: 하위 모듈 시간은 누적 시간에 포함됨
+    if match and len(match.group(3)) == 1:
+        imports.append({"module": match.group(4), "cumulativeMs": int(match.group(2)) / 1000})
+imports.sort(key=lambda m: -m["cumulativeMs"])
+
+status = next(json.loads(line[len("STAGES "):]) for line in process.stdout.splitlines() if line.startswith("STAGES "))
+
+print(f"\nTop {args.top} imports (cumulative):")
+for entry in imports[:args.top]:
+    print(f"   {entry['cumulativeMs']:>9.1f} ms  {entry['module']}")
+
+print("\nStartup stages:")
+for name, seconds in status["stages"].items():
+    print(f"   {seconds:>9.2f} s   {name}")
+print(f"\nState: {status['state']}, ready after {status['readyAfterSeconds'] or 0:.2f}s (process wall time {wall:.2f}s)")
+
+if args.output:
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({"wallSeconds": wall, "stages": status["stages"], "imports": imports}, f, indent=2)
+    print(f"Saved to: {args.output}")
@@ -0,0 +1,102 @@
+import json
+import os
+
+import numpy as np
+
+
+# 임베딩 기반 유사 사례 검색
+# build_embeddings.py 가 저장한 float16 행렬(<source>.f16.npy)을 memory-map 으로 열고,
+# 질의 임베딩(L2 정규화)과의 내적 한 번으로 코사인 유사도 top-k 를 구한다.
+# 문서 수가 ivf_min_size 이상이면 k-means 로 나눈 IVF 인덱스를 만들어 가까운 nprobe 개 구간만 검색한다.
+IVF_MIN_SIZE = 50000
+
+
+class EmbeddingIndex:
+    def __init__(self, vectors, documents, ivf_min_size=IVF_MIN_SIZE, nlist=None, nprobe=8):
+        self.vectors = vectors
+        self.documents = documents
+        self.nprobe = nprobe
+        self.centroids = None
+        if len(vectors) >= ivf_min_size:
+            self._build_ivf(nlist or int(np.sqrt(len(vectors))))
+        else:
+            # 작은 코퍼스는 float32 로 한 번만 변환해 두고 매 질의는 행렬곱 한 번으로 처리
+            self.matrix = np.asarray(vectors, dtype=np.float32)
+
+    @classmethod
+    def load(cls, embeddings_dir, source, documents, **kwargs):
+        path = os.path.join(embeddings_dir, f"{source}.f16.npy")
+        if not os.path.exists(path):
+            return None
+        vectors = np.load(path, mmap_mode='r')
+        with open(os.path.join(embeddings_dir, f"{source}.json"), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta['count'] != len(documents):
+            raise ValueError(f"{path}: 임베딩 수({meta['count']})와 문서 수({len(documents)})가 다릅니다. build_embeddings.py 를 다시 실행하세요.")
+        return cls(vectors, documents, **kwargs)
+
+    def _build_ivf(self, nlist, iterations=10, sample_size=100000):
+        rng = np.random.default_rng(0)
+        sample = np.asarray(self.vectors[rng.choice(len(self.vectors), min(sample_size, len(self.vectors)), replace=False)], dtype=np.float32)
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)]
+        for _ in range(iterations):
+            assign = (sample @ centroids.T).argmax(axis=1)
+            for c in range(nlist):
+                members = sample[assign == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+
+        self.centroids = centroids
+        self._assign_lists()
+
+    def _assign_lists(self):
+        nlist = len(self.centroids)
+        assign = np.concatenate([
+            (np.asarray(self.vectors[i:i + 65536], dtype=np.float32) @ self.centroids.T).argmax(axis=1)
+            for i in range(0, len(self.vectors), 65536)
+        ])
+        order = np.argsort(assign, kind='stable')
+        self.lists = np.split(order, np.searchsorted(assign[order], np.arange(1, nlist)))
+
+    def updated(self, documents, changed_ids, embeddings):
+        # 바뀐 문서의 임베딩만 교체한 새 인덱스 (IVF 는 기존 centroid 를 그대로 쓰고 목록만 다시 배정)
+        vectors = np.zeros((len(documents), self.vectors.shape[1]), dtype=np.float16)
+        n = min(len(documents), len(self.vectors))
+        vectors[:n] = self.vectors[:n]
+        if len(changed_ids):
+            vectors[changed_ids] = embeddings
+
+        index = EmbeddingIndex.__new__(EmbeddingIndex)
+        index.vectors = vectors
+        index.documents = documents
+        index.nprobe = self.nprobe
+        index.centroids = self.centroids
+        if index.centroids is None:
+            index.matrix = vectors.astype(np.float32)
+        else:
+            index._assign_lists()
+        return index
+
+    def search(self, queries, k=5):
+        # queries: [B, dim] 정규화된 임베딩 -> 질의별 [(문서 인덱스, 유사도), ...]
+        queries = np.asarray(queries, dtype=np.float32)
+        if self.centroids is None:
+            scores = queries @ self.matrix.T
+            return [self._top_k(np.arange(len(self.vectors)), row, k) for row in scores]
+
+        probes = np.argsort(-(queries @ self.centroids.T), axis=1)[:, :self.nprobe]
+        results = []
+        for query, lists in zip(queries, probes):
+            candidates = np.concatenate([self.lists[c] for c in lists])
+            results.append(self._top_k(candidates, np.asarray(self.vectors[candidates], dtype=np.float32) @ query, k))
+        return results
+
+    @staticmethod
+    def _top_k(ids, scores, k):
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(int(ids[i]), float(scores[i])) for i in top]
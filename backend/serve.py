@@ -0,0 +1,128 @@
+import argparse
+import gc
+import os
+import signal
+import socket
+import tempfile
+import time
+import traceback
+
+# 여러 worker 프로세스로 서버 실행 (pre-fork)
+# 모델/토크나이저/검색 인덱스는 마스터 프로세스에서 한 번만 로드하고 fork 하므로
+# 가중치 메모리는 worker 들이 copy-on-write 로 공유한다 (torch 엔진 기준, onnxruntime 은 worker 마다 세션을 새로 만듦).
+# worker 마다 추론 스레드 수를 (코어 수 / worker 수) 로 나눠 코어를 서로 뺏지 않게 한다.
+#
+# 사용법: python serve.py --workers 4 [--threads-per-worker 2] [--pin-cores]
+# worker 별 메모리 / 처리량 비교: python benchmark_workers.py --workers 1,2,4
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--host", default="0.0.0.0")
+parser.add_argument("--port", type=int, default=8000)
+parser.add_argument("--workers", type=int, default=int(os.environ.get("ECHELPER_WORKERS", "2")))
+parser.add_argument("--threads-per-worker", type=int, default=None, help="기본: 사용 가능한 코어 수 / workers")
+parser.add_argument("--pin-cores", action="store_true", help="worker 마다 서로 다른 코어에 고정 (sched_setaffinity)")
+parser.add_argument("--backlog", type=int, default=2048)
+parser.add_argument("--log-level", default="info")
+args = parser.parse_args()
+
+
+def available_cores():
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        return list(range(os.cpu_count() or 1))
+
+
+cores = available_cores()
+threads = args.threads_per_worker or max(1, len(cores) // args.workers)
+
+# fork 전에 설정해야 하는 것들 (app import 전)
+# - HF tokenizers 의 병렬 처리 스레드 풀은 fork 후 쓸 수 없다
+# - 모델은 app.load() 로 마스터에서 로드하고, 워밍업은 worker 마다 추론 스레드에서 실행 (app.lifespan)
+# - 마스터에서 torch 스레드 풀(OpenMP)이 만들어지지 않도록 1 스레드로 로드, worker 에서 스레드 수 지정
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+# - worker 별 메트릭을 모을 폴더 (/metrics 는 모든 worker 의 값을 합쳐서 응답)
+metrics_dir = os.environ.setdefault("ECHELPER_METRICS_DIR", tempfile.mkdtemp(prefix="echelper-metrics-"))
+os.makedirs(metrics_dir, exist_ok=True)
+for name in os.listdir(metrics_dir):
+    if name.endswith(".json"):
+        os.remove(os.path.join(metrics_dir, name))
+if os.environ.get("ECHELPER_ENGINE", "torch") == "torch":
+    import torch
+    torch.set_num_threads(1)
+
+import uvicorn
+
+start = time.perf_counter()
+import app as application
+application.load()
+print(f"Master loaded model and indexes in {time.perf_counter() - start:.1f}s")
+
+# worker 들이 같은 소켓에서 accept
+sock = socket.socket(socket.AF_INET6 if ':' in args.host else socket.AF_INET)
+sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+sock.bind((args.host, args.port))
+sock.listen(args.backlog)
+sock.set_inheritable(True)
+
+# fork 이후 GC 가 마스터에서 만든 객체들을 훑으면서 페이지를 복사하지 않도록 현재 객체를 GC 대상에서 제외
+gc.freeze()
+
+
+def run_worker(index):
+    if args.pin_cores:
+        first = index * threads % len(cores)
+        os.sched_setaffinity(0, {cores[(first + i) % len(cores)] for i in range(threads)})
+    application.init_worker(threads)
+    print(f"Worker {index} (pid {os.getpid()}): {threads} threads")
+    server = uvicorn.Server(uvicorn.Config(application.app, log_level=args.log_level))
+    server.run(sockets=[sock])
+
+
+def spawn(index):
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        code = 0
+        try:
+            run_worker(index)
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+workers = {spawn(index): index for index in range(args.workers)}
+print(f"Serving on http://{args.host}:{args.port} with {args.workers} workers x {threads} threads")
+
+stopping = False
+
+
+def stop(signum, frame):
+    global stopping
+    stopping = True
+    for pid in workers:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+
+signal.signal(signal.SIGINT, stop)
+signal.signal(signal.SIGTERM, stop)
+
+# worker 가 비정상 종료하면 마스터에서 다시 fork (마스터는 추론을 하지 않으므로 항상 깨끗한 상태)
+while workers:
+    try:
+        pid, status = os.wait()
+    except ChildProcessError:
+        break
+    index = workers.pop(pid, None)
+    if index is None or stopping:
+        continue
+    print(f"⚠️ Worker {index} (pid {pid}) exited with code {os.waitstatus_to_exitcode(status)}, restarting")
+    time.sleep(1)
+    workers[spawn(index)] = index
@@ -0,0 +1,125 @@
+import math
+import re
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+from datafiles import load_records
+
+
+# 유사 사례 검색 (frontend/src/utils/tfidf.ts 의 서버 버전)
+# 토크나이징, 불용어, TF(빈도 / 전체 단어 수), IDF(log(전체 문서 수 / 등장 문서 수)), 코사인 유사도를 tfidf.ts 와 똑같이 계산한다.
+# tfidf.ts 는 질의도 문서 하나로 보고 IDF 를 매번 다시 계산하므로, 여기서는 문서별 TF 를 CSR 행렬로 한 번만 만들어 두고
+# 질의에 등장하는 단어의 IDF 변화분만 보정해서 같은 점수를 낸다.
+
+# JS 정규식의 \w 는 ASCII 문자만 포함하므로 명시적으로 적는다
+NON_TOKEN = re.compile(r'[^A-Za-z0-9_ㄱ-ㅎ가-힣\s]')
+
+STOP_WORDS = {
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
+    'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
+    '이', '그', '저', '것', '수', '등', '및', '위한', '있는', '하는', '되는',
+    '관련', '장비', '시스템', '기술', '설계', '제조'
+}
+
+# 문서별로 합쳐서 검색하는 필드 (export_history 는 tfidf.ts 와 같은 필드)
+SOURCES = {
+    'history': ('export_history.json', ('title', 'description', 'purpose', 'application')),
+    'control': ('control_list.json', ('title', 'keywordKor', 'keywordEng', 'eccnDescription1', 'description')),
+}
+
+
+def tokenize(text):
+    if not text:
+        return []
+    cleaned = NON_TOKEN.sub(' ', text.lower())
+    return [t for t in cleaned.split() if len(t) > 1 and t not in STOP_WORDS]
+
+
+def document_text(doc, fields):
+    return ' '.join(str(doc.get(f) or '') for f in fields)
+
+
+class SimilarCaseIndex:
+    def __init__(self, documents, fields):
+        self.documents = list(documents)
+        self.fields = fields
+        self.vocab = {}
+        self.rows = [self._vectorize(doc) for doc in self.documents]
+        self._assemble()
+
+    def _vectorize(self, doc):
+        # 문서 1개 -> (단어 인덱스, 정규화된 빈도)
+        tokens = tokenize(document_text(doc, self.fields))
+        counts = Counter(tokens)
+        cols = np.array([self.vocab.setdefault(term, len(self.vocab)) for term in counts], dtype=np.int64)
+        values = np.array([c / len(tokens) for c in counts.values()], dtype=np.float64)
+        return cols, values
+
+    def _assemble(self):
+        lengths = [len(cols) for cols, _ in self.rows]
+        indptr = np.r_[0, np.cumsum(lengths)].astype(np.int64)
+        indices = np.concatenate([cols for cols, _ in self.rows]) if self.rows else np.zeros(0, dtype=np.int64)
+        values = np.concatenate([values for _, values in self.rows]) if self.rows else np.zeros(0)
+
+        # tf: [문서 수, 단어 수] 정규화된 빈도
+        self.tf = sparse.csr_matrix((values, indices, indptr), shape=(len(self.rows), len(self.vocab)))
+        self.tf_csc = self.tf.tocsc()
+        # 질의 문서 1개를 포함한 전체 문서 수 기준 (질의에 없는 단어의 IDF)
+        self.total_docs = len(self.rows) + 1
+        self.df = np.diff(self.tf_csc.indptr)
+        self.idf = np.log(self.total_docs / np.maximum(self.df, 1))
+        self.norm2 = np.asarray(self.tf.multiply(self.tf) @ (self.idf ** 2)).ravel()
+
+    def updated(self, changed, count):
+        # 바뀐 문서만 다시 토크나이징한 새 인덱스 (기존 인덱스는 그대로 두어 검색 중인 요청에 영향 없음)
+        index = SimilarCaseIndex.__new__(SimilarCaseIndex)
+        index.fields = self.fields
+        index.vocab = dict(self.vocab)
+        index.documents = (self.documents + [{}] * count)[:count]
+        index.rows = (self.rows + [(np.zeros(0, dtype=np.int64), np.zeros(0))] * count)[:count]
+        for i, record in changed:
+            index.documents[i] = record
+            index.rows[i] = index._vectorize(record)
+        index._assemble()
+        return index
+
+    @classmethod
+    def from_file(cls, path, fields):
+        return cls(load_records(path), fields)
+
+    def scores(self, query):
+        tokens = tokenize(query)
+        if not tokens:
+            return np.zeros(len(self.documents))
+
+        counts = Counter(tokens)
+        known = [(self.vocab[t], c / len(tokens)) for t, c in counts.items() if t in self.vocab]
+        # 어휘에 없는 단어는 질의에만 등장 (IDF = log(전체 문서 수 / 1)), 질의 노름에만 기여
+        unknown = [c / len(tokens) for t, c in counts.items() if t not in self.vocab]
+
+        cols = np.array([c for c, _ in known], dtype=np.int64)
+        q_tf = np.array([v for _, v in known])
+        q_idf = np.log(self.total_docs / (self.df[cols] + 1))
+        q_norm2 = np.sum((q_tf * q_idf) ** 2) + np.sum((np.array(unknown) * math.log(self.total_docs)) ** 2)
+
+        sub = self.tf_csc[:, cols]
+        dot = sub @ (q_tf * q_idf ** 2)
+        # 질의 단어는 질의 자신도 등장 문서로 세므로 문서 노름도 그만큼 보정
+        norm2 = self.norm2 + sub.multiply(sub) @ (q_idf ** 2 - self.idf[cols] ** 2)
+
+        denom = np.sqrt(np.maximum(norm2, 0) * q_norm2)
+        return np.divide(dot, denom, out=np.zeros_like(dot), where=denom > 0)
+
+    def search(self, query, k=5):
+        scores = self.scores(query)
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        # k 번째 점수와 같은 점수가 여러 개면 tfidf.ts 처럼 앞쪽 문서를 우선
+        kth = -np.partition(-scores, k - 1)[k - 1]
+        candidates = np.nonzero((scores >= kth) & (scores > 0))[0]
+        top = candidates[np.lexsort((candidates, -scores[candidates]))][:k]
+        return [(int(i), float(scores[i])) for i in top]
@@ -0,0 +1,59 @@
+import time
+import traceback
+from contextlib import contextmanager
+
+
+# 서버 시작 단계 기록: 모델 로드는 백그라운드에서 진행되고 /health 는 바로, /ready 는 로드 + 워밍업 후 응답
+# 단계별 소요 시간 (import, 엔진 로드, 인덱스 생성, 워밍업 등) 을 /ready 와 로그로 확인한다.
+class Startup:
+    def __init__(self, started=None):
+        self.started = started or time.perf_counter()
+        self.state = "starting"  # starting -> loading -> warming_up -> ready (또는 failed)
+        self.stages = {}
+        self.error = None
+        self.ready_after = None
+
+    @property
+    def ready(self):
+        return self.state == "ready"
+
+    @property
+    def failed(self):
+        return self.state == "failed"
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = time.perf_counter() - start
+            print(f"   {name}: {self.stages[name]:.2f}s")
+
+    def record(self, name, seconds):
+        self.stages[name] = seconds
+        print(f"   {name}: {seconds:.2f}s")
+
+    def run(self, load, warm_up):
+        # 추론 스레드에서 실행 (워밍업도 실제 추론과 같은 스레드에서)
+        try:
+            self.state = "loading"
+            load()
+            self.state = "warming_up"
+            warm_up()
+            self.state = "ready"
+            self.ready_after = time.perf_counter() - self.started
+            print(f"Ready in {self.ready_after:.1f}s")
+        except Exception as e:
+            traceback.print_exc()
+            self.state = "failed"
+            self.error = str(e)
+
+    def status(self):
+        return {
+            "state": self.state,
+            "ready": self.ready,
+            "readyAfterSeconds": self.ready_after,
+            "stages": dict(self.stages),
+            "error": self.error,
+        }
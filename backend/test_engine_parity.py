@@ -0,0 +1,42 @@
+import os
+
+import numpy as np
+from transformers import AutoTokenizer
+
+from engines import OnnxEngine, TorchEngine, softmax
+from padding import bucket_batches, encode
+
+# torch 엔진과 onnxruntime 엔진의 logits 가 같은지 확인
+# 사용법: python test_engine_parity.py (convert_to_onnx_v2.py 로 model.onnx 를 먼저 만들어야 함)
+
+model_path = os.environ.get("ECHELPER_MODEL_PATH", "../models/kobert-strategic-final")
+onnx_path = os.environ.get("ECHELPER_ONNX_PATH", "../frontend/public/models/kobert-onnx/model.onnx")
+atol = 1e-4
+
+texts = [
+    "레이저 거리측정기",
+    "일반 사무용 의자",
+    "고출력 펄스 레이저 발진기 및 제어 모듈",
+    "스테인리스 강관",
+    "적외선 열화상 카메라 (320x240, 30Hz)",
+    "볼트",
+]
+
+print("Loading engines...")
+torch_engine = TorchEngine(model_path)
+onnx_engine = OnnxEngine(onnx_path)
+tokenizer = AutoTokenizer.from_pretrained(model_path)
+
+max_diff = 0.0
+for indices, model_inputs in bucket_batches(encode(tokenizer, texts), tokenizer.pad_token_id):
+    torch_logits = torch_engine.logits(**model_inputs)
+    onnx_logits = onnx_engine.logits(**model_inputs)
+    diff = float(np.abs(torch_logits - onnx_logits).max())
+    max_diff = max(max_diff, diff)
+
+    for row, i in enumerate(indices):
+        print(f"{texts[i]:<30} torch={softmax(torch_logits)[row].round(4)} onnx={softmax(onnx_logits)[row].round(4)}")
+
+print(f"\nmax |logits diff| = {max_diff:.2e} (atol={atol})")
+assert max_diff < atol, "torch / onnxruntime 엔진의 logits 가 일치하지 않습니다"
+print("OK")
@@ -0,0 +1,100 @@
+// 데이터 파일 형식별 파싱 시간 / 힙 사용량 비교 (브라우저 로더 src/utils/dataLoader.ts 와 같은 단계를 Node 에서 실행)
+//   json    : <name>.json 을 JSON.parse
+//   columns : <name>.columns.json.gz 를 DecompressionStream 으로 풀고 JSON.parse + 컬럼 복원
+// 사용법: node scripts/benchmark-data.mjs [--repeat 20]
+
+import { execFileSync } from 'node:child_process';
+import { readFile } from 'node:fs/promises';
+import { existsSync } from 'node:fs';
+import { fileURLToPath } from 'node:url';
+import { gzipSync } from 'node:zlib';
+import { isDeepStrictEqual } from 'node:util';
+
+const dataDir = new URL('../public/data/', import.meta.url);
+const files = ['export_history', 'control_list', 'location', 'participants'];
+const repeatIndex = process.argv.indexOf('--repeat');
+const repeat = repeatIndex > 0 ? Number(process.argv[repeatIndex + 1]) : 20;
+
+// dataLoader.ts 의 decodeColumns 와 동일
+const decodeColumns = (payload) => {
+  const columns = payload.columns.map(column =>
+    Array.isArray(column) ? column : column.codes.map(code => column.dict[code])
+  );
+  const records = new Array(payload.count);
+  for (let i = 0; i < payload.count; i++) {
+    const record = {};
+    payload.fields.forEach((field, j) => {
+      record[field] = columns[j][i];
+    });
+    records[i] = record;
+  }
+  return records;
+};
+
+const loaders = {
+  json: async (buffer) => JSON.parse(new TextDecoder().decode(buffer)),
+  columns: async (buffer) => {
+    const stream = new Blob([buffer]).stream().pipeThrough(new DecompressionStream('gzip'));
+    return decodeColumns(JSON.parse(await new Response(stream).text()));
+  },
+};
+
+// 힙 사용량: 형식마다 새 프로세스에서 한 번만 로드하고 GC 후 남은 크기 (앞선 로드의 문자열 캐시 영향 제거)
+const heapIndex = process.argv.indexOf('--heap');
+if (heapIndex > 0) {
+  const [format, file] = process.argv.slice(heapIndex + 1);
+  const buffer = await readFile(file);
+  // 스트림/디코더 초기화 비용은 빼고 결과 레코드가 차지하는 힙만 측정
+  await loaders[format](format === 'json' ? Buffer.from('[]') : gzipSync('{"columns":[],"fields":[],"count":0}'));
+  globalThis.gc();
+  const before = process.memoryUsage().heapUsed;
+  const records = await loaders[format](buffer);
+  globalThis.gc();
+  console.log(JSON.stringify({ count: records.length, bytes: process.memoryUsage().heapUsed - before }));
+  process.exit(0);
+}
+
+const retainedHeap = (format, url) => {
+  const output = execFileSync(process.execPath, [
+    '--expose-gc', fileURLToPath(import.meta.url), '--heap', format, fileURLToPath(url),
+  ]);
+  return JSON.parse(output.toString()).bytes / 2 ** 20;
+};
+
+const measure = async (load, buffer) => {
+  const times = [];
+  for (let i = 0; i < repeat; i++) {
+    const start = performance.now();
+    await load(buffer);
+    times.push(performance.now() - start);
+  }
+  times.sort((a, b) => a - b);
+  return { records: await load(buffer), medianMs: times[Math.floor(times.length / 2)] };
+};
+
+console.log('='.repeat(60));
+console.log('Data Format Benchmark (frontend)');
+console.log('='.repeat(60));
+console.log(`${'file'.padEnd(16)}${'format'.padEnd(10)}${'size(KB)'.padStart(10)}${'parse(ms)'.padStart(11)}${'heap(MB)'.padStart(10)}`);
+
+for (const name of files) {
+  const compact = new URL(`${name}.columns.json.gz`, dataDir);
+  if (!existsSync(compact)) {
+    console.log(`${name}: ${name}.columns.json.gz 없음 (convert_excel_to_json.py 실행 필요)`);
+    continue;
+  }
+  const urls = { json: new URL(`${name}.json`, dataDir), columns: compact };
+  const buffers = { json: await readFile(urls.json), columns: await readFile(urls.columns) };
+  const results = {};
+  for (const format of Object.keys(loaders)) {
+    results[format] = await measure(loaders[format], buffers[format]);
+    const { medianMs } = results[format];
+    const retainedMb = retainedHeap(format, urls[format]);
+    console.log(
+      `${name.padEnd(16)}${format.padEnd(10)}${(buffers[format].length / 1024).toFixed(1).padStart(10)}` +
+      `${medianMs.toFixed(2).padStart(11)}${retainedMb.toFixed(2).padStart(10)}`
+    );
+  }
+  console.log(`${''.padEnd(16)}(복원 결과 동일: ${isDeepStrictEqual(results.json.records, results.columns.records)})`);
+}
+console.log('='.repeat(60));
@@ -2,6 +2,7 @@ import React, { useEffect, useState } from 'react';
 import { MapContainer, TileLayer, CircleMarker, Popup, useMap } from 'react-leaflet';
 import { Card, Spin } from 'antd';
 import 'leaflet/dist/leaflet.css';
+import { loadRecords } from '../../utils/dataLoader';
 
 interface CountryMapProps {
   data: any[];
@@ -30,8 +31,7 @@ const CountryMap: React.FC<CountryMapProps> = ({ data, onCountryClick }) => {
   const loadData = async () => {
     try {
       // location.json 로드
-      const response = await fetch('/data/location.json');
-      const locationData = await response.json();
+      const locationData = await loadRecords('location');
       setLocations(locationData);
 
       // 국가별 통계 계산
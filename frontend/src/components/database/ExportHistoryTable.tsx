@@ -5,6 +5,7 @@ import {
   DownloadOutlined,
 } from '@ant-design/icons';
 import type { ColumnsType } from 'antd/es/table';
+import { loadRecords } from '../../utils/dataLoader';
 
 const { Paragraph, Text } = Typography;
 
@@ -45,8 +46,7 @@ const ExportHistoryTable: React.FC = () => {
     const loadData = async () => {
       setLoading(true);
       try {
-        const response = await fetch('/data/export_history.json');
-        const jsonData = await response.json();
+        const jsonData = await loadRecords('export_history');
         
         const reversedData = [...jsonData].reverse();
 
@@ -8,6 +8,7 @@ import 'leaflet/dist/leaflet.css';
 // Leaflet 기본 마커 아이콘 설정
 import icon from 'leaflet/dist/images/marker-icon.png';
 import iconShadow from 'leaflet/dist/images/marker-shadow.png';
+import { loadRecords } from '../../utils/dataLoader';
 
 let DefaultIcon = L.icon({
   iconUrl: icon,
@@ -53,14 +54,12 @@ const CountrySelector: React.FC<CountrySelectorProps> = ({ onCountryChange }) =>
   useEffect(() => {
     const loadData = async () => {
       try {
-        const [participantsResponse, locationResponse, agreementsResponse] = await Promise.all([
-          fetch('/data/participants.json'),
-          fetch('/data/location.json'),
+        const [participantsData, locationData, agreementsResponse] = await Promise.all([
+          loadRecords('participants'),
+          loadRecords('location'),
           fetch('/data/nuclear_agreements.json')
         ]);
 
-        const participantsData = await participantsResponse.json();
-        const locationData = await locationResponse.json();
         const agreementsData = await agreementsResponse.json();
 
         setCountries(participantsData);
@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { Table, Input, Space, message } from 'antd';
 import { SearchOutlined } from '@ant-design/icons';
 import type { ColumnsType } from 'antd/es/table';
+import { loadRecords } from '../../utils/dataLoader';
 
 interface ControlListItem {
   id: number;
@@ -31,8 +32,7 @@ const ControlListTable: React.FC<ControlListTableProps> = ({ onRowClick }) => {
     const loadData = async () => {
       setLoading(true);
       try {
-        const response = await fetch('/data/control_list.json');
-        const jsonData = await response.json();
+        const jsonData = await loadRecords('control_list');
         
         // JSON 데이터를 ControlListItem 형식으로 변환
         const formattedData: ControlListItem[] = jsonData.map((item: any, index: number) => ({
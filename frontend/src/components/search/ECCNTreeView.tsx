@@ -2,6 +2,7 @@ import React, { useState, useEffect, useRef } from 'react';
 import { Tree, Input, Spin, message } from 'antd';
 import { SearchOutlined } from '@ant-design/icons';
 import type { DataNode } from 'antd/es/tree';
+import { loadRecords } from '../../utils/dataLoader';
 
 interface ECCNTreeViewProps {
   onSelect: (eccn: string, item: any) => void;
@@ -24,8 +25,7 @@ const ECCNTreeView: React.FC<ECCNTreeViewProps> = ({ onSelect }) => {
     const loadData = async () => {
       setLoading(true);
       try {
-        const response = await fetch('/data/control_list.json');
-        const jsonData = await response.json();
+        const jsonData = await loadRecords('control_list');
         setAllData(jsonData);
 
         // 전체 트리를 한 번에 생성
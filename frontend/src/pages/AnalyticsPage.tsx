@@ -9,6 +9,7 @@ import ClassDistributionChart from '../components/analytics/ClassDistributionCha
 import TraderTypeChart from '../components/analytics/TraderTypeChart';
 import KeywordCloud from '../components/analytics/KeywordCloud';
 import CountryMap from '../components/analytics/CountryMap';
+import { loadRecords } from '../utils/dataLoader';
 
 const { Title } = Typography;
 
@@ -45,8 +46,7 @@ const AnalyticsPage: React.FC = () => {
   const loadData = async () => {
     setLoading(true);
     try {
-      const response = await fetch('/data/export_history.json');
-      const jsonData = await response.json();
+      const jsonData = await loadRecords('export_history');
       setData(jsonData);
 
       processData(jsonData);
@@ -5,6 +5,8 @@ import PredictionResult from '../components/prediction/PredictionResult';
 import SimilarCasesList from '../components/prediction/SimilarCasesList';
 import { findSimilarDocuments } from '../utils/tfidf';
 import { predictStrategic } from '../utils/modelPredictor';
+import { findSimilarCases } from '../services/kobertPrediction';
+import { loadRecords } from '../utils/dataLoader';
 
 const { Title } = Typography;
 
@@ -17,8 +19,7 @@ const PredictionPage: React.FC = () => {
   useEffect(() => {
     const loadData = async () => {
       try {
-        const response = await fetch('/data/export_history.json');
-        const jsonData = await response.json();
+        const jsonData = await loadRecords('export_history');
         setAllData(jsonData);
       } catch (error) {
         console.error('데이터 로드 실패:', error);
@@ -59,7 +60,9 @@ const PredictionPage: React.FC = () => {
       return;
     }
     
-    const similarResults = findSimilarDocuments(queryText, allData, 5);
+    // 백엔드 인덱스 우선, 연결 실패 시 브라우저에서 계산
+    const similarResults = await findSimilarCases(queryText, 5)
+      .catch(() => findSimilarDocuments(queryText, allData, 5));
     const filteredResults = similarResults.filter(result => result.similarity > 0.05);
     
     if (filteredResults.length === 0) {
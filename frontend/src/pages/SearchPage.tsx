@@ -4,6 +4,7 @@ import ECCNTreeView from '../components/search/ECCNTreeView';
 import ECCNDetailPanel from '../components/search/ECCNDetailPanel';
 import ECCNSidebar from '../components/search/ECCNSidebar';
 import CountrySelector from '../components/prediction/CountrySelector';
+import { loadRecords } from '../utils/dataLoader';
 
 const { Title } = Typography;
 
@@ -35,12 +36,11 @@ const SearchPage: React.FC = () => {
 
   const loadInitialData = async () => {
     try {
-      const [controlResponse, statsResponse] = await Promise.all([
-        fetch('/data/control_list.json'),
+      const [controlData, statsResponse] = await Promise.all([
+        loadRecords('control_list'),
         fetch('/data/stats.json')
       ]);
 
-      const controlData = await controlResponse.json();
       const statsData = await statsResponse.json();
 
       setAllData(controlData);
@@ -36,3 +36,18 @@ export async function predictStrategicItem(text: string): Promise<{
     };
   }
 }
+
+// Similar case search - TF-IDF index built once on the backend (same scoring as utils/tfidf.ts)
+export async function findSimilarCases(
+  query: string,
+  topN: number = 5
+): Promise<{ itemId: number; similarity: number }[]> {
+  const params = new URLSearchParams({ q: query, k: String(topN), source: 'history' });
+  const response = await fetch(`${API_URL}/similar?${params}`);
+
+  if (!response.ok) {
+    throw new Error(`API request failed: ${response.statusText}`);
+  }
+
+  return response.json();
+}
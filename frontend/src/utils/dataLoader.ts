@@ -0,0 +1,77 @@
+// 데이터 파일 로더
+// convert_excel_to_json.py 가 쓰는 <name>.columns.json.gz (사전 인코딩된 컬럼 형식, gzip) 를 우선 사용하고,
+// 없거나 브라우저가 DecompressionStream 을 지원하지 않으면 기존 <name>.json 을 읽는다.
+// 같은 파일을 여러 컴포넌트가 요청해도 한 번만 다운로드/파싱한다.
+
+interface DictColumn {
+  dict: unknown[];
+  codes: number[];
+}
+
+interface ColumnsPayload {
+  format: string;
+  count: number;
+  fields: string[];
+  columns: (unknown[] | DictColumn)[];
+}
+
+const cache = new Map<string, Promise<any[]>>();
+
+export const decodeColumns = (payload: ColumnsPayload): any[] => {
+  const columns = payload.columns.map(column =>
+    Array.isArray(column) ? column : column.codes.map(code => column.dict[code])
+  );
+  const records = new Array(payload.count);
+  for (let i = 0; i < payload.count; i++) {
+    const record: Record<string, unknown> = {};
+    payload.fields.forEach((field, j) => {
+      record[field] = columns[j][i];
+    });
+    records[i] = record;
+  }
+  return records;
+};
+
+const loadColumns = async (name: string): Promise<any[] | null> => {
+  if (typeof DecompressionStream === 'undefined') return null;
+
+  const response = await fetch(`/data/${name}.columns.json.gz`);
+  if (!response.ok) return null;
+  const buffer = await response.arrayBuffer();
+  const bytes = new Uint8Array(buffer);
+
+  // 서버가 Content-Encoding: gzip 으로 보내면 fetch 가 이미 압축을 풀었으므로 gzip 헤더(1f 8b)일 때만 푼다
+  let text: string;
+  if (bytes[0] === 0x1f && bytes[1] === 0x8b) {
+    const stream = new Blob([buffer]).stream().pipeThrough(new DecompressionStream('gzip'));
+    text = await new Response(stream).text();
+  } else {
+    text = new TextDecoder().decode(bytes);
+  }
+  // 개발 서버는 없는 파일 요청에 index.html 을 돌려주므로 형식을 확인
+  if (!text.startsWith('{')) return null;
+
+  const payload = JSON.parse(text) as ColumnsPayload;
+  return payload.format === 'columns-v1' ? decodeColumns(payload) : null;
+};
+
+const loadJson = async (name: string): Promise<any[]> => {
+  const response = await fetch(`/data/${name}.json`);
+  return response.json();
+};
+
+export const loadRecords = <T = any>(name: string): Promise<T[]> => {
+  let promise = cache.get(name);
+  if (!promise) {
+    promise = loadColumns(name)
+      .catch(error => {
+        console.warn(`${name}.columns.json.gz 로드 실패, JSON 으로 대체:`, error);
+        return null;
+      })
+      .then(records => records ?? loadJson(name));
+    // 실패한 요청은 다음 호출에서 다시 시도
+    promise.catch(() => cache.delete(name));
+    cache.set(name, promise);
+  }
+  return promise as Promise<T[]>;
+};
@@ -0,0 +1,222 @@
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from excel_builders import build_control_list, build_participants, build_stats
+
+# excel_builders.py (컬럼 연산) 와 기존 행 단위 구현의 속도 비교 + 출력 JSON 동일성 확인
+# 사용법: python benchmark_convert.py --rows 1000000 [--workbook synthetic.xlsx]
+# --workbook 을 주면 합성 데이터를 xlsx 로 저장했다가 다시 읽어서 사용 (100만 행은 저장에 수 분 걸림)
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--rows", type=int, default=1000000)
+parser.add_argument("--workbook", default=None)
+parser.add_argument("--skip-legacy", action="store_true", help="기존 구현은 건너뜀 (행 수가 클 때)")
+args = parser.parse_args()
+
+
+# ---- 기존 구현 (행 단위) ----
+def legacy_control_list(df_control):
+    # 기존 convert_excel_to_json.py 의 Control List 처리 그대로 (iterrows, clean 미사용)
+    df_control.columns = df_control.columns.str.strip()
+    df_control = df_control.where(pd.notna(df_control), None)
+
+    # 계층 구조 분석
+    control_list = []
+
+    for idx, row in df_control.iterrows():
+        eccn = str(row['ECCN']).strip()
+
+        # 레벨 계산
+        level = eccn.count('.')
+        parts = eccn.split('.')
+
+        # 카테고리 분류
+        if len(eccn) >= 2:
+            main_cat = eccn[0]
+            sub_cat = eccn[:2]
+        else:
+            main_cat = eccn[0]
+            sub_cat = eccn
+
+        item = {
+            'id': idx + 1,
+            'eccn': eccn,
+            'level': level,
+            'mainCategory': main_cat,
+            'subCategory': sub_cat,
+            'parent': '.'.join(parts[:-1]) if level > 0 else None,
+            'eccnDescription1': row.get('ECCN_description1'),
+            'keywordKor': row.get('keyword_kor'),
+            'keywordEng': row.get('keyword_eng'),
+            'refClNo': row.get('REF_CLNo'),
+            'refNo': row.get('REF_No'),
+            'title': row.get('Title'),
+            'description': row.get('Description'),
+            'note': row.get('Note'),
+            'techInfo': row.get('Tech_info'),
+        }
+
+        control_list.append(item)
+
+    return control_list
+
+
+def legacy_participants(df):
+    # 데이터 구조 변환
+    participants_dict = {}  # 국가별로 중복 방지
+
+    for idx, row in df.iterrows():
+        # 각 컬럼에서 국가명 추출
+        nsg_country = row.get('NSG') if pd.notna(row.get('NSG')) else None
+        ag_country = row.get('AG') if pd.notna(row.get('AG')) else None
+        mtcr_country = row.get('MTCR') if pd.notna(row.get('MTCR')) else None
+        wa_country = row.get('WA') if pd.notna(row.get('WA')) else None
+        ca_country = row.get('CA') if pd.notna(row.get('CA')) else None
+
+        # NSG/AG/MTCR/WA 중 하나라도 있으면 해당 국가 처리
+        main_countries = [c for c in [nsg_country, ag_country, mtcr_country, wa_country] if c]
+
+        if main_countries:
+            country_name = main_countries[0]
+
+            if country_name not in participants_dict:
+                participants_dict[country_name] = {
+                    'country': country_name,
+                    'NSG': False,
+                    'AG': False,
+                    'MTCR': False,
+                    'WA': False,
+                    'CA': False
+                }
+
+            # 가입 정보 업데이트
+            if nsg_country == country_name:
+                participants_dict[country_name]['NSG'] = True
+            if ag_country == country_name:
+                participants_dict[country_name]['AG'] = True
+            if mtcr_country == country_name:
+                participants_dict[country_name]['MTCR'] = True
+            if wa_country == country_name:
+                participants_dict[country_name]['WA'] = True
+            if ca_country == country_name:
+                participants_dict[country_name]['CA'] = True
+
+        # CA만 있는 국가 처리
+        if ca_country and ca_country not in participants_dict:
+            participants_dict[ca_country] = {
+                'country': ca_country,
+                'NSG': False,
+                'AG': False,
+                'MTCR': False,
+                'WA': False,
+                'CA': True
+            }
+
+    return list(participants_dict.values())
+
+
+def normalize(value):
+    # iterrows() 는 빈 칸(None) 을 NaN 으로 돌려주기도 하므로 비교 전에 NaN -> None
+    if isinstance(value, dict):
+        return {k: normalize(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [normalize(v) for v in value]
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def legacy_stats(control_list):
+    return {
+        "level0": len([x for x in control_list if x['level'] == 0]),
+        "level1": len([x for x in control_list if x['level'] == 1]),
+        "level2": len([x for x in control_list if x['level'] == 2])
+    }
+
+
+# ---- 합성 데이터 ----
+def synthetic_sheets(n, seed=0):
+    rng = np.random.default_rng(seed)
+
+    # 통제 목록: 0A001, 0A001.a, 0A001.a.1 형태의 ECCN + 일부 빈 칸
+    base = np.char.add(np.char.add(rng.integers(0, 10, n).astype(str), rng.choice(list('ABCDE'), n)),
+                       np.char.zfill(rng.integers(1, 1000, n).astype(str), 3))
+    depth = rng.integers(0, 3, n)
+    eccn = np.where(depth >= 1, np.char.add(np.char.add(base, '.'), rng.choice(list('abcdefgh'), n)), base)
+    eccn = np.where(depth >= 2, np.char.add(np.char.add(eccn, '.'), rng.integers(1, 10, n).astype(str)), eccn)
+
+    def text(prefix):
+        values = np.char.add(prefix, rng.integers(0, 5000, n).astype(str)).astype(object)
+        values[rng.random(n) < 0.3] = None
+        return values
+
+    control = pd.DataFrame({
+        'ECCN': eccn,
+        'ECCN_description1': text('설명'),
+        'keyword_kor': text('키워드'),
+        'keyword_eng': text('keyword'),
+        'REF_CLNo': text('NR'),
+        'REF_No': text('0A'),
+        'Title': text('제목'),
+        'Description': text('내용'),
+        'Note': text('주'),
+        'Tech_info': [None] * n,
+    })
+
+    # 가입국: 행마다 일부 체제 칸에만 국가명 (주 국가와 다른 국가가 섞인 행, CA 전용 행 포함)
+    countries = np.array([f'국가{i}' for i in range(max(n // 20, 50))], dtype=object)
+    picks = rng.choice(countries, size=(n, 5))
+    same = rng.random((n, 5)) < 0.8
+    picks[same] = picks[:, [0]].repeat(5, axis=1)[same]
+    picks[rng.random((n, 5)) < 0.35] = None
+    participants = pd.DataFrame(picks, columns=['NSG', 'AG', 'MTCR', 'WA', 'CA'])
+    return control, participants
+
+
+def timed(fn, *fn_args):
+    start = time.perf_counter()
+    result = fn(*fn_args)
+    return result, time.perf_counter() - start
+
+
+print("=" * 60)
+print(f"Excel conversion benchmark ({args.rows:,} rows)")
+print("=" * 60)
+
+control_df, participants_df = synthetic_sheets(args.rows)
+if args.workbook:
+    print(f"\nWriting {args.workbook}...")
+    with pd.ExcelWriter(args.workbook) as writer:
+        control_df.to_excel(writer, sheet_name='control_list', index=False)
+        participants_df.to_excel(writer, sheet_name='participants', index=False)
+    control_df = pd.read_excel(args.workbook, sheet_name='control_list')
+    participants_df = pd.read_excel(args.workbook, sheet_name='participants')
+
+results = []
+(_, control_list), t_control = timed(build_control_list, control_df.copy())
+(_, participants), t_participants = timed(build_participants, participants_df.copy())
+stats, t_stats = timed(build_stats, {'control_list': control_list, 'participants': participants,
+                                     'export_history': [], 'location': []}, '')
+results.append(("columnar", t_control, t_participants, t_stats))
+
+if not args.skip_legacy:
+    legacy_control, t_control = timed(legacy_control_list, control_df.copy())
+    legacy_part, t_participants = timed(legacy_participants, participants_df.copy())
+    legacy_levels, t_stats = timed(legacy_stats, legacy_control)
+    results.append(("row-wise", t_control, t_participants, t_stats))
+
+    # 출력 JSON 비교 (NaN / None 차이는 정규화 후)
+    dump = lambda data: json.dumps(normalize(data), ensure_ascii=False, indent=2)
+    print(f"\ncontrol_list.json identical: {dump(control_list) == dump(legacy_control)}")
+    print(f"participants.json identical: {dump(participants) == dump(legacy_part)}")
+    print(f"stats levels identical:     {stats['levels'] == legacy_levels}")
+
+print(f"\n{'implementation':<16} {'control(s)':>11} {'participants(s)':>16} {'stats(s)':>9}")
+print("-" * 56)
+for name, t_control, t_participants, t_stats in results:
+    print(f"{name:<16} {t_control:11.2f} {t_participants:16.2f} {t_stats:9.2f}")
+print("=" * 60)
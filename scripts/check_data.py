@@ -1,11 +1,11 @@
-import pandas as pd
+from excel_cache import read_sheet
 
 print("=" * 60)
 print("Training Data Analysis")
 print("=" * 60)
 
 # Load data
-df = pd.read_excel('../data/labelled_data_aug_for_learning.xlsx')
+df = read_sheet('../data/labelled_data_aug_for_learning.xlsx')
 
 print(f"\nTotal rows: {len(df)}")
 print(f"\nColumns: {df.columns.tolist()}")
@@ -1,190 +1,190 @@
 # scripts/convert_excel_to_json.py
 
-import pandas as pd
+import argparse
+import hashlib
 import json
 import os
-from collections import defaultdict
+import sys
+import urllib.request
+
+import pandas as pd
+
+from excel_builders import build_control_list, build_participants, build_records, build_stats, write_columns
+from excel_cache import read_sheet
+
+# 시트의 각 행을 해시로 기록해 두고 (output_dir/.convert_state.json) 바뀐 시트의 JSON 파일만 다시 쓴다.
+# export_history / control_list 가 바뀌면 바뀐 레코드만 담은 delta (output_dir/deltas/<version>.json) 를 만들고,
+# 백엔드는 POST /indexes/refresh 로 재시작 없이 검색 인덱스에 반영한다.
+# 각 JSON 파일과 함께 사전 인코딩된 컬럼 형식 (<name>.columns.json.gz) 도 쓴다.
+# cron 예시: python convert_excel_to_json.py --notify http://localhost:8000/indexes/refresh
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--excel", default='../data/stat_v2_AddNew.xlsx')
+parser.add_argument("--output-dir", default='../frontend/public/data')
+parser.add_argument("--full", action="store_true", help="이전 시트 해시를 무시하고 모든 파일을 다시 생성 (delta 버전은 이어서 증가)")
+parser.add_argument("--notify", default=None, help="변경 후 POST 할 백엔드 URL (예: http://localhost:8000/indexes/refresh)")
+parser.add_argument("--keep-deltas", type=int, default=50, help="보관할 delta 파일 수")
+parser.add_argument("--no-pause", action="store_true", help="터미널에서 실행해도 종료 전 Enter 대기 안 함")
+args = parser.parse_args()
+
+excel_file = args.excel
+output_dir = args.output_dir
+state_path = os.path.join(output_dir, '.convert_state.json')
+delta_dir = os.path.join(output_dir, 'deltas')
+
+# 시트 번호 -> 출력 파일
+SHEETS = {
+    'export_history': 0,
+    'location': 1,
+    'control_list': 2,
+    'participants': 4,
+}
+# 백엔드 인덱스가 사용하는 파일 (레코드 단위 delta 생성)
+INDEXED = ('export_history', 'control_list')
+
+
+def fingerprint_rows(df):
+    return [
+        hashlib.sha1(json.dumps(row, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()[:16]
+        for row in df.itertuples(index=False, name=None)
+    ]
+
+
+def read_json(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+BUILDERS = {
+    'export_history': build_records,
+    'location': build_records,
+    'control_list': build_control_list,
+    'participants': build_participants,
+}
+
+
+def diff_records(old, new):
+    # 위치 기준 비교: 같은 위치의 레코드가 다르면 변경 (뒤에 추가된 행은 새 위치로 포함)
+    old = old or []
+    return [[i, record] for i, record in enumerate(new) if i >= len(old) or old[i] != record]
+
+
+def notify(url):
+    request = urllib.request.Request(url, method='POST')
+    with urllib.request.urlopen(request, timeout=60) as response:
+        return json.load(response)
+
 
 print("="*50)
-print("ECHelper - Excel to JSON Converter v3")
+print("ECHelper - Excel to JSON Converter v4 (incremental)")
 print("="*50)
 
-excel_file = '../data/stat_v2_AddNew.xlsx'
-output_dir = '../frontend/public/data'
-
 os.makedirs(output_dir, exist_ok=True)
+exit_code = 0
 
 try:
     print("\n1. Excel 파일 읽는 중...")
-    
-    # Sheet 1: Export History
-    print("   - Sheet 1 (Export History) 읽는 중...")
-    df_export = pd.read_excel(excel_file, sheet_name=0)
-    df_export.columns = df_export.columns.str.strip()
-    df_export = df_export.where(pd.notna(df_export), None)
-    
-    export_json_path = os.path.join(output_dir, 'export_history.json')
-    df_export.to_json(export_json_path, orient='records', force_ascii=False, indent=2)
-    print(f"   ✓ 저장 완료: {export_json_path} ({len(df_export)}건)")
-    
-    # Sheet 3: Control List
-    print("   - Sheet 3 (Control List) 읽는 중...")
-    df_control = pd.read_excel(excel_file, sheet_name=2)
-    df_control.columns = df_control.columns.str.strip()
-    df_control = df_control.where(pd.notna(df_control), None)
-    
-    # 계층 구조 분석
-    print("   - 계층 구조 분석 중...")
-    
-    control_list = []
-    
-    for idx, row in df_control.iterrows():
-        eccn = str(row['ECCN']).strip()
-        
-        # 레벨 계산
-        level = eccn.count('.')
-        parts = eccn.split('.')
-        
-        # 카테고리 분류
-        if len(eccn) >= 2:
-            main_cat = eccn[0]
-            sub_cat = eccn[:2]
+    # 워크북이 바뀌지 않았으면 캐시에서 바로 읽음
+    sheets = {index: read_sheet(excel_file, index) for index in SHEETS.values()}
+
+    # --full 이어도 delta 버전은 유지: 백엔드는 자기 data_version 다음 번호의 delta 만 적용한다
+    state = read_json(state_path) or {}
+    previous = {} if args.full else state.get('sheets', {})
+    fingerprints = {}
+    records = {}
+    deltas = {}
+
+    print("\n2. 변경된 시트 확인 중...")
+    for name, sheet_index in SHEETS.items():
+        df = sheets[sheet_index]
+        path = os.path.join(output_dir, f'{name}.json')
+        # 사전 인코딩된 컬럼 형식 + gzip (프론트엔드 / 백엔드 로더가 우선 사용)
+        compact_path = os.path.join(output_dir, f'{name}.columns.json.gz')
+        fingerprints[name] = fingerprint_rows(df)
+
+        if previous.get(name) == fingerprints[name] and os.path.exists(path):
+            records[name] = read_json(path)
+            if not os.path.exists(compact_path):
+                write_columns(compact_path, records[name])
+            print(f"   - {name}: 변경 없음 ({len(records[name])}건)")
+            continue
+
+        df, built = BUILDERS[name](df)
+        # JSON 파일에서 읽은 이전 레코드와 비교할 수 있도록 JSON 값으로 정규화
+        records[name] = json.loads(json.dumps(built, ensure_ascii=False))
+        old_records = read_json(path)
+        if name in ('export_history', 'location'):
+            df.to_json(path, orient='records', force_ascii=False, indent=2)
         else:
-            main_cat = eccn[0]
-            sub_cat = eccn
-        
-        item = {
-            'id': idx + 1,
-            'eccn': eccn,
-            'level': level,
-            'mainCategory': main_cat,
-            'subCategory': sub_cat,
-            'parent': '.'.join(parts[:-1]) if level > 0 else None,
-            'eccnDescription1': row.get('ECCN_description1'),
-            'keywordKor': row.get('keyword_kor'),
-            'keywordEng': row.get('keyword_eng'),
-            'refClNo': row.get('REF_CLNo'),
-            'refNo': row.get('REF_No'),
-            'title': row.get('Title'),
-            'description': row.get('Description'),
-            'note': row.get('Note'),
-            'techInfo': row.get('Tech_info'),
-        }
-        
-        control_list.append(item)
-    
-    # Control List JSON 저장
-    control_json_path = os.path.join(output_dir, 'control_list.json')
-    with open(control_json_path, 'w', encoding='utf-8') as f:
-        json.dump(control_list, f, ensure_ascii=False, indent=2)
-    print(f"   ✓ 저장 완료: {control_json_path} ({len(control_list)}건)")
-    
-    # Sheet 2: Location
-    print("   - Sheet 2 (Location) 읽는 중...")
-    df_location = pd.read_excel(excel_file, sheet_name=1)
-    df_location.columns = df_location.columns.str.strip()
-    df_location = df_location.where(pd.notna(df_location), None)
-    
-    location_json_path = os.path.join(output_dir, 'location.json')
-    df_location.to_json(location_json_path, orient='records', force_ascii=False, indent=2)
-    print(f"   ✓ 저장 완료: {location_json_path} ({len(df_location)}건)")
-    
-    # Sheet 5: Participants (수출통제 체제 가입 정보)
-    print("   - Sheet 5 (Participants) 읽는 중...")
-    df_participants = pd.read_excel(excel_file, sheet_name=4)
-
-    # 데이터 구조 변환
-    participants = []
-    participants_dict = {}  # 국가별로 중복 방지
-
-    for idx, row in df_participants.iterrows():
-        # 각 컬럼에서 국가명 추출
-        nsg_country = row.get('NSG') if pd.notna(row.get('NSG')) else None
-        ag_country = row.get('AG') if pd.notna(row.get('AG')) else None
-        mtcr_country = row.get('MTCR') if pd.notna(row.get('MTCR')) else None
-        wa_country = row.get('WA') if pd.notna(row.get('WA')) else None
-        ca_country = row.get('CA') if pd.notna(row.get('CA')) else None
-        
-        # NSG/AG/MTCR/WA 중 하나라도 있으면 해당 국가 처리
-        main_countries = [c for c in [nsg_country, ag_country, mtcr_country, wa_country] if c]
-        
-        if main_countries:
-            country_name = main_countries[0]
-            
-            if country_name not in participants_dict:
-                participants_dict[country_name] = {
-                    'country': country_name,
-                    'NSG': False,
-                    'AG': False,
-                    'MTCR': False,
-                    'WA': False,
-                    'CA': False
-                }
-            
-            # 가입 정보 업데이트
-            if nsg_country == country_name:
-                participants_dict[country_name]['NSG'] = True
-            if ag_country == country_name:
-                participants_dict[country_name]['AG'] = True
-            if mtcr_country == country_name:
-                participants_dict[country_name]['MTCR'] = True
-            if wa_country == country_name:
-                participants_dict[country_name]['WA'] = True
-            if ca_country == country_name:
-                participants_dict[country_name]['CA'] = True
-        
-        # CA만 있는 국가 처리
-        if ca_country and ca_country not in participants_dict:
-            participants_dict[ca_country] = {
-                'country': ca_country,
-                'NSG': False,
-                'AG': False,
-                'MTCR': False,
-                'WA': False,
-                'CA': True
-            }
-
-    participants = list(participants_dict.values())
-
-    participants_json_path = os.path.join(output_dir, 'participants.json')
-    with open(participants_json_path, 'w', encoding='utf-8') as f:
-        json.dump(participants, f, ensure_ascii=False, indent=2)
-    print(f"   ✓ 저장 완료: {participants_json_path} ({len(participants)}건)")
-    
-    # 통계 정보
-    stats = {
-        "lastUpdated": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "exportHistoryCount": len(df_export),
-        "controlListCount": len(df_control),
-        "locationCount": len(df_location),
-        "participantsCount": len(participants),
-        "categories": {
-            "main": len(set(item['mainCategory'] for item in control_list)),
-            "sub": len(set(item['subCategory'] for item in control_list))
-        },
-        "levels": {
-            "level0": len([x for x in control_list if x['level'] == 0]),
-            "level1": len([x for x in control_list if x['level'] == 1]),
-            "level2": len([x for x in control_list if x['level'] == 2])
-        }
-    }
-    
-    stats_json_path = os.path.join(output_dir, 'stats.json')
-    with open(stats_json_path, 'w', encoding='utf-8') as f:
-        json.dump(stats, f, ensure_ascii=False, indent=2)
-    print(f"   ✓ 통계 저장 완료: {stats_json_path}")
-    
+            write_json(path, records[name])
+        write_columns(compact_path, records[name])
+
+        changed = diff_records(old_records, records[name])
+        if name in INDEXED and (changed or len(records[name]) != len(old_records or [])):
+            deltas[f'{name}.json'] = {"count": len(records[name]), "changed": changed}
+        print(f"   ✓ {name}: 저장 완료 ({len(records[name])}건, 변경 {len(changed)}건)")
+
+    changed_sheets = [name for name in SHEETS if previous.get(name) != fingerprints[name]]
+    if not changed_sheets:
+        print("\n변경된 내용이 없습니다.")
+    else:
+        # 통계 정보
+        stats = build_stats(records, pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S"))
+        write_json(os.path.join(output_dir, 'stats.json'), stats)
+        print(f"   ✓ 통계 저장 완료")
+
+        version = state.get('version', 0)
+        if deltas:
+            version += 1
+            os.makedirs(delta_dir, exist_ok=True)
+            write_json(os.path.join(delta_dir, f'{version:06d}.json'), {
+                "version": version,
+                "created": stats["lastUpdated"],
+                "files": deltas,
+            })
+            print(f"\n3. Delta 저장: deltas/{version:06d}.json")
+
+            # 새 버전보다 번호가 큰 delta 는 이전 상태에서 남은 것 (백엔드가 새 데이터 위에 적용하지 않도록 삭제)
+            for name in os.listdir(delta_dir):
+                if name.endswith('.json') and name[:-5].isdigit() and int(name[:-5]) > version:
+                    os.remove(os.path.join(delta_dir, name))
+                    print(f"   - 이전 delta 삭제: deltas/{name}")
+
+            # 오래된 delta 정리
+            for name in sorted(os.listdir(delta_dir))[:-args.keep_deltas]:
+                os.remove(os.path.join(delta_dir, name))
+
+        write_json(state_path, {"version": version, "sheets": fingerprints})
+
+        if deltas and args.notify:
+            print(f"\n4. 백엔드 인덱스 갱신 요청: {args.notify}")
+            try:
+                print(f"   ✓ {notify(args.notify)}")
+            except Exception as e:
+                print(f"   ❌ 갱신 요청 실패: {e}")
+                exit_code = 1
+
     print("\n" + "="*50)
     print("✅ 변환 완료!")
-    print(f"   - Export History: {len(df_export)}건")
-    print(f"   - Control List: {len(df_control)}건")
-    print(f"   - Location: {len(df_location)}건")
-    print(f"   - Participants: {len(participants)}건")
+    for name in SHEETS:
+        print(f"   - {name}: {len(records[name])}건{' (변경)' if name in changed_sheets else ''}")
     print("="*50)
-    
+
 except Exception as e:
     print(f"\n❌ 오류 발생: {str(e)}")
     import traceback
     traceback.print_exc()
+    exit_code = 1
+
+# 터미널에서 직접 실행한 경우에만 대기 (cron 등 headless 실행은 바로 종료)
+if sys.stdin.isatty() and not args.no_pause:
+    input("\n계속하려면 Enter를 누르세요...")
 
-input("\n계속하려면 Enter를 누르세요...")
\ No newline at end of file
+sys.exit(exit_code)
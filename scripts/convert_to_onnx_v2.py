@@ -1,14 +1,21 @@
+import argparse
 import torch
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import os
 
+# 증류한 student 모델도 같은 방식으로 변환: --model-path ../models/kobert-student-L4 --output-dir ../models/kobert-student-L4-onnx
+parser = argparse.ArgumentParser()
+parser.add_argument("--model-path", default="../models/kobert-strategic-final")
+parser.add_argument("--output-dir", default="../frontend/public/models/kobert-onnx")
+args = parser.parse_args()
+
 print("=" * 60)
 print("Converting KoBERT Model to ONNX (Simple Method)")
 print("=" * 60)
 
 # Paths
-model_path = "../models/kobert-strategic-final"
-output_dir = "../frontend/public/models/kobert-onnx"
+model_path = args.model_path
+output_dir = args.output_dir
 os.makedirs(output_dir, exist_ok=True)
 
 print(f"\n1. Loading model from: {model_path}")
@@ -22,17 +29,28 @@ inputs = tokenizer(dummy_text, return_tensors='pt', truncation=True, max_length=
 if 'token_type_ids' in inputs:
     del inputs['token_type_ids']
 
+# 백엔드의 유사 사례 검색이 같은 forward pass 에서 임베딩을 만들 수 있도록 마지막 hidden state 도 출력
+class WithHiddenState(torch.nn.Module):
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        outputs = self.model(input_ids=input_ids, attention_mask=attention_mask, output_hidden_states=True)
+        return outputs.logits, outputs.hidden_states[-1]
+
 print("3. Converting to ONNX...")
 torch.onnx.export(
-    model,
+    WithHiddenState(model),
     (inputs['input_ids'], inputs['attention_mask']),
     os.path.join(output_dir, "model.onnx"),
     input_names=['input_ids', 'attention_mask'],
-    output_names=['logits'],
+    output_names=['logits', 'last_hidden_state'],
     dynamic_axes={
         'input_ids': {0: 'batch_size', 1: 'sequence'},
         'attention_mask': {0: 'batch_size', 1: 'sequence'},
-        'logits': {0: 'batch_size'}
+        'logits': {0: 'batch_size'},
+        'last_hidden_state': {0: 'batch_size', 1: 'sequence'}
     },
     opset_version=14,
     do_constant_folding=True
@@ -44,4 +62,5 @@ tokenizer.save_pretrained(output_dir)
 print("\n" + "=" * 60)
 print("Conversion completed successfully!")
 print(f"ONNX model saved to: {output_dir}")
+print("INT8 quantization: python quantize_onnx.py [--static]")
 print("=" * 60)
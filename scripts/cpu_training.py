@@ -0,0 +1,64 @@
+import os
+import time
+
+import torch
+from transformers import TrainerCallback
+
+# CPU 학습 설정 (train_kobert.py --profile cpu)
+# 스레드 수, bf16 지원 여부, gradient accumulation 계산과 학습 처리량(samples/sec) 로그
+
+
+def world_size():
+    # torchrun 으로 여러 프로세스를 띄우면 WORLD_SIZE 가 설정됨
+    return int(os.environ.get("WORLD_SIZE", 1))
+
+
+def cpu_count():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def cpu_supports_bf16():
+    # AVX512-BF16 / AMX 가 없는 CPU 에서 bf16 autocast 는 에뮬레이션이라 오히려 느리다
+    try:
+        with open('/proc/cpuinfo', encoding='utf-8') as f:
+            flags = f.read()
+    except OSError:
+        return False
+    return 'avx512_bf16' in flags or 'amx_bf16' in flags
+
+
+def configure_threads(threads=None, interop_threads=None):
+    # 프로세스마다 코어를 나눠 쓰도록 기본값은 (사용 가능한 코어 수 / 프로세스 수)
+    threads = threads or max(1, cpu_count() // world_size())
+    torch.set_num_threads(threads)
+    if interop_threads:
+        torch.set_num_interop_threads(interop_threads)
+    return threads, torch.get_num_interop_threads()
+
+
+def accumulation_steps(effective_batch_size, batch_size, processes=1):
+    # 메모리에 올라가는 배치 크기와 무관하게 전체 배치 크기를 맞춘다
+    steps = max(1, effective_batch_size // (batch_size * processes))
+    if steps * batch_size * processes != effective_batch_size:
+        print(f"   ⚠️ effective batch size {effective_batch_size} -> {steps * batch_size * processes} "
+              f"(batch {batch_size} x accumulation {steps} x processes {processes})")
+    return steps
+
+
+class ThroughputCallback(TrainerCallback):
+    # 로그 시점마다 학습 시작 이후 평균 samples/sec (전체 프로세스 합계) 출력
+    def on_train_begin(self, args, state, control, **kwargs):
+        self.start = time.perf_counter()
+        self.samples_per_step = args.per_device_train_batch_size * args.gradient_accumulation_steps * args.world_size
+        self.history = []
+
+    def on_log(self, args, state, control, logs=None, **kwargs):
+        if not state.is_world_process_zero or not logs or 'loss' not in logs:
+            return
+        elapsed = time.perf_counter() - self.start
+        throughput = state.global_step * self.samples_per_step / elapsed
+        self.history.append({"step": state.global_step, "samples_per_second": throughput})
+        print(f"   step {state.global_step}: {throughput:.1f} samples/sec")
@@ -0,0 +1,180 @@
+import argparse
+import os
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+from transformers import AutoModelForSequenceClassification, AutoTokenizer, Trainer, TrainingArguments
+
+from evaluation import CACHE_DIR, DATA_PATH, MODEL_PATH, cache_key, load_split, run_inference
+from token_store import TOKEN_CACHE_DIR, DynamicPaddingCollator, TokenDataset, TokenStore
+
+# 지식 증류: 학습된 KoBERT (teacher) -> 작은 student 분류기
+# 학습 데이터의 정답 라벨(CE)과 teacher 의 soft label (temperature 로 부드럽게 한 확률분포, KL) 을 함께 학습한다.
+#   --layers N       : teacher 의 encoder 층 중 N 개를 균등 간격으로 골라 가중치를 복사해서 시작 (hidden size 유지)
+#   --hidden-size H  : hidden size 를 줄인 student (teacher 가중치를 쓸 수 없어 랜덤 초기화, soft label 만 전달)
+# 결과 비교: python evaluate_model_simple.py --compare ../models/kobert-student-L4
+# ONNX 변환: python convert_to_onnx_v2.py --model-path ../models/kobert-student-L4 --output-dir <dir>
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--teacher", default=MODEL_PATH)
+parser.add_argument("--data", default=DATA_PATH)
+parser.add_argument("--output", default=None, help="기본: ../models/kobert-student-L<layers>[-H<hidden>]")
+parser.add_argument("--layers", type=int, default=4)
+parser.add_argument("--hidden-size", type=int, default=None, help="64 의 배수 (attention head 하나가 64 차원)")
+parser.add_argument("--temperature", type=float, default=2.0)
+parser.add_argument("--alpha", type=float, default=0.5, help="soft label (KL) 손실 비중, 나머지는 정답 라벨 CE")
+parser.add_argument("--epochs", type=int, default=5)
+parser.add_argument("--batch-size", type=int, default=32)
+parser.add_argument("--learning-rate", type=float, default=5e-5)
+parser.add_argument("--token-cache-dir", default=TOKEN_CACHE_DIR)
+args = parser.parse_args()
+if args.hidden_size and args.hidden_size % 64:
+    parser.error(f"--hidden-size 는 64 의 배수여야 합니다: {args.hidden_size}")
+
+output_dir = args.output or f"../models/kobert-student-L{args.layers}" + (f"-H{args.hidden_size}" if args.hidden_size else "")
+
+print("=" * 60)
+print("KoBERT Knowledge Distillation")
+print("=" * 60)
+
+# 1. 데이터 (train_kobert.py 와 같은 분할)
+print("\n1. Loading data...")
+train_texts, val_texts, train_labels, val_labels = load_split(args.data)
+print(f"   Training samples: {len(train_texts)}, validation samples: {len(val_texts)}")
+
+# 2. Teacher soft label: 학습 데이터 logits 를 (teacher + 데이터) 해시로 캐시
+print(f"\n2. Teacher logits ({args.teacher})...")
+teacher_logits_path = os.path.join(CACHE_DIR, f"{cache_key(args.teacher, args.data)}.train.logits.npy")
+if os.path.exists(teacher_logits_path):
+    print(f"   Using cached logits: {teacher_logits_path}")
+    teacher_logits = np.load(teacher_logits_path)
+else:
+    teacher_logits = run_inference(args.teacher, train_texts)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    np.save(teacher_logits_path, teacher_logits)
+teacher_accuracy = (teacher_logits.argmax(axis=-1) == np.asarray(train_labels)).mean()
+print(f"   Teacher train accuracy: {teacher_accuracy:.4f}")
+
+# 3. Student 생성
+print("\n3. Building student...")
+tokenizer = AutoTokenizer.from_pretrained(args.teacher)
+teacher = AutoModelForSequenceClassification.from_pretrained(args.teacher)
+config = teacher.config.to_dict()
+config.update(num_hidden_layers=args.layers)
+if args.hidden_size:
+    config.update(
+        hidden_size=args.hidden_size,
+        intermediate_size=args.hidden_size * 4,
+        num_attention_heads=args.hidden_size // 64,
+    )
+student = AutoModelForSequenceClassification.from_config(type(teacher.config).from_dict(config))
+
+if not args.hidden_size:
+    # 임베딩 / pooler / 분류기는 그대로, encoder 층은 균등 간격으로 복사 (12 층 -> 4 층: 2, 5, 8, 11)
+    kept = [(i + 1) * teacher.config.num_hidden_layers // args.layers - 1 for i in range(args.layers)]
+    teacher_state = teacher.state_dict()
+    student_state = student.state_dict()
+    for name in student_state:
+        source = name
+        if '.encoder.layer.' in name:
+            prefix, rest = name.split('.encoder.layer.', 1)
+            index, rest = rest.split('.', 1)
+            source = f"{prefix}.encoder.layer.{kept[int(index)]}.{rest}"
+        student_state[name] = teacher_state[source]
+    student.load_state_dict(student_state)
+    print(f"   Copied teacher layers {kept}")
+del teacher
+
+student_params = sum(int(np.prod(v.shape)) for v in student.state_dict().values())
+print(f"   Student: {args.layers} layers, hidden {student.config.hidden_size}, {student_params / 1e6:.1f}M parameters")
+
+# 4. Dataset: 토큰 ID 저장소 + teacher logits
+class DistillDataset(TokenDataset):
+    def __init__(self, store, labels, teacher_logits):
+        super().__init__(store, labels)
+        self.teacher_logits = teacher_logits
+
+    def __getitem__(self, idx):
+        item = super().__getitem__(idx)
+        item['teacher_logits'] = self.teacher_logits[idx]
+        return item
+
+
+class DistillCollator(DynamicPaddingCollator):
+    def __call__(self, features):
+        batch = super().__call__(features)
+        if 'teacher_logits' in features[0]:
+            batch['teacher_logits'] = torch.from_numpy(np.stack([f['teacher_logits'] for f in features]))
+        return batch
+
+
+class DistillTrainer(Trainer):
+    def compute_loss(self, model, inputs, return_outputs=False, **kwargs):
+        teacher_logits = inputs.pop('teacher_logits', None)
+        labels = inputs.pop('labels')
+        outputs = model(**inputs)
+        loss = F.cross_entropy(outputs.logits, labels)
+        if teacher_logits is not None:
+            # KL(teacher || student), temperature^2 로 기울기 크기를 CE 와 맞춤
+            T = args.temperature
+            soft = F.kl_div(
+                F.log_softmax(outputs.logits / T, dim=-1),
+                F.softmax(teacher_logits.to(outputs.logits.dtype) / T, dim=-1),
+                reduction='batchmean',
+            ) * T * T
+            loss = args.alpha * soft + (1 - args.alpha) * loss
+        return (loss, outputs) if return_outputs else loss
+
+
+print("\n4. Creating datasets...")
+train_dataset = DistillDataset(TokenStore.cached(tokenizer, train_texts, cache_dir=args.token_cache_dir), train_labels, teacher_logits)
+val_dataset = TokenDataset(TokenStore.cached(tokenizer, val_texts, cache_dir=args.token_cache_dir), val_labels)
+
+
+def compute_metrics(eval_pred):
+    predictions, labels = eval_pred
+    return {"accuracy": float((np.argmax(predictions, axis=1) == labels).mean())}
+
+
+# 5. 학습
+print("\n5. Distillation started...")
+print("=" * 60)
+trainer = DistillTrainer(
+    model=student,
+    args=TrainingArguments(
+        output_dir=output_dir + "-checkpoints",
+        num_train_epochs=args.epochs,
+        per_device_train_batch_size=args.batch_size,
+        per_device_eval_batch_size=args.batch_size,
+        learning_rate=args.learning_rate,
+        warmup_ratio=0.1,
+        weight_decay=0.01,
+        logging_steps=50,
+        evaluation_strategy="epoch",
+        save_strategy="epoch",
+        save_total_limit=1,
+        load_best_model_at_end=True,
+        metric_for_best_model="accuracy",
+        remove_unused_columns=False,
+    ),
+    train_dataset=train_dataset,
+    eval_dataset=val_dataset,
+    data_collator=DistillCollator(tokenizer.pad_token_id),
+    compute_metrics=compute_metrics,
+)
+trainer.train()
+eval_results = trainer.evaluate()
+print(f"\nStudent Validation Accuracy: {eval_results['eval_accuracy']:.4f}")
+
+# 6. 저장
+print("\n6. Saving student...")
+student.save_pretrained(output_dir)
+tokenizer.save_pretrained(output_dir)
+print(f"   Student saved to: {output_dir}")
+
+print("\n" + "=" * 60)
+print("Distillation completed!")
+print(f"Compare: python evaluate_model_simple.py --compare {output_dir}")
+print(f"ONNX:    python convert_to_onnx_v2.py --model-path {output_dir} --output-dir {output_dir}-onnx")
+print("=" * 60)
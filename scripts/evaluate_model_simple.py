@@ -1,92 +1,41 @@
-import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
-import torch
-from torch.utils.data import Dataset
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+import argparse
 
-print("=" * 60)
-print("KoBERT Model Performance Evaluation")
-print("=" * 60)
+from sklearn.metrics import classification_report
 
-# Set device
-device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-print(f"\nUsing device: {device}")
+from evaluation import DATA_PATH, MODEL_PATH, compute_metrics, load_validation, measure_latency
 
-# Load data
-print("\n1. Loading data...")
-df = pd.read_excel('../data/labelled_data_aug_for_learning.xlsx')
-print(f"   Total samples: {len(df)}")
+parser = argparse.ArgumentParser()
+parser.add_argument("--model-path", default=MODEL_PATH)
+parser.add_argument("--data", default=DATA_PATH)
+parser.add_argument("--batch-size", type=int, default=64)
+parser.add_argument("--num-workers", type=int, default=0, help="토크나이징을 병렬로 수행할 DataLoader 워커 수 (0: 메인 프로세스)")
+parser.add_argument("--refresh", action="store_true", help="캐시된 logits 를 무시하고 다시 추론")
+# 증류한 student 모델들과 정확도 / 단건 지연시간 비교 (distill_kobert.py)
+parser.add_argument("--compare", nargs="+", default=[], help="비교할 모델 폴더")
+parser.add_argument("--latency-samples", type=int, default=100)
+parser.add_argument("--max-accuracy-drop", type=float, default=0.02, help="허용 정확도 손실 (기준 모델 대비)")
+parser.add_argument("--compare-output", default=None, help="비교 결과 JSON 저장 경로")
+args = parser.parse_args()
 
-# Prepare texts and labels
-texts = df['data_total'].fillna('').astype(str).tolist()
-labels = df['label'].tolist()
+print("=" * 60)
+print("KoBERT Model Performance Evaluation")
+print("=" * 60)
 
-# Same train/validation split as training
-print("\n2. Splitting data (same as training)...")
-train_texts, val_texts, train_labels, val_labels = train_test_split(
-    texts, labels, test_size=0.2, random_state=42, stratify=labels
+# Load validation logits (모델/데이터가 바뀌지 않았으면 캐시 사용)
+print("\n1. Loading validation logits...")
+logits, true_labels, val_texts, data_summary = load_validation(
+    args.model_path, args.data,
+    batch_size=args.batch_size, num_workers=args.num_workers, refresh=args.refresh
 )
-print(f"   Validation samples: {len(val_texts)}")
-
-# Load model and tokenizer
-print("\n3. Loading trained model...")
-model_path = "../models/kobert-strategic-final"
-tokenizer = AutoTokenizer.from_pretrained(model_path)
-model = AutoModelForSequenceClassification.from_pretrained(model_path)
-model.to(device)
-model.eval()
-print("   Model loaded successfully!")
-
-# Dataset class
-class EvalDataset(Dataset):
-    def __init__(self, texts, labels, tokenizer, max_length=128):
-        self.encodings = tokenizer(
-            texts,
-            truncation=True,
-            padding=True,
-            max_length=max_length,
-            return_tensors='pt'
-        )
-        self.labels = labels
-
-    def __len__(self):
-        return len(self.labels)
-
-    def __getitem__(self, idx):
-        item = {key: val[idx] for key, val in self.encodings.items() if key != 'token_type_ids'}
-        item['labels'] = torch.tensor(self.labels[idx])
-        return item
-
-# Create dataset
-print("\n4. Preparing validation dataset...")
-val_dataset = EvalDataset(val_texts, val_labels, tokenizer)
-
-# Predict on validation set
-print("\n5. Running predictions on validation set...")
-predictions = []
-true_labels = []
-
-with torch.no_grad():
-    for i in range(len(val_dataset)):
-        item = val_dataset[i]
-        inputs = {k: v.unsqueeze(0).to(device) for k, v in item.items() if k != 'labels'}
-        outputs = model(**inputs)
-        logits = outputs.logits
-        pred = torch.argmax(logits, dim=-1).item()
-        predictions.append(pred)
-        true_labels.append(item['labels'].item())
-
-        if (i + 1) % 50 == 0:
-            print(f"   Processed {i + 1}/{len(val_dataset)} samples...")
+predictions = logits.argmax(axis=-1)
+metrics = compute_metrics(true_labels, predictions)
 
 # Calculate metrics
 print("\n" + "=" * 60)
-print("6. Performance Metrics")
+print("2. Performance Metrics")
 print("=" * 60)
 
-accuracy = accuracy_score(true_labels, predictions)
+accuracy = metrics['accuracy']
 print(f"\n>> Overall Accuracy: {accuracy:.4f} ({accuracy*100:.2f}%)")
 
 # Classification report
@@ -99,7 +48,7 @@ print(report)
 # Confusion Matrix
 print("\n>> Confusion Matrix:")
 print("-" * 60)
-cm = confusion_matrix(true_labels, predictions)
+cm = metrics['confusionMatrix']
 print(f"                  Predicted")
 print(f"                  Non-Str   Strategic")
 print(f"Actual Non-Str    {cm[0][0]:6d}    {cm[0][1]:6d}")
@@ -114,20 +63,20 @@ print(f"False Negatives: {fn:3d} ({fn/total*100:.1f}%) - Wrongly identified as N
 print(f"True Positives:  {tp:3d} ({tp/total*100:.1f}%) - Correctly identified as Strategic")
 
 # Sensitivity and Specificity
-sensitivity = tp / (tp + fn) if (tp + fn) > 0 else 0
-specificity = tn / (tn + fp) if (tn + fp) > 0 else 0
+sensitivity = metrics['sensitivity']
+specificity = metrics['specificity']
 print(f"\nSensitivity (Recall for Strategic): {sensitivity:.4f} ({sensitivity*100:.2f}%)")
 print(f"Specificity (Recall for Non-Strategic): {specificity:.4f} ({specificity*100:.2f}%)")
 
 # Sample predictions
 print("\n" + "=" * 60)
-print("7. Sample predictions from validation set:")
+print("3. Sample predictions from validation set:")
 print("=" * 60)
 for i in range(min(10, len(val_texts))):
     text_preview = val_texts[i][:80] + "..." if len(val_texts[i]) > 80 else val_texts[i]
-    actual_label = 'Strategic' if val_labels[i] == 1 else 'Non-Strategic'
+    actual_label = 'Strategic' if true_labels[i] == 1 else 'Non-Strategic'
     pred_label = 'Strategic' if predictions[i] == 1 else 'Non-Strategic'
-    correct = '[OK]' if predictions[i] == val_labels[i] else '[WRONG]'
+    correct = '[OK]' if predictions[i] == true_labels[i] else '[WRONG]'
 
     print(f"\nSample {i+1}: {correct}")
     print(f"  Text: {text_preview}")
@@ -138,7 +87,7 @@ print("Evaluation completed!")
 print("=" * 60)
 
 # Save results to JSON
-print("\n8. Saving results to JSON...")
+print("\n4. Saving results to JSON...")
 import json
 from datetime import datetime
 
@@ -151,15 +100,7 @@ model_info = {
     "version": "1.0.0",
     "trainedDate": datetime.now().strftime("%Y-%m-%d"),
     "evaluatedDate": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-    "trainingData": {
-        "totalSamples": len(df),
-        "trainSamples": len(train_texts),
-        "validationSamples": len(val_texts),
-        "classes": {
-            "nonStrategic": labels.count(0),
-            "strategic": labels.count(1)
-        }
-    },
+    "trainingData": data_summary,
     "performance": {
         "overall": {
             "accuracy": float(accuracy),
@@ -211,3 +152,36 @@ with open(output_path, 'w', encoding='utf-8') as f:
 
 print(f"   Results saved to: {output_path}")
 print("\n" + "=" * 60)
+
+# Accuracy / latency tradeoff
+if args.compare:
+    print("\n5. Accuracy / latency tradeoff (batch 1, CPU)")
+    print("=" * 60)
+    sample_texts = list(val_texts[:args.latency_samples])
+    rows = []
+    for path in [args.model_path] + args.compare:
+        model_logits, model_labels, _, _ = load_validation(
+            path, args.data, batch_size=args.batch_size, num_workers=args.num_workers, refresh=args.refresh
+        )
+        row = {"model": path, "accuracy": compute_metrics(model_labels, model_logits.argmax(axis=-1))['accuracy']}
+        row.update(measure_latency(path, sample_texts))
+        rows.append(row)
+
+    base = rows[0]
+    for row in rows:
+        row["accuracyDrop"] = base["accuracy"] - row["accuracy"]
+        row["speedup"] = base["p50Ms"] / row["p50Ms"]
+        row["acceptable"] = row["accuracyDrop"] <= args.max_accuracy_drop
+
+    print(f"\n{'model':<40}{'layers':>7}{'hidden':>7}{'params':>8}{'acc':>8}{'drop':>8}{'p50(ms)':>9}{'p95(ms)':>9}{'speedup':>8}")
+    print("-" * 104)
+    for row in rows:
+        mark = '' if row is base else ('  OK' if row["acceptable"] else '  (정확도 손실 초과)')
+        print(f"{row['model'][-40:]:<40}{row['layers']:>7}{row['hiddenSize']:>7}{row['parameters'] / 1e6:>7.1f}M"
+              f"{row['accuracy']:>8.4f}{row['accuracyDrop']:>8.4f}{row['p50Ms']:>9.2f}{row['p95Ms']:>9.2f}{row['speedup']:>7.1f}x{mark}")
+
+    if args.compare_output:
+        with open(args.compare_output, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        print(f"\n   Comparison saved to: {args.compare_output}")
+    print("=" * 60)
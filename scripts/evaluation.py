@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# 평가 스크립트 공통 모듈
+# 검증 데이터 분할, 배치 추론, 지표 계산을 한 곳에서 처리하고
+# 검증 logits 는 (모델 체크포인트 + 데이터 파일) 해시를 키로 디스크에 캐시한다.
+# 같은 모델/데이터로 다시 실행하면 Excel 로드와 추론 없이 캐시된 logits 를 바로 사용한다.
+
+DATA_PATH = "../data/labelled_data_aug_for_learning.xlsx"
+MODEL_PATH = "../models/kobert-strategic-final"
+CACHE_DIR = "../models/eval_cache"
+
+TARGET_NAMES = ['Non-Strategic', 'Strategic']
+
+# 모델 폴더에 함께 저장되지만 logits 에는 영향을 주지 않는 파일 (캐시 키에서 제외)
+NON_CHECKPOINT_FILES = {'operating_point.json'}
+
+
+def load_split(data_path=DATA_PATH):
+    # train_kobert.py 와 같은 train/validation 분할
+    from sklearn.model_selection import train_test_split
+
+    from excel_cache import read_sheet
+
+    df = read_sheet(data_path, columns=['data_total', 'label'])
+    texts = df['data_total'].fillna('').astype(str).tolist()
+    labels = df['label'].tolist()
+    train_texts, val_texts, train_labels, val_labels = train_test_split(
+        texts, labels, test_size=0.2, random_state=42, stratify=labels
+    )
+    return train_texts, val_texts, train_labels, val_labels
+
+
+def file_digest(path, memo, rehash=False):
+    # (크기, 수정 시각) 이 기록과 같으면 기록된 내용 해시를 그대로, 다르거나 rehash 면 내용을 다시 해시 (excel_cache 와 같은 방식)
+    from excel_cache import file_hash
+
+    stat = os.stat(path)
+    entry = memo.get(os.path.abspath(path))
+    if not rehash and entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        return entry['sha256']
+    digest = file_hash(path)
+    memo[os.path.abspath(path)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+    return digest
+
+
+def cache_key(model_path=MODEL_PATH, data_path=DATA_PATH, cache_dir=CACHE_DIR, rehash=False):
+    # 체크포인트 폴더의 모든 파일과 데이터 파일의 내용 해시
+    # 파일별 해시는 cache_dir/file_hashes.json 에 (크기, 수정 시각) 과 함께 기록해 두고, 바뀐 파일만 다시 읽는다
+    memo_path = os.path.join(cache_dir, "file_hashes.json")
+    memo = {}
+    if os.path.exists(memo_path):
+        with open(memo_path, encoding='utf-8') as f:
+            memo = json.load(f)
+    before = dict(memo)
+
+    h = hashlib.sha256()
+    for root, _, files in sorted(os.walk(model_path)):
+        for name in sorted(files):
+            if name in NON_CHECKPOINT_FILES:
+                continue
+            path = os.path.join(root, name)
+            h.update(f"{os.path.relpath(path, model_path)}\0{file_digest(path, memo, rehash)}\0".encode('utf-8'))
+    h.update(file_digest(data_path, memo, rehash).encode('utf-8'))
+
+    if memo != before:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(memo_path, 'w', encoding='utf-8') as f:
+            json.dump(memo, f, ensure_ascii=False, indent=2)
+    return h.hexdigest()[:16]
+
+
+def run_inference(model_path, texts, batch_size=64, num_workers=0, max_length=128):
+    # DataLoader 로 배치 단위 토크나이징 + 추론, logits 는 미리 할당한 배열에 채운다
+    import torch
+    from torch.utils.data import DataLoader
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    model = AutoModelForSequenceClassification.from_pretrained(model_path)
+    model.to(device)
+    model.eval()
+    print(f"   Model loaded on {device} (batch size: {batch_size}, tokenization workers: {num_workers})")
+
+    def collate(batch_texts):
+        return tokenizer(
+            list(batch_texts),
+            truncation=True,
+            padding=True,
+            max_length=max_length,
+            return_token_type_ids=False,
+            return_tensors='pt'
+        )
+
+    loader = DataLoader(texts, batch_size=batch_size, shuffle=False, num_workers=num_workers, collate_fn=collate)
+    logits = np.empty((len(texts), model.config.num_labels), dtype=np.float32)
+
+    offset = 0
+    with torch.no_grad():
+        for inputs in loader:
+            inputs = {k: v.to(device) for k, v in inputs.items()}
+            batch_logits = model(**inputs).logits
+            logits[offset:offset + len(batch_logits)] = batch_logits.cpu().numpy()
+            offset += len(batch_logits)
+            print(f"   Processed {offset}/{len(texts)} samples...")
+
+    return logits
+
+
+def measure_latency(model_path, texts, max_length=128, warmup=5):
+    # 요청 1건 (배치 1) CPU 추론 지연시간: 서버의 단건 /predict 와 같은 조건
+    import time
+
+    import torch
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    model = AutoModelForSequenceClassification.from_pretrained(model_path)
+    model.eval()
+
+    times = []
+    with torch.no_grad():
+        for i, text in enumerate(texts[:warmup] + texts):
+            inputs = tokenizer(text, truncation=True, max_length=max_length, return_token_type_ids=False, return_tensors='pt')
+            start = time.perf_counter()
+            model(**inputs)
+            if i >= warmup:
+                times.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "layers": model.config.num_hidden_layers,
+        "hiddenSize": model.config.hidden_size,
+        "parameters": sum(p.numel() for p in model.parameters()),
+        "p50Ms": float(np.percentile(times, 50)),
+        "p95Ms": float(np.percentile(times, 95)),
+    }
+
+
+def load_validation(model_path=MODEL_PATH, data_path=DATA_PATH, cache_dir=CACHE_DIR,
+                    batch_size=64, num_workers=0, refresh=False):
+    # 검증 logits / 라벨 / 텍스트 / 데이터 요약을 반환 (캐시가 있으면 추론 생략)
+    # refresh 면 파일 내용도 다시 해시
+    key = cache_key(model_path, data_path, cache_dir, rehash=refresh)
+    logits_path = os.path.join(cache_dir, f"{key}.logits.npy")
+    meta_path = os.path.join(cache_dir, f"{key}.json")
+
+    if not refresh and os.path.exists(logits_path) and os.path.exists(meta_path):
+        print(f"   Using cached logits: {logits_path}")
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        logits = np.load(logits_path, mmap_mode='r')
+        return logits, np.asarray(meta['labels']), meta['texts'], meta['summary']
+
+    train_texts, val_texts, train_labels, val_labels = load_split(data_path)
+    print(f"   Validation samples: {len(val_texts)}")
+    logits = run_inference(model_path, val_texts, batch_size=batch_size, num_workers=num_workers)
+
+    labels = train_labels + val_labels
+    summary = {
+        "totalSamples": len(labels),
+        "trainSamples": len(train_texts),
+        "validationSamples": len(val_texts),
+        "classes": {
+            "nonStrategic": labels.count(0),
+            "strategic": labels.count(1)
+        }
+    }
+
+    os.makedirs(cache_dir, exist_ok=True)
+    np.save(logits_path, logits)
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "modelPath": model_path,
+            "dataPath": data_path,
+            "labels": [int(label) for label in val_labels],
+            "texts": val_texts,
+            "summary": summary,
+        }, f, ensure_ascii=False)
+    print(f"   Cached logits: {logits_path}")
+
+    return logits, np.asarray(val_labels), val_texts, summary
+
+
+def compute_metrics(labels, predictions):
+    # 혼동 행렬과 클래스별 지표를 한 번에 계산
+    labels = np.asarray(labels)
+    predictions = np.asarray(predictions)
+    cm = np.bincount(labels * 2 + predictions, minlength=4).reshape(2, 2)
+    tn, fp, fn, tp = (int(v) for v in cm.ravel())
+
+    precision = np.divide(np.diag(cm), cm.sum(axis=0), out=np.zeros(2), where=cm.sum(axis=0) > 0)
+    recall = np.divide(np.diag(cm), cm.sum(axis=1), out=np.zeros(2), where=cm.sum(axis=1) > 0)
+    f1 = np.divide(2 * precision * recall, precision + recall, out=np.zeros(2), where=(precision + recall) > 0)
+
+    return {
+        "accuracy": float((labels == predictions).mean()),
+        "confusionMatrix": cm,
+        "tn": tn, "fp": fp, "fn": fn, "tp": tp,
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "support": cm.sum(axis=1),
+        # 전략물자 재현율 / 비전략물자 재현율
+        "sensitivity": float(recall[1]),
+        "specificity": float(recall[0]),
+    }
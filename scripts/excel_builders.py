@@ -0,0 +1,158 @@
+import gzip
+import json
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+# convert_excel_to_json.py 의 시트 -> JSON 레코드 변환 (행 단위 반복 대신 컬럼 연산)
+
+REGIMES = ['NSG', 'AG', 'MTCR', 'WA', 'CA']
+
+# control_list.json 필드 <- 통제 목록 시트 컬럼
+CONTROL_COLUMNS = {
+    'eccnDescription1': 'ECCN_description1',
+    'keywordKor': 'keyword_kor',
+    'keywordEng': 'keyword_eng',
+    'refClNo': 'REF_CLNo',
+    'refNo': 'REF_No',
+    'title': 'Title',
+    'description': 'Description',
+    'note': 'Note',
+    'techInfo': 'Tech_info',
+}
+
+
+def clean(df):
+    df.columns = df.columns.str.strip()
+    return df.astype(object).where(pd.notna(df), None)
+
+
+def column(df, name):
+    # row.get(name) 처럼 컬럼이 없으면 None
+    if name in df.columns:
+        return df[name]
+    return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+
+def build_records(df):
+    # export_history / location: 시트 그대로
+    df = clean(df)
+    return df, json.loads(df.to_json(orient='records', force_ascii=False))
+
+
+def build_control_list(df):
+    df = clean(df)
+
+    # 계층 구조 분석: ECCN 문자열에서 레벨 / 카테고리 / 상위 ECCN 계산
+    eccn = df['ECCN'].astype(str).str.strip()
+    level = eccn.str.count(r'\.')
+    parent = eccn.str.rsplit('.', n=1).str[0].where(level > 0, None)
+
+    table = {
+        'id': np.arange(1, len(df) + 1),
+        'eccn': eccn,
+        'level': level,
+        'mainCategory': eccn.str[0],
+        # 두 글자 미만이면 eccn 전체 (eccn[:2] 와 같음)
+        'subCategory': eccn.str[:2],
+        'parent': parent.astype(object),
+        **{field: column(df, name) for field, name in CONTROL_COLUMNS.items()},
+    }
+    # 컬럼별 파이썬 값 목록을 행 단위 dict 로 묶는다 (DataFrame.to_dict 보다 빠름)
+    keys = list(table)
+    columns = [pd.Series(values, dtype=object).tolist() if k != 'id' else values.tolist() for k, values in table.items()]
+    return df, [dict(zip(keys, row)) for row in zip(*columns)]
+
+
+def build_participants(df):
+    # 각 행: NSG/AG/MTCR/WA 중 첫 번째 국가가 그 행의 국가, 같은 국가가 적힌 체제에 가입
+    # CA 에만 적힌 국가는 CA 가입으로 추가. 국가 순서는 처음 등장한 행 순서 (같은 행이면 주 국가 먼저)
+    table = pd.DataFrame({regime: column(df, regime) for regime in REGIMES})
+    table = table.where(table.notna() & table.ne(''))
+    rows = np.arange(len(table))
+
+    values = table[REGIMES[:4]].to_numpy()
+    valid = pd.notna(values)
+    has_main = valid.any(axis=1)
+    main = pd.Series(np.where(has_main, values[rows, valid.argmax(axis=1)], None), index=table.index)
+
+    # 행별 가입 여부 (주 국가와 같은 값인 체제) -> 국가별 가입 표
+    long = (
+        table[has_main]
+        .assign(_row=rows[has_main], _country=main[has_main])
+        .melt(id_vars=['_row', '_country'], value_vars=REGIMES, var_name='regime', value_name='value')
+    )
+    long['member'] = long['value'].eq(long['_country'])
+    membership = long.pivot_table(index='_country', columns='regime', values='member', aggfunc='any', sort=False)
+    membership = membership.reindex(columns=REGIMES, fill_value=False)
+
+    first_main = pd.Series(rows[has_main], index=main[has_main].to_numpy()).groupby(level=0, sort=False).min()
+    ca = table['CA']
+    has_ca = ca.notna().to_numpy()
+    first_ca = pd.Series(rows[has_ca], index=ca[has_ca].to_numpy()).groupby(level=0, sort=False).min()
+
+    countries = pd.DataFrame({'first_main': first_main, 'first_ca': first_ca})
+    # CA 행이 주 국가로 처음 등장한 행보다 앞서면 CA 전용으로 먼저 추가됨
+    ca_first = countries['first_ca'] < countries['first_main'].fillna(np.inf)
+    countries['order_row'] = countries['first_main'].where(~ca_first, countries['first_ca'])
+    countries['order_kind'] = ca_first.astype(int)
+    countries = countries.sort_values(['order_row', 'order_kind'], kind='stable')
+
+    membership = membership.reindex(countries.index, fill_value=False).fillna(False).astype(bool)
+    membership['CA'] = membership['CA'] | ca_first.reindex(countries.index)
+
+    participants = [
+        {'country': country, **{regime: bool(flag) for regime, flag in zip(REGIMES, flags)}}
+        for country, flags in zip(membership.index, membership[REGIMES].itertuples(index=False, name=None))
+    ]
+    return df, participants
+
+
+def build_stats(records, last_updated):
+    control_list = records['control_list']
+    levels = Counter(item['level'] for item in control_list)
+    return {
+        "lastUpdated": last_updated,
+        "exportHistoryCount": len(records['export_history']),
+        "controlListCount": len(control_list),
+        "locationCount": len(records['location']),
+        "participantsCount": len(records['participants']),
+        "categories": {
+            "main": len(set(item['mainCategory'] for item in control_list)),
+            "sub": len(set(item['subCategory'] for item in control_list))
+        },
+        "levels": {
+            "level0": levels[0],
+            "level1": levels[1],
+            "level2": levels[2]
+        }
+    }
+
+
+def encode_columns(records):
+    # 레코드 목록 -> 컬럼 형식 (frontend/src/utils/dataLoader.ts, backend/datafiles.py 에서 복원)
+    # 값 종류가 행 수의 절반 이하인 컬럼(국가, 분류, ECCN 등)은 사전 + 코드로 저장해 같은 문자열을 한 번만 쓴다
+    fields = list(records[0]) if records else []
+    columns = []
+    for field in fields:
+        values = [record.get(field) for record in records]
+        # 1 과 True 가 같은 키가 되지 않도록 타입도 함께 구분
+        codes = {}
+        for value in values:
+            codes.setdefault((type(value), value), len(codes))
+        if len(codes) <= len(values) // 2:
+            columns.append({
+                "dict": [value for _, value in codes],
+                "codes": [codes[(type(value), value)] for value in values],
+            })
+        else:
+            columns.append(values)
+    return {"format": "columns-v1", "count": len(records), "fields": fields, "columns": columns}
+
+
+def write_columns(path, records):
+    # <name>.columns.json.gz: 공백 없는 JSON 을 미리 gzip 압축 (mtime=0 으로 같은 데이터면 같은 파일)
+    payload = json.dumps(encode_columns(records), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(gzip.compress(payload, compresslevel=9, mtime=0))
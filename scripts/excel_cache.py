@@ -0,0 +1,242 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import time
+
+import pandas as pd
+
+# Excel 워크북 공통 로더
+# openpyxl 로 워크북 전체를 파싱하는 pd.read_excel 대신 필요한 시트/컬럼만 행 단위로 스트리밍해서 읽고,
+# 결과를 CACHE_DIR 에 Parquet (pyarrow 가 없으면 pickle) 로 저장한다.
+# 캐시는 워크북의 (mtime, 크기) 가 같으면 그대로, 다르면 내용 해시를 비교해서 같을 때만 재사용한다.
+# 사용법 (캐시 미리 만들기): python excel_cache.py ../data/labelled_data_aug_for_learning.xlsx --columns data_total label
+
+CACHE_DIR = "../data/.cache"
+CHUNK_SIZE = 10000
+
+# pd.read_excel 이 기본으로 NaN 으로 읽는 문자열
+NA_VALUES = {
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+}
+
+
+def cache_format():
+    try:
+        import pyarrow  # noqa: F401
+        return 'parquet'
+    except ImportError:
+        return 'pickle'
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def cache_paths(path, sheet_name=0, columns=None, cache_dir=CACHE_DIR):
+    # 같은 워크북이라도 시트/컬럼 조합마다 따로 캐시
+    selection = json.dumps([sheet_name, list(columns) if columns else None], ensure_ascii=False)
+    name = f"{os.path.splitext(os.path.basename(path))[0]}.{hashlib.sha1(selection.encode('utf-8')).hexdigest()[:10]}"
+    extension = 'parquet' if cache_format() == 'parquet' else 'pkl'
+    return os.path.join(cache_dir, f"{name}.{extension}"), os.path.join(cache_dir, f"{name}.json")
+
+
+def is_fresh(path, data_path, meta_path):
+    if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+        return False
+    with open(meta_path, encoding='utf-8') as f:
+        meta = json.load(f)
+    stat = os.stat(path)
+    if meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size:
+        return True
+    # 복사/체크아웃으로 mtime 만 바뀐 경우: 내용이 같으면 기록만 갱신
+    if meta['sha256'] != file_hash(path):
+        return False
+    write_meta(path, meta_path, meta['sha256'])
+    return True
+
+
+def write_meta(path, meta_path, sha256=None):
+    stat = os.stat(path)
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "source": os.path.abspath(path),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": sha256 or file_hash(path),
+        }, f, ensure_ascii=False, indent=2)
+
+
+def convert_cell(value):
+    # pd.read_excel 과 같은 변환: 빈 칸 / NA 문자열 -> NaN, 정수 값의 float -> int
+    if value is None or (isinstance(value, str) and value in NA_VALUES):
+        return math.nan
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def header_names(header):
+    # pd.read_excel 과 같은 컬럼 이름: 빈 칸은 'Unnamed: i', 중복은 '.1', '.2' ...
+    names, seen = [], {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None or value == '' else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def stream_rows(path, sheet_name=0, columns=None):
+    # read_only 모드: 셀 객체를 메모리에 올리지 않고 행 값만 순서대로 읽는다
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+        rows = sheet.iter_rows(values_only=True)
+        # 헤더가 비어 있어도 데이터가 있는 컬럼은 'Unnamed: i' 로 포함 (끝쪽 빈 컬럼은 read_sheet 에서 제거)
+        header = list(next(rows, ()))
+        header += [None] * ((sheet.max_column or 0) - len(header))
+        names = header_names(header)
+        if columns:
+            missing = [c for c in columns if c not in names]
+            if missing:
+                raise KeyError(f"{os.path.basename(path)}: 컬럼 없음 {missing}")
+            indices = [names.index(c) for c in columns]
+            names = list(columns)
+        else:
+            indices = list(range(len(names)))
+        yield names
+
+        # 끝쪽 빈 행은 버린다 (중간의 빈 행은 NaN 행으로 유지, pd.read_excel 과 같음)
+        blank = 0
+        for row in rows:
+            if all(v is None or v == '' for v in row):
+                blank += 1
+                continue
+            for _ in range(blank):
+                yield [math.nan] * len(indices)
+            blank = 0
+            yield [convert_cell(row[i]) if i < len(row) else math.nan for i in indices]
+    finally:
+        workbook.close()
+
+
+def to_frame(rows, names):
+    # 숫자로만 이루어진 텍스트 컬럼 ('0', '1' 로 입력된 label 등) 은 pd.read_excel 처럼 숫자로 변환
+    df = pd.DataFrame(rows, columns=names).infer_objects()
+    for name in df.select_dtypes(include=['object', 'string']).columns:
+        try:
+            df[name] = pd.to_numeric(df[name])
+        except (ValueError, TypeError):
+            pass
+    return df
+
+
+def frames(path, sheet_name=0, columns=None, chunksize=CHUNK_SIZE):
+    rows = stream_rows(path, sheet_name, columns)
+    names = next(rows)
+    chunk = []
+    for values in rows:
+        chunk.append(values)
+        if len(chunk) == chunksize:
+            yield to_frame(chunk, names)
+            chunk = []
+    if chunk or not names:
+        yield to_frame(chunk, names)
+
+
+def drop_empty_tail(df):
+    # 헤더도 값도 없는 끝쪽 컬럼 제거 (시트 크기 정보가 실제 데이터보다 넓은 경우)
+    keep = len(df.columns)
+    while keep and str(df.columns[keep - 1]).startswith('Unnamed: ') and df.iloc[:, keep - 1].isna().all():
+        keep -= 1
+    return df.iloc[:, :keep]
+
+
+def write_cache(df, data_path):
+    if data_path.endswith('.parquet'):
+        df.to_parquet(data_path, index=False)
+    else:
+        df.to_pickle(data_path)
+
+
+def read_cache(data_path, columns=None):
+    if data_path.endswith('.parquet'):
+        return pd.read_parquet(data_path, columns=columns)
+    df = pd.read_pickle(data_path)
+    return df[list(columns)] if columns else df
+
+
+def read_sheet(path, sheet_name=0, columns=None, cache_dir=CACHE_DIR, refresh=False):
+    # 캐시가 있으면 바로, 없으면 스트리밍으로 읽고 캐시 저장
+    data_path, meta_path = cache_paths(path, sheet_name, columns, cache_dir)
+    if not refresh and is_fresh(path, data_path, meta_path):
+        return read_cache(data_path, columns)
+
+    chunks = list(frames(path, sheet_name, columns))
+    df = pd.concat(chunks, ignore_index=True).infer_objects() if len(chunks) > 1 else chunks[0]
+    if not columns:
+        df = drop_empty_tail(df)
+    os.makedirs(cache_dir, exist_ok=True)
+    write_cache(df, data_path)
+    write_meta(path, meta_path)
+    return df
+
+
+def iter_chunks(path, columns, chunksize=CHUNK_SIZE, sheet_name=0, cache_dir=CACHE_DIR):
+    # 큰 데이터셋용: 캐시가 있으면 캐시에서, 없으면 워크북에서 chunksize 행씩 DataFrame 을 내보낸다
+    data_path, meta_path = cache_paths(path, sheet_name, columns, cache_dir)
+    if is_fresh(path, data_path, meta_path):
+        if data_path.endswith('.parquet'):
+            import pyarrow.parquet as pq
+
+            for batch in pq.ParquetFile(data_path).iter_batches(batch_size=chunksize, columns=list(columns)):
+                yield batch.to_pandas()
+        else:
+            df = read_cache(data_path, columns)
+            for start in range(0, len(df), chunksize):
+                yield df.iloc[start:start + chunksize].reset_index(drop=True)
+        return
+
+    # 첫 번째 chunk 는 워크북 전체를 읽기 전에 바로 내보내고, 끝까지 읽으면 캐시 저장
+    chunks = []
+    for chunk in frames(path, sheet_name, columns, chunksize):
+        chunks.append(chunk)
+        yield chunk
+    os.makedirs(cache_dir, exist_ok=True)
+    write_cache(pd.concat(chunks, ignore_index=True).infer_objects(), data_path)
+    write_meta(path, meta_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("excel")
+    parser.add_argument("--sheet", default="0", help="시트 번호 또는 이름")
+    parser.add_argument("--columns", nargs="*", default=None)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--refresh", action="store_true", help="캐시가 있어도 워크북에서 다시 읽기")
+    args = parser.parse_args()
+    sheet = int(args.sheet) if args.sheet.isdigit() else args.sheet
+
+    start = time.perf_counter()
+    df = pd.read_excel(args.excel, sheet_name=sheet, usecols=args.columns)
+    print(f"pd.read_excel        : {time.perf_counter() - start:.2f}s ({len(df)} rows)")
+
+    start = time.perf_counter()
+    df = read_sheet(args.excel, sheet, args.columns, args.cache_dir, refresh=True)
+    print(f"streaming + cache    : {time.perf_counter() - start:.2f}s ({len(df)} rows, {cache_format()})")
+
+    start = time.perf_counter()
+    df = read_sheet(args.excel, sheet, args.columns, args.cache_dir)
+    print(f"cached               : {time.perf_counter() - start:.3f}s ({len(df)} rows)")
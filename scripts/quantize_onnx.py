@@ -0,0 +1,178 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import onnxruntime as ort
+from onnxruntime.quantization import (
+    CalibrationDataReader,
+    QuantFormat,
+    QuantType,
+    quantize_dynamic,
+    quantize_static,
+)
+from onnxruntime.quantization.shape_inference import quant_pre_process
+from transformers import AutoTokenizer
+
+from evaluation import DATA_PATH, compute_metrics, load_split
+
+# convert_to_onnx_v2.py 로 만든 model.onnx 를 INT8 로 양자화하고
+# fp32 / int8 모델의 정확도와 속도를 검증 데이터로 비교한다.
+#   python quantize_onnx.py                       # 동적 양자화 (MatMul/Gemm 가중치 INT8)
+#   python quantize_onnx.py --static              # + 학습 데이터 샘플로 보정한 정적 양자화
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--onnx-dir", default="../frontend/public/models/kobert-onnx")
+parser.add_argument("--data", default=DATA_PATH)
+parser.add_argument("--static", action="store_true", help="정적 양자화 모델도 함께 생성")
+parser.add_argument("--calibration-samples", type=int, default=200)
+parser.add_argument("--batch-size", type=int, default=32)
+parser.add_argument("--baseline-accuracy", type=float, default=0.70)
+parser.add_argument("--output", default=None, help="리포트 JSON 경로 (기본: <onnx-dir>/quantization_report.json)")
+args = parser.parse_args()
+
+fp32_path = os.path.join(args.onnx_dir, "model.onnx")
+dynamic_path = os.path.join(args.onnx_dir, "model.int8.onnx")
+static_path = os.path.join(args.onnx_dir, "model.int8-static.onnx")
+report_path = args.output or os.path.join(args.onnx_dir, "quantization_report.json")
+
+print("=" * 60)
+print("KoBERT ONNX INT8 Quantization")
+print("=" * 60)
+
+# Load data (evaluate_model_simple.py 와 같은 분할)
+print("\n1. Loading data...")
+train_texts, val_texts, train_labels, val_labels = load_split(args.data)
+print(f"   Validation samples: {len(val_texts)}")
+
+tokenizer = AutoTokenizer.from_pretrained(args.onnx_dir)
+
+
+def tokenize(batch_texts):
+    encoded = tokenizer(
+        batch_texts,
+        truncation=True,
+        padding=True,
+        max_length=128,
+        return_token_type_ids=False,
+        return_tensors='np'
+    )
+    return {
+        'input_ids': encoded['input_ids'].astype(np.int64),
+        'attention_mask': encoded['attention_mask'].astype(np.int64),
+    }
+
+
+# 2. 동적 양자화: 가중치만 INT8, 활성값은 실행 시점에 양자화
+print("\n2. Dynamic quantization (MatMul/Gemm -> INT8)...")
+quantize_dynamic(
+    fp32_path,
+    dynamic_path,
+    op_types_to_quantize=['MatMul', 'Gemm'],
+    weight_type=QuantType.QInt8,
+)
+print(f"   Saved: {dynamic_path}")
+
+models = {"fp32": fp32_path, "int8-dynamic": dynamic_path}
+
+
+# 3. (선택) 정적 양자화: 학습 데이터 샘플로 활성값 범위를 보정
+class ExcelCalibrationReader(CalibrationDataReader):
+    def __init__(self, samples, batch_size):
+        self.batches = iter([
+            tokenize(samples[i:i + batch_size]) for i in range(0, len(samples), batch_size)
+        ])
+
+    def get_next(self):
+        return next(self.batches, None)
+
+
+if args.static:
+    print(f"\n3. Static quantization (calibrated on {args.calibration_samples} training samples)...")
+    rng = np.random.default_rng(42)
+    sample_idx = rng.choice(len(train_texts), size=min(args.calibration_samples, len(train_texts)), replace=False)
+    calibration_texts = [train_texts[i] for i in sample_idx]
+
+    preprocessed_path = os.path.join(args.onnx_dir, "model.preprocessed.onnx")
+    quant_pre_process(fp32_path, preprocessed_path)
+    quantize_static(
+        preprocessed_path,
+        static_path,
+        ExcelCalibrationReader(calibration_texts, args.batch_size),
+        quant_format=QuantFormat.QDQ,
+        op_types_to_quantize=['MatMul', 'Gemm'],
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+    )
+    os.remove(preprocessed_path)
+    print(f"   Saved: {static_path}")
+    models["int8-static"] = static_path
+
+
+# 4. 정확도 / 속도 비교
+print("\n4. Evaluating models on validation set...")
+val_batches = [tokenize(val_texts[i:i + args.batch_size]) for i in range(0, len(val_texts), args.batch_size)]
+
+options = ort.SessionOptions()
+options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+results = []
+for name, path in models.items():
+    session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+    session.run(['logits'], val_batches[0])  # warm-up
+
+    predictions = []
+    batch_times = []
+    for inputs in val_batches:
+        start = time.perf_counter()
+        logits = session.run(['logits'], inputs)[0]
+        batch_times.append(time.perf_counter() - start)
+        predictions.extend(np.argmax(logits, axis=-1).tolist())
+
+    metrics = compute_metrics(val_labels, predictions)
+    accuracy = metrics['accuracy']
+
+    row = {
+        "model": name,
+        "path": os.path.basename(path),
+        "sizeMB": os.path.getsize(path) / 1024 / 1024,
+        "accuracy": float(accuracy),
+        "sensitivity": metrics['sensitivity'],
+        "specificity": metrics['specificity'],
+        "p50BatchMs": float(np.percentile(batch_times, 50) * 1000),
+        "p95BatchMs": float(np.percentile(batch_times, 95) * 1000),
+        "itemsPerSec": len(val_texts) / sum(batch_times),
+        "meetsBaseline": bool(accuracy >= args.baseline_accuracy),
+    }
+    results.append(row)
+
+# Print report
+print("\n" + "=" * 60)
+print("5. Accuracy vs Speed")
+print("=" * 60)
+print(f"\n{'model':<14} {'size(MB)':>9} {'acc':>7} {'sens':>7} {'spec':>7} {'p50(ms)':>9} {'items/s':>9}")
+print("-" * 68)
+for row in results:
+    print(f"{row['model']:<14} {row['sizeMB']:9.1f} {row['accuracy']:7.4f} {row['sensitivity']:7.4f} "
+          f"{row['specificity']:7.4f} {row['p50BatchMs']:9.2f} {row['itemsPerSec']:9.1f}")
+
+fp32 = results[0]
+for row in results[1:]:
+    status = "[OK]" if row['meetsBaseline'] else "[BELOW BASELINE]"
+    print(f"\n{status} {row['model']}: accuracy {row['accuracy'] - fp32['accuracy']:+.4f}, "
+          f"speedup x{fp32['p50BatchMs'] / row['p50BatchMs']:.2f}, "
+          f"size x{fp32['sizeMB'] / row['sizeMB']:.2f} smaller "
+          f"(baseline accuracy {args.baseline_accuracy:.0%})")
+
+with open(report_path, 'w', encoding='utf-8') as f:
+    json.dump({
+        "validationSamples": len(val_texts),
+        "batchSize": args.batch_size,
+        "baselineAccuracy": args.baseline_accuracy,
+        "results": results,
+    }, f, ensure_ascii=False, indent=2)
+
+print(f"\nReport saved to: {report_path}")
+print("=" * 60)
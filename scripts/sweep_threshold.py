@@ -0,0 +1,139 @@
+import argparse
+import json
+import os
+
+import numpy as np
+
+from evaluation import DATA_PATH, MODEL_PATH, compute_metrics, load_validation
+
+# 캐시된 검증 logits 로 판정 임계값(threshold)을 정하고 모델 폴더에 operating_point.json 으로 저장한다.
+# 백엔드는 서버 시작 시 이 파일을 읽으므로 재학습/코드 배포 없이 운영 기준을 바꿀 수 있다.
+#   python sweep_threshold.py                          # F1 최대
+#   python sweep_threshold.py --target-recall 0.85     # 전략물자 재현율 85% 이상 중 정밀도 최대
+#   python sweep_threshold.py --calibrate              # temperature scaling 후 sweep
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--model-path", default=MODEL_PATH)
+parser.add_argument("--data", default=DATA_PATH)
+parser.add_argument("--calibrate", action="store_true", help="temperature scaling 보정")
+parser.add_argument("--target-recall", type=float, default=None, help="전략물자 최소 재현율 (없으면 F1 최대)")
+parser.add_argument("--curve-output", default=None, help="PR/ROC 곡선 JSON 경로")
+parser.add_argument("--dry-run", action="store_true", help="operating_point.json 을 쓰지 않음")
+args = parser.parse_args()
+
+print("=" * 60)
+print("Decision Threshold Sweep")
+print("=" * 60)
+
+print("\n1. Loading validation logits...")
+logits, labels, _, _ = load_validation(args.model_path, args.data)
+logits = np.asarray(logits, dtype=np.float64)
+
+
+def strategic_probs(logits, temperature):
+    scaled = logits / temperature
+    scaled = scaled - scaled.max(axis=1, keepdims=True)
+    exp = np.exp(scaled)
+    return exp[:, 1] / exp.sum(axis=1)
+
+
+def nll(logits, labels, temperatures):
+    # temperatures: [T] -> 각 temperature 의 평균 negative log-likelihood
+    scaled = logits[None, :, :] / temperatures[:, None, None]
+    log_z = np.logaddexp.reduce(scaled, axis=2)
+    picked = np.take_along_axis(scaled, labels[None, :, None].repeat(len(temperatures), axis=0), axis=2)[..., 0]
+    return (log_z - picked).mean(axis=1)
+
+
+# 2. Temperature scaling (검증 데이터 NLL 최소화, 로그 스케일 격자 탐색)
+temperature = 1.0
+if args.calibrate:
+    print("\n2. Calibrating temperature...")
+    candidates = np.exp(np.linspace(np.log(0.05), np.log(20.0), 400))
+    losses = nll(logits, labels, candidates)
+    temperature = float(candidates[losses.argmin()])
+    print(f"   NLL: {nll(logits, labels, np.array([1.0]))[0]:.4f} (T=1.0) -> {losses.min():.4f} (T={temperature:.3f})")
+
+probs = strategic_probs(logits, temperature)
+
+# 3. 모든 임계값에 대한 precision / recall / FPR 을 한 번에 계산
+# 점수 내림차순 정렬 후 누적합: i 번째 임계값 = i 번째 점수 이상을 전략물자로 판정
+print("\n3. Sweeping thresholds...")
+order = np.argsort(-probs, kind='mergesort')
+sorted_probs = probs[order]
+sorted_labels = labels[order]
+
+# 같은 점수는 한 임계값으로 묶는다 (각 고유 점수 그룹의 마지막 위치)
+last_of_group = np.r_[np.nonzero(np.diff(sorted_probs))[0], len(sorted_probs) - 1]
+thresholds = sorted_probs[last_of_group]
+tp = np.cumsum(sorted_labels)[last_of_group]
+fp = np.cumsum(1 - sorted_labels)[last_of_group]
+positives = labels.sum()
+negatives = len(labels) - positives
+
+precision = tp / (tp + fp)
+recall = tp / positives if positives > 0 else np.zeros_like(tp, dtype=float)
+fpr = fp / negatives if negatives > 0 else np.zeros_like(fp, dtype=float)
+f1 = np.divide(2 * precision * recall, precision + recall, out=np.zeros_like(precision), where=(precision + recall) > 0)
+
+roc_fpr = np.r_[0.0, fpr]
+roc_tpr = np.r_[0.0, recall]
+roc_auc = float(np.sum(np.diff(roc_fpr) * (roc_tpr[1:] + roc_tpr[:-1]) / 2))
+average_precision = float(np.sum(np.diff(np.r_[0.0, recall]) * precision))
+print(f"   ROC AUC: {roc_auc:.4f}, Average precision: {average_precision:.4f}")
+
+# 4. 운영 기준 선택
+if args.target_recall is not None:
+    candidates = np.nonzero(recall >= args.target_recall)[0]
+    if len(candidates) == 0:
+        raise SystemExit(f"재현율 {args.target_recall:.2f} 이상을 만족하는 임계값이 없습니다")
+    best = candidates[precision[candidates].argmax()]
+    criterion = f"max precision with recall >= {args.target_recall}"
+else:
+    best = f1.argmax()
+    criterion = "max F1"
+threshold = float(thresholds[best])
+
+# 비교 기준: 현재 서버 기본값 (temperature 1, 임계값 0.5, build_result 와 같은 >=)
+default_metrics = compute_metrics(labels, (strategic_probs(logits, 1.0) >= 0.5).astype(int))
+chosen_metrics = compute_metrics(labels, (probs >= threshold).astype(int))
+
+print("\n" + "=" * 60)
+print("4. Operating Point")
+print("=" * 60)
+print(f"\nCriterion: {criterion}")
+print(f"Threshold: {threshold:.4f}, Temperature: {temperature:.3f}")
+print(f"\n{'':<16} {'accuracy':>9} {'sens':>7} {'spec':>7}")
+print(f"{'T=1, p>=0.5':<16} {default_metrics['accuracy']:9.4f} {default_metrics['sensitivity']:7.4f} {default_metrics['specificity']:7.4f}")
+print(f"{'chosen':<16} {chosen_metrics['accuracy']:9.4f} {chosen_metrics['sensitivity']:7.4f} {chosen_metrics['specificity']:7.4f}")
+
+operating_point = {
+    "threshold": threshold,
+    "temperature": temperature,
+    "criterion": criterion,
+    "validation": {
+        "accuracy": chosen_metrics['accuracy'],
+        "sensitivity": chosen_metrics['sensitivity'],
+        "specificity": chosen_metrics['specificity'],
+        "precision": float(precision[best]),
+        "rocAuc": roc_auc,
+        "averagePrecision": average_precision,
+    }
+}
+
+if args.curve_output:
+    with open(args.curve_output, 'w', encoding='utf-8') as f:
+        json.dump({
+            "thresholds": thresholds.tolist(),
+            "precision": precision.tolist(),
+            "recall": recall.tolist(),
+            "fpr": fpr.tolist(),
+        }, f)
+    print(f"\nCurve saved to: {args.curve_output}")
+
+if not args.dry_run:
+    output_path = os.path.join(args.model_path, "operating_point.json")
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(operating_point, f, ensure_ascii=False, indent=2)
+    print(f"\nOperating point saved to: {output_path}")
+print("=" * 60)
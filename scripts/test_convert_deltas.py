@@ -0,0 +1,69 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from openpyxl import load_workbook
+
+# convert_excel_to_json.py 의 delta 번호가 --full 실행을 거쳐도 계속 증가하는지 확인
+# 증분 -> --full -> 증분 순서로 실행하면서 매번 수출 이력 한 행을 바꾸고,
+# 새 delta 번호가 이전보다 크고 .convert_state.json 의 version 과 같은지,
+# 이전 상태에서 남은 (새 버전보다 큰) delta 파일이 삭제되는지 검사한다.
+# 사용법: python test_convert_deltas.py
+
+EXCEL = "../data/stat_v2_AddNew.xlsx"
+
+workdir = tempfile.mkdtemp(prefix="convert-deltas-")
+excel = os.path.join(workdir, "stat.xlsx")
+output_dir = os.path.join(workdir, "data")
+delta_dir = os.path.join(output_dir, "deltas")
+shutil.copy(EXCEL, excel)
+
+
+def edit_history(suffix):
+    workbook = load_workbook(excel)
+    sheet = workbook.worksheets[0]
+    sheet.cell(row=2, column=2).value = f"{sheet.cell(row=2, column=2).value} {suffix}"
+    workbook.save(excel)
+
+
+def convert(*extra):
+    subprocess.run(
+        [sys.executable, "convert_excel_to_json.py", "--excel", excel, "--output-dir", output_dir, "--no-pause", *extra],
+        check=True, stdout=subprocess.DEVNULL,
+    )
+    with open(os.path.join(output_dir, ".convert_state.json"), encoding='utf-8') as f:
+        return json.load(f)["version"]
+
+
+def delta_versions():
+    return sorted(int(name[:-5]) for name in os.listdir(delta_dir))
+
+
+failures = []
+try:
+    versions = [convert()]
+    for step, extra in enumerate([(), ("--full",), ()], start=1):
+        edit_history(f"(수정 {step})")
+        if extra:
+            # 상태 파일이 없어진 적이 있는 등, 새 버전보다 큰 번호로 남아 있는 delta
+            with open(os.path.join(delta_dir, "000099.json"), 'w', encoding='utf-8') as f:
+                json.dump({"version": 99, "files": {}}, f)
+        versions.append(convert(*extra))
+
+        label = " ".join(extra) or "incremental"
+        if versions[-1] <= versions[-2]:
+            failures.append(f"{label}: version {versions[-2]} -> {versions[-1]}")
+        if delta_versions()[-1] != versions[-1]:
+            failures.append(f"{label}: newest delta {delta_versions()[-1]} != state version {versions[-1]}")
+        print(f"   {label:<12} version {versions[-1]}, deltas {delta_versions()}")
+finally:
+    shutil.rmtree(workdir)
+
+if failures:
+    for failure in failures:
+        print(f"❌ {failure}")
+    sys.exit(1)
+print(f"✅ Delta versions increase: {versions}")
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import torch
+from torch.utils.data import Dataset
+
+# 학습용 토큰 저장소
+# 전체 코퍼스를 max_length 로 패딩한 dense 텐서 대신, 패딩 없는 토큰 ID 를 하나의 1차원 배열(ids)에 이어 붙이고
+# 문서별 시작 위치(offsets)만 저장한다. 배치마다 collate 에서 배치 내 최대 길이까지만 패딩한다.
+# 토크나이징 결과는 (토크나이저 어휘/설정 + max_length + 텍스트) 해시를 키로 TOKEN_CACHE_DIR 에 .npy 로 저장하고
+# 다음 실행부터는 memory-map 으로 열어 다시 토크나이징하지 않는다.
+
+TOKEN_CACHE_DIR = "../models/token_cache"
+
+
+def tokenizer_hash(tokenizer, max_length):
+    h = hashlib.sha256()
+    h.update(type(tokenizer).__name__.encode('utf-8'))
+    h.update(json.dumps(sorted(tokenizer.get_vocab().items()), ensure_ascii=False).encode('utf-8'))
+    h.update(json.dumps(tokenizer.all_special_tokens, ensure_ascii=False).encode('utf-8'))
+    h.update(str(max_length).encode('utf-8'))
+    return h.hexdigest()
+
+
+def texts_hash(texts):
+    h = hashlib.sha256()
+    for text in texts:
+        h.update(text.encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+class TokenStore:
+    def __init__(self, ids, offsets):
+        self.ids = ids
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, idx):
+        return self.ids[self.offsets[idx]:self.offsets[idx + 1]]
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    @classmethod
+    def build(cls, tokenizer, texts, max_length=128, chunk_size=1024):
+        # 어휘가 65536 개 미만이면 uint16 (KoBERT: 8002 개) 으로 저장해 메모리를 절반으로
+        dtype = np.uint16 if len(tokenizer) < 2 ** 16 else np.int32
+        pieces, lengths = [], []
+        for start in range(0, len(texts), chunk_size):
+            encoded = tokenizer(
+                texts[start:start + chunk_size],
+                truncation=True,
+                max_length=max_length,
+                return_attention_mask=False,
+                return_token_type_ids=False,
+            )['input_ids']
+            pieces.extend(np.asarray(ids, dtype=dtype) for ids in encoded)
+            lengths.extend(len(ids) for ids in encoded)
+        ids = np.concatenate(pieces) if pieces else np.zeros(0, dtype=dtype)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(ids, offsets)
+
+    def save(self, prefix):
+        # 다른 프로세스가 읽는 중인 파일을 덮어쓰지 않도록 임시 파일에 쓰고 교체
+        for suffix, array in (('ids', self.ids), ('offsets', self.offsets)):
+            tmp = f"{prefix}.{suffix}.tmp.npy"
+            np.save(tmp, array)
+            os.replace(tmp, f"{prefix}.{suffix}.npy")
+
+    @classmethod
+    def load(cls, prefix, mmap=True):
+        mode = 'r' if mmap else None
+        return cls(np.load(f"{prefix}.ids.npy", mmap_mode=mode), np.load(f"{prefix}.offsets.npy", mmap_mode=mode))
+
+    @classmethod
+    def cached(cls, tokenizer, texts, max_length=128, cache_dir=TOKEN_CACHE_DIR, mmap=True):
+        key = hashlib.sha256(f"{tokenizer_hash(tokenizer, max_length)}{texts_hash(texts)}".encode('utf-8')).hexdigest()[:16]
+        prefix = os.path.join(cache_dir, key)
+        if not os.path.exists(f"{prefix}.offsets.npy"):
+            os.makedirs(cache_dir, exist_ok=True)
+            cls.build(tokenizer, texts, max_length).save(prefix)
+        return cls.load(prefix, mmap)
+
+
+class TokenDataset(Dataset):
+    def __init__(self, store, labels):
+        self.store = store
+        self.labels = labels
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __getitem__(self, idx):
+        return {'input_ids': self.store[idx], 'labels': self.labels[idx]}
+
+
+class DynamicPaddingCollator:
+    # 배치 내 최대 길이까지만 패딩 (pad_to_multiple_of: GPU tensor core 용 8 등)
+    def __init__(self, pad_token_id, pad_to_multiple_of=None):
+        self.pad_token_id = pad_token_id
+        self.pad_to_multiple_of = pad_to_multiple_of
+
+    def __call__(self, features):
+        length = max(len(f['input_ids']) for f in features)
+        if self.pad_to_multiple_of:
+            length = -(-length // self.pad_to_multiple_of) * self.pad_to_multiple_of
+
+        input_ids = np.full((len(features), length), self.pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros((len(features), length), dtype=np.int64)
+        for row, f in enumerate(features):
+            n = len(f['input_ids'])
+            input_ids[row, :n] = f['input_ids']
+            attention_mask[row, :n] = 1
+        return {
+            'input_ids': torch.from_numpy(input_ids),
+            'attention_mask': torch.from_numpy(attention_mask),
+            'labels': torch.tensor([f['labels'] for f in features], dtype=torch.long),
+        }
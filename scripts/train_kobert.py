@@ -1,4 +1,5 @@
-import pandas as pd
+import argparse
+
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, accuracy_score
@@ -12,6 +13,37 @@ from transformers import (
 )
 import os
 
+from cpu_training import ThroughputCallback, accumulation_steps, configure_threads, cpu_count, cpu_supports_bf16, world_size
+from excel_cache import read_sheet
+from token_store import TOKEN_CACHE_DIR, DynamicPaddingCollator, TokenDataset, TokenStore
+
+# --dataset lazy (기본): 패딩 없는 토큰 ID 저장소 (디스크 캐시 + memory-map) + 배치별 동적 패딩
+# --dataset eager   : 기존 방식 (전체 코퍼스를 한 번에 토크나이징, 전체 최대 길이로 패딩)
+parser = argparse.ArgumentParser()
+parser.add_argument("--dataset", choices=["lazy", "eager"], default="lazy")
+parser.add_argument("--token-cache-dir", default=TOKEN_CACHE_DIR)
+parser.add_argument("--no-mmap", action="store_true", help="토큰 캐시를 memory-map 대신 메모리로 읽기")
+parser.add_argument("--group-by-length", action="store_true", help="길이가 비슷한 샘플끼리 배치 구성 (패딩 감소)")
+# --profile cpu: GPU 없는 학습 서버용 (DataLoader workers, 스레드 수, bf16 autocast, gradient accumulation)
+# 여러 프로세스 data-parallel: torchrun --nproc_per_node 4 train_kobert.py --profile cpu (gloo backend)
+parser.add_argument("--profile", choices=["default", "cpu"], default="default")
+parser.add_argument("--batch-size", type=int, default=16, help="프로세스당 배치 크기")
+parser.add_argument("--effective-batch-size", type=int, default=None, help="gradient accumulation 으로 맞출 전체 배치 크기")
+parser.add_argument("--workers", type=int, default=None, help="DataLoader workers (cpu 프로필 기본 2)")
+parser.add_argument("--threads", type=int, default=None, help="intra-op 스레드 수 (cpu 프로필 기본: 코어 수 / 프로세스 수)")
+parser.add_argument("--interop-threads", type=int, default=None)
+parser.add_argument("--bf16", choices=["auto", "on", "off"], default="auto", help="auto: cpu 프로필에서 CPU 가 bf16 을 지원하면 사용")
+args = parser.parse_args()
+
+cpu_profile = args.profile == "cpu"
+processes = world_size()
+if cpu_profile or args.threads or args.interop_threads:
+    # 스레드 수는 모델을 만들기 전에 정해야 inter-op 설정이 적용된다
+    threads, interop_threads = configure_threads(args.threads, args.interop_threads)
+workers = args.workers if args.workers is not None else (min(2, cpu_count() // processes) if cpu_profile else 0)
+bf16 = args.bf16 == "on" or (args.bf16 == "auto" and cpu_profile and cpu_supports_bf16())
+gradient_accumulation = accumulation_steps(args.effective_batch_size, args.batch_size, processes) if args.effective_batch_size else 1
+
 print("=" * 60)
 print("KoBERT Fine-tuning for Strategic Item Classification")
 print("=" * 60)
@@ -19,10 +51,14 @@ print("=" * 60)
 # Set device
 device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
 print(f"\nUsing device: {device}")
+if cpu_profile:
+    print(f"   CPU profile: {processes} process(es), {threads} threads (inter-op {interop_threads}), "
+          f"{workers} DataLoader workers, bf16 {'on' if bf16 else 'off'}")
 
 # Load data
 print("\n1. Loading data...")
-df = pd.read_excel('../data/labelled_data_aug_for_learning.xlsx')
+# 필요한 컬럼만 읽고 캐시 (두 번째 실행부터는 Excel 파싱 없음)
+df = read_sheet('../data/labelled_data_aug_for_learning.xlsx', columns=['data_total', 'label'])
 print(f"   Total samples: {len(df)}")
 print(f"   Label 0 (Non-strategic): {(df['label'] == 0).sum()}")
 print(f"   Label 1 (Strategic): {(df['label'] == 1).sum()}")
@@ -71,9 +107,18 @@ class StrategicItemDataset(Dataset):
         return item
 
 # Create datasets
-print("\n4. Creating datasets...")
-train_dataset = StrategicItemDataset(train_texts, train_labels, tokenizer)
-val_dataset = StrategicItemDataset(val_texts, val_labels, tokenizer)
+print(f"\n4. Creating datasets ({args.dataset})...")
+if args.dataset == "lazy":
+    train_store = TokenStore.cached(tokenizer, train_texts, cache_dir=args.token_cache_dir, mmap=not args.no_mmap)
+    val_store = TokenStore.cached(tokenizer, val_texts, cache_dir=args.token_cache_dir, mmap=not args.no_mmap)
+    train_dataset = TokenDataset(train_store, train_labels)
+    val_dataset = TokenDataset(val_store, val_labels)
+    data_collator = DynamicPaddingCollator(tokenizer.pad_token_id)
+    print(f"   Tokens: {train_store.ids.nbytes / 2**20:.1f} MB (mean length {train_store.lengths.mean():.1f})")
+else:
+    train_dataset = StrategicItemDataset(train_texts, train_labels, tokenizer)
+    val_dataset = StrategicItemDataset(val_texts, val_labels, tokenizer)
+    data_collator = None
 
 # Training arguments
 print("\n5. Setting up training...")
@@ -83,8 +128,9 @@ os.makedirs(output_dir, exist_ok=True)
 training_args = TrainingArguments(
     output_dir=output_dir,
     num_train_epochs=3,
-    per_device_train_batch_size=16,
-    per_device_eval_batch_size=16,
+    per_device_train_batch_size=args.batch_size,
+    per_device_eval_batch_size=args.batch_size,
+    gradient_accumulation_steps=gradient_accumulation,
     warmup_steps=100,
     weight_decay=0.01,
     logging_dir='../logs',
@@ -93,6 +139,11 @@ training_args = TrainingArguments(
     save_strategy="epoch",
     load_best_model_at_end=True,
     metric_for_best_model="accuracy",
+    group_by_length=args.group_by_length,
+    dataloader_num_workers=workers,
+    dataloader_pin_memory=device.type == 'cuda',
+    bf16=bf16,
+    ddp_backend="gloo" if cpu_profile and processes > 1 else None,
 )
 
 # Compute metrics function
@@ -108,13 +159,17 @@ trainer = Trainer(
     args=training_args,
     train_dataset=train_dataset,
     eval_dataset=val_dataset,
+    data_collator=data_collator,
     compute_metrics=compute_metrics,
+    callbacks=[ThroughputCallback()],
 )
 
 # Train
 print("\n6. Training started...")
 print("=" * 60)
-trainer.train()
+train_result = trainer.train()
+print(f"   Throughput: {train_result.metrics['train_samples_per_second']:.1f} samples/sec "
+      f"({args.profile} profile, {processes} process(es), batch {args.batch_size} x accumulation {gradient_accumulation})")
 
 # Evaluate
 print("\n" + "=" * 60)
@@ -123,6 +178,10 @@ print("=" * 60)
 eval_results = trainer.evaluate()
 print(f"\nValidation Accuracy: {eval_results['eval_accuracy']:.4f}")
 
+# data-parallel 학습이면 저장과 테스트는 첫 번째 프로세스만
+if not trainer.is_world_process_zero():
+    raise SystemExit(0)
+
 # Save model
 print("\n8. Saving model...")
 final_model_dir = '../models/kobert-strategic-final'
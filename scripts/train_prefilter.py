@@ -0,0 +1,134 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+
+from evaluation import DATA_PATH, compute_metrics, load_split
+
+# 백엔드 cascade 1단계 모델 학습: 문자 n-gram TF-IDF + 로지스틱 회귀 (train_kobert.py 와 같은 data_total / label, 같은 분할)
+# 검증 데이터를 둘로 나눠 (층화, 고정 seed) 한쪽에서 1단계가 바로 답해도 되는 확률 구간(thresholds)을 고르고,
+# 정확도 / 응답 비율은 임계값 선택에 쓰지 않은 나머지 쪽에서 측정한다 (같은 데이터로 고르고 재면 낙관적으로 나옴):
+#   p(전략물자) <= low  -> 비전략물자 (이 구간의 비전략물자 비율 >= --target-precision)
+#   p(전략물자) >= high -> 전략물자 (--allow-strategic-exit 일 때만, 기본은 항상 KoBERT 로 확인)
+# 결과: <output-dir>/prefilter.npz (어휘, IDF, 계수) + prefilter.json (설정, 임계값, held-out 지표)
+# 사용법: python train_prefilter.py --target-precision 0.99
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--data", default=DATA_PATH)
+parser.add_argument("--output-dir", default="../models/prefilter")
+parser.add_argument("--min-n", type=int, default=2)
+parser.add_argument("--max-n", type=int, default=4)
+parser.add_argument("--min-df", type=int, default=2)
+parser.add_argument("--max-features", type=int, default=200000)
+parser.add_argument("--C", type=float, default=4.0, help="로지스틱 회귀 규제 (클수록 약함)")
+parser.add_argument("--target-precision", type=float, default=0.99, help="1단계가 답한 요청의 최소 정확도")
+parser.add_argument("--allow-strategic-exit", action="store_true", help="전략물자 판정도 1단계에서 바로 응답")
+parser.add_argument("--holdout-fraction", type=float, default=0.5, help="검증 데이터 중 지표 측정에만 쓰는 비율 (나머지로 임계값 선택)")
+args = parser.parse_args()
+
+
+def exit_threshold(probs, correct, target):
+    # probs 오름차순으로 앞에서부터 잘랐을 때 정확도가 target 이상인 가장 긴 구간의 경계
+    order = np.argsort(probs, kind='stable')
+    precision = np.cumsum(correct[order]) / np.arange(1, len(order) + 1)
+    # 같은 확률 값 중간에서 자르지 않도록 마지막 동점 위치만 후보
+    last_of_tie = np.r_[probs[order][1:] != probs[order][:-1], True]
+    ok = np.nonzero((precision >= target) & last_of_tie)[0]
+    return float(probs[order][ok[-1]]) if len(ok) else None
+
+
+print("=" * 60)
+print("Lexical Pre-filter Training (TF-IDF + Logistic Regression)")
+print("=" * 60)
+
+print("\n1. Loading data...")
+train_texts, val_texts, train_labels, val_labels = load_split(args.data)
+train_labels = np.asarray(train_labels)
+tune_texts, holdout_texts, tune_labels, holdout_labels = train_test_split(
+    val_texts, val_labels, test_size=args.holdout_fraction, random_state=42, stratify=val_labels
+)
+tune_labels = np.asarray(tune_labels)
+holdout_labels = np.asarray(holdout_labels)
+print(f"   Training samples: {len(train_texts)}, validation samples: {len(val_texts)} "
+      f"(threshold tuning: {len(tune_texts)}, held-out: {len(holdout_texts)})")
+
+print("\n2. Training...")
+start = time.perf_counter()
+vectorizer = TfidfVectorizer(
+    analyzer='char_wb',
+    ngram_range=(args.min_n, args.max_n),
+    min_df=args.min_df,
+    max_features=args.max_features,
+    sublinear_tf=True,
+)
+X_train = vectorizer.fit_transform(train_texts)
+classifier = LogisticRegression(C=args.C, class_weight='balanced', max_iter=2000)
+classifier.fit(X_train, train_labels)
+print(f"   Vocabulary: {len(vectorizer.vocabulary_)} n-grams ({time.perf_counter() - start:.1f}s)")
+
+print("\n3. Choosing exit thresholds on the tuning half...")
+tune_probs = classifier.predict_proba(vectorizer.transform(tune_texts))[:, 1]
+low = exit_threshold(tune_probs, tune_labels == 0, args.target_precision)
+high = None
+if args.allow_strategic_exit:
+    # 내림차순으로 보기 위해 부호를 뒤집어 같은 함수 사용
+    high = exit_threshold(-tune_probs, tune_labels == 1, args.target_precision)
+    high = -high if high is not None else None
+
+low = low if low is not None else -1.0
+high = high if high is not None else 2.0
+
+print("\n   Evaluating on the held-out half...")
+start = time.perf_counter()
+holdout_probs = classifier.predict_proba(vectorizer.transform(holdout_texts))[:, 1]
+latency_ms = (time.perf_counter() - start) / len(holdout_texts) * 1000
+
+metrics = compute_metrics(holdout_labels, (holdout_probs >= 0.5).astype(int))
+exit_non = holdout_probs <= low
+exit_strategic = holdout_probs >= high
+answered = exit_non | exit_strategic
+exit_correct = (exit_non & (holdout_labels == 0)) | (exit_strategic & (holdout_labels == 1))
+
+print(f"   Stand-alone accuracy (p >= 0.5): {metrics['accuracy']:.4f}")
+print(f"   low  = {low:.4f} -> non-strategic exits: {exit_non.sum()}")
+print(f"   high = {high:.4f} -> strategic exits:     {exit_strategic.sum()}")
+print(f"   Coverage (answered by stage 1): {answered.mean():.1%}, "
+      f"accuracy of stage-1 answers: {exit_correct.sum() / max(answered.sum(), 1):.4f}")
+print(f"   Stage-1 latency: {latency_ms:.3f} ms/request (sklearn, batch)")
+
+print("\n4. Saving...")
+os.makedirs(args.output_dir, exist_ok=True)
+terms = np.empty(len(vectorizer.vocabulary_), dtype=object)
+for term, column in vectorizer.vocabulary_.items():
+    terms[column] = term
+np.savez(
+    os.path.join(args.output_dir, "prefilter.npz"),
+    terms=terms.astype(str),
+    idf=vectorizer.idf_.astype(np.float64),
+    coef=classifier.coef_[0].astype(np.float64),
+    intercept=np.float64(classifier.intercept_[0]),
+)
+with open(os.path.join(args.output_dir, "prefilter.json"), 'w', encoding='utf-8') as f:
+    json.dump({
+        "analyzer": "char_wb",
+        "ngramRange": [args.min_n, args.max_n],
+        "sublinearTf": True,
+        "thresholds": {"low": low, "high": high},
+        "targetPrecision": args.target_precision,
+        # 임계값 선택에 쓰지 않은 held-out 쪽 지표
+        "thresholdTuningSamples": int(len(tune_labels)),
+        "validation": {
+            "samples": int(len(holdout_labels)),
+            "accuracy": metrics['accuracy'],
+            "coverage": float(answered.mean()),
+            "exitAccuracy": float(exit_correct.sum() / max(answered.sum(), 1)),
+        },
+        "data": args.data,
+    }, f, ensure_ascii=False, indent=2)
+print(f"   Saved to: {args.output_dir}")
+print("=" * 60)